@@ -0,0 +1,57 @@
+from typing import List, Set, Tuple
+
+from .objects import Object
+
+
+class ChangeList:
+    """Changements du monde depuis l'affichage précédent (voir Game.set_onChanges()):
+    les objets créés, les objets modifiés avec les champs de toMinimalDict() qui ont changé,
+    et les formIDs des objets détruits."""
+
+    _created: List[Object]
+    _changed: List[Tuple[Object, Set[str]]]
+    _destroyed: List[int]
+
+    def __init__(
+        self,
+        created: List[Object],
+        changed: List[Tuple[Object, Set[str]]],
+        destroyed: List[int],
+    ) -> None:
+        self._created = created
+        self._changed = changed
+        self._destroyed = destroyed
+
+    def __bool__(self) -> bool:
+        return bool(self._created or self._changed or self._destroyed)
+
+    def created(self) -> List[Object]:
+        """Retourne les objets apparus"""
+        return self._created
+
+    def changed(self) -> List[Tuple[Object, Set[str]]]:
+        """Retourne les objets modifiés, chacun avec les noms des champs modifiés"""
+        return self._changed
+
+    def destroyed(self) -> List[int]:
+        """Retourne les formIDs des objets disparus"""
+        return self._destroyed
+
+    def toDict(self, changedFieldsOnly: bool = True) -> dict:
+        """Exporte les changements dans un dict python, les objets au format de toMinimalDict().
+        Avec <changedFieldsOnly>, seuls les champs modifiés (et le formID) des objets modifiés sont exportés."""
+        changed = []
+        for obj, fields in self._changed:
+            dic = obj.toMinimalDict()
+            if changedFieldsOnly:
+                dic = {
+                    key: value
+                    for key, value in dic.items()
+                    if key in fields or key == "formID"
+                }
+            changed.append(dic)
+        return {
+            "created": [obj.toMinimalDict() for obj in self._created],
+            "changed": changed,
+            "destroyed": list(self._destroyed),
+        }
@@ -1,4 +1,5 @@
-from logging import info
+from concurrent.futures import Executor
+from logging import info, warning
 from typing import Callable, List, Tuple
 import os
 import time
@@ -8,33 +9,56 @@ from game.objects.Object import Object
 import lib
 
 from . import objects
+from .ContactsCache import ContactsBuffer, ContactsCache
 
 OnCollisionT = Callable[[Tuple[Object, Object], lib.Point], None]
+OnZoneOverrunT = Callable[[List[Object]], None]
 
 
 class CollisionsZone:
     """Une zone de collision est un regroupement d'objets proches les un des autres pouvant potentiellenent se rentrer dedans."""
 
     timePrecision = 1e-3
+    # précision adaptative: chaque zone choisit sa précision pour que ses objets ne se rapprochent pas
+    # de plus de <targetSpatialError> px entre deux tests, sans descendre sous <minTimePrecision>
+    adaptivePrecision: bool = False
+    targetSpatialError: float = 0.5
+    minTimePrecision: float = 1e-5
     # Plus réaliste, mais cause beaucoup de crash
     useFriction: bool = False
+    # résout ensemble tous les contacts au moment du premier impact (voir _solveSimultaneous()),
+    # avec au plus <maxImpacts> impacts par zone et par frame
+    simultaneousSolver: bool = False
+    impulseIterations: int = 8
+    maxImpacts: int = 8
+    # travail borné: au delà de <maxIterations> recherches ou de <maxResolutionTime> s de calcul,
+    # le reste de l'intervalle est simulé avec les objets en contact figés (voir resolve()).
+    # 0 pour désactiver (par défaut): la limite de temps rend la simulation non déterministe
+    maxIterations: int = 0
+    maxResolutionTime: float = 0
 
     def create(
         objectsList: List[objects.Object], timeInterval: float
     ) -> Tuple[List["CollisionsZone"], List[objects.Object]]:
         """Détermine et retourne les différentes zones où il peut potentiellement avoir des collisions
         entre les objects donnés dans l'intervalle de temps donné.
-        Retourne aussi la liste des objets ne se trouvant dans aucune zone."""
+        Retourne aussi la liste des objets ne se trouvant dans aucune zone.\n
+        Les objets endormis (voir Object.isSleeping()) ne sont que des obstacles immobiles:
+        ils ne forment jamais de zone d'eux-mêmes."""
         zones: List[CollisionsZone] = []
-        objs = [o for o in objectsList if o.isStatic()] + [
-            o for o in objectsList if not o.isStatic()
+
+        def isMoving(obj: objects.Object) -> bool:
+            return not obj.isStatic() and not obj.isSleeping()
+
+        objs = [o for o in objectsList if not isMoving(o)] + [
+            o for o in objectsList if isMoving(o)
         ]
         current = -1
         # ne pas tester le dernier objet contre lui-même
-        while -current < len(objs) and not objs[current].isStatic():
+        while -current < len(objs) and isMoving(objs[current]):
             tested = 0
             while tested < len(objs) + current:
-                if (
+                if objs[current].canInteract(objs[tested]) and (
                     objs[current]
                     .potentialCollisionZone(timeInterval)
                     .collides(objs[tested].potentialCollisionZone(timeInterval))
@@ -43,7 +67,7 @@ class CollisionsZone:
                     zones.append(CollisionsZone(timeInterval, objs.pop(current), obj))
                     # nous avons supprimé l'objet mettre <current> à jour (car c'est l'index par rapport à la fin de la liste)
                     current += 1
-                    if not obj.isStatic():
+                    if isMoving(obj):
                         # les objets statics déjà testés peuvent entrer en collision avec le nouvel objet en mvt
                         tested = 0
                     # pas besoin d'incrémenter <tested> car l'objet a été supprimé
@@ -63,13 +87,95 @@ class CollisionsZone:
 
         return zones, objs
 
+    def resolveAll(
+        zones: List["CollisionsZone"],
+        others: List[objects.Object],
+        timeInterval: float,
+        onCollision: OnCollisionT,
+        executor: Executor = None,
+        precisionScale: float = 1,
+        onZoneOverrun: OnZoneOverrunT = lambda objs: None,
+        contacts: ContactsCache = None,
+    ) -> None:
+        """Résout les zones et avance les objets ne se trouvant dans aucune zone (voir create()).\n
+        Les zones étant disjointes, elles peuvent être résolues en parallèle par <executor>.
+        Dans ce cas, seuls les calculs sont faits par les workers: les appels à <onCollision>,
+        à <onZoneOverrun> et aux callbacks des objets (voir Object.deferCallbacks()) sont collectés
+        puis rejoués dans l'ordre des zones, dans le thread appelant. De même, chaque zone écrit
+        ses contacts dans un tampon (voir ContactsCache.buffer()) fusionné dans <contacts> après
+        les workers. Le résultat est donc le même qu'en séquentiel.\n
+        <precisionScale>, <onZoneOverrun> et <contacts> sont passés à toutes les zones, voir resolve()."""
+        if not executor or len(zones) < 2:
+            for zone in zones:
+                zone.resolve(onCollision, precisionScale, onZoneOverrun, contacts)
+            for other in others:
+                other.updateReferences(timeInterval)
+            return
+
+        def resolveZone(
+            zone: CollisionsZone, buffer: "ContactsBuffer | None"
+        ) -> List[tuple]:
+            # appels (fonction, arguments) dans l'ordre où la résolution séquentielle les ferait
+            calls = []
+            for obj in zone.objectsInside():
+                obj.deferCallbacks(calls)
+            try:
+                zone.resolve(
+                    lambda objs, point: calls.append((onCollision, (objs, point))),
+                    precisionScale,
+                    lambda objs: calls.append((onZoneOverrun, (objs,))),
+                    buffer,
+                )
+            finally:
+                for obj in zone.objectsInside():
+                    obj.deferCallbacks(None)
+            return calls
+
+        def updateOthers(chunk: List[objects.Object]) -> None:
+            for other in chunk:
+                other.updateReferences(timeInterval)
+
+        # chaque zone écrit ses contacts dans son propre tampon, fusionné après les workers
+        buffers = [contacts.buffer() if contacts else None for _ in zones]
+        zonesCalls = [
+            executor.submit(resolveZone, zone, buffer)
+            for zone, buffer in zip(zones, buffers)
+        ]
+        chunkSize = max(1, len(others) // len(zones))
+        othersUpdates = [
+            executor.submit(updateOthers, others[i : i + chunkSize])
+            for i in range(0, len(others), chunkSize)
+        ]
+        for update in othersUpdates:
+            update.result()
+        for calls in zonesCalls:
+            calls.result()
+        for buffer in buffers:
+            if buffer:
+                contacts.merge(buffer)
+        for calls in zonesCalls:
+            for callback, args in calls.result():
+                callback(*args)
+
     _timeInterval: float
+    _timePrecision: float
     _checkedInterval: float
     _objects: List[objects.Object]
     _dimension: lib.AlignedRectangle
     _movingDimension: lib.AlignedRectangle
+    # unions des catégories et des masques de collision des objets de la zone
+    _categories: int
+    _masks: int
     _ignoringList: List[Tuple[objects.Object, objects.Object]]
+    # objets ayant eu un contact solide durant resolve(), figés en cas de dépassement
+    _inContact: List[objects.Object]
+    _contacts: "ContactsCache | None" = None
+    # paires en contact au pas précédent, pas encore traitées durant resolve()
+    _sustained: List[Tuple[objects.Object, objects.Object]]
     _onCollision: OnCollisionT
+    # paires écartées ou non par le test des cercles englobants, voir boundingCircleStats()
+    _boundingCircleRejections: int
+    _boundingCircleOverlaps: int
 
     def __init__(
         self,
@@ -78,11 +184,17 @@ class CollisionsZone:
     ) -> None:
         self._timeInterval = timeInterval
         self._ignoringList = []
+        self._inContact = []
+        self._sustained = []
+        self._boundingCircleRejections = 0
+        self._boundingCircleOverlaps = 0
         if len(objectsInside) < 2:
             raise SyntaxError("A collision zone must contain at least 2 objects")
         elif objectsInside[0].isStatic():
             raise ValueError("The first object can't be static")
         self._objects = [objectsInside[0]]
+        self._categories = objectsInside[0].collisionCategory()
+        self._masks = objectsInside[0].collisionMask()
         self._dimension = objectsInside[0].potentialCollisionZone(timeInterval).copy()
         self._movingDimension = self._dimension.copy()
         for obj in objectsInside[1:]:
@@ -91,6 +203,8 @@ class CollisionsZone:
     def __iadd__(self, objectToAdd: objects.Object) -> "CollisionsZone":
         """Ajoute un objet à la zone et redimentionne celle-ci si nécessaire"""
         self._objects.append(objectToAdd)
+        self._categories |= objectToAdd.collisionCategory()
+        self._masks |= objectToAdd.collisionMask()
         self._dimension.resizeToInclude(
             objectToAdd.potentialCollisionZone(self._timeInterval)
         )
@@ -100,8 +214,18 @@ class CollisionsZone:
             )
         return self
 
+    def objectsInside(self) -> List[objects.Object]:
+        """Retourne les objets de la zone"""
+        return self._objects
+
     def collides(self, objectToCheck: objects.Object) -> bool:
-        """Retourne vrai si l'objet donné en paramètre se trouve dans la zone."""
+        """Retourne vrai si l'objet donné en paramètre se trouve dans la zone
+        et peut entrer en collision avec au moins un de ses objets."""
+        if not (
+            objectToCheck.collisionCategory() & self._masks
+            and self._categories & objectToCheck.collisionMask()
+        ):
+            return False
         if objectToCheck.isStatic():
             return self._movingDimension.collides(
                 objectToCheck.potentialCollisionZone(self._timeInterval)
@@ -111,23 +235,53 @@ class CollisionsZone:
                 objectToCheck.potentialCollisionZone(self._timeInterval)
             )
 
-    def _solveFirst(self, timeInterval: float) -> float:
-        """Détecte les collions, gère la première est retourne le moment de celle-ci."""
+    def _collides(
+        self, pair: Tuple[objects.Object, objects.Object], timeInterval: float
+    ) -> bool:
+        """Object.collides() précédé du test rapide des cercles englobants"""
+        if pair[0].separatedByBoundingCircles(pair[1], timeInterval):
+            self._boundingCircleRejections += 1
+            return False
+        self._boundingCircleOverlaps += 1
+        return pair[0].collides(pair[1], timeInterval)
+
+    def boundingCircleStats(self) -> Tuple[int, int]:
+        """Retourne le nombre de paires écartées par le test des cercles englobants
+        (voir Object.separatedByBoundingCircles()) et le nombre de paires testées précisément"""
+        return self._boundingCircleRejections, self._boundingCircleOverlaps
+
+    def _searchFirst(self, timeInterval: float) -> Tuple["tuple | None", float, float]:
+        """Avance les objets jusqu'au moment de la première collision de l'intervalle donné.
+        Retourne la paire d'objets concernée (None s'il n'y en a pas), le temps avancé
+        et la durée de l'intervalle dans lequel la collision a lieu."""
         # recherche du moment de la collision
         def getCollidedObjects(objects: List[objects.Object]):
             for first in range(len(objects) - 1):
                 for second in range(first + 1, len(objects)):
                     pair = objects[first], objects[second]
-                    if pair not in self._ignoringList and pair[0].collides(
-                        pair[1], halfWorkingInterval
+                    if (
+                        pair[0].canInteract(pair[1])
+                        and pair not in self._ignoringList
+                        and self._collides(pair, halfWorkingInterval)
                     ):
                         return pair
             return None
 
+        # un contact persistant se reproduit dès le début de l'intervalle: inutile de le rechercher,
+        # chaque paire n'est essayée qu'une fois par resolve() pour ne pas boucler sur elle
+        while self._sustained:
+            pair = self._sustained.pop()
+            if pair not in self._ignoringList and self._collides(
+                pair, self._timePrecision
+            ):
+                return pair, 0, self._timePrecision
+
         checkedInterval = 0
         halfWorkingInterval = timeInterval
         lastCollidedObjects = None
-        while halfWorkingInterval > self.timePrecision:
+        # le premier test couvre toujours l'intervalle entier, même plus court que la précision:
+        # aucun objet n'est avancé sans que ses collisions aient été testées
+        while True:
             collidedObjects = getCollidedObjects(self._objects)
 
             if collidedObjects:
@@ -137,18 +291,26 @@ class CollisionsZone:
                     obj.updateReferences(halfWorkingInterval)
                 if not lastCollidedObjects:
                     # il n'y a aucune collision dans l'intervalle donnée à la fonction
-                    return halfWorkingInterval
+                    return None, halfWorkingInterval, 0
                 checkedInterval += halfWorkingInterval
             halfWorkingInterval /= 2
+            if halfWorkingInterval <= self._timePrecision:
+                break
+
+        return lastCollidedObjects, checkedInterval, halfWorkingInterval * 2
+
+    def _solveFirst(self, timeInterval: float) -> float:
+        """Détecte les collions, gère la première est retourne le moment de celle-ci."""
+        lastCollidedObjects, checkedInterval, _ = self._searchFirst(timeInterval)
+        if not lastCollidedObjects:
+            return checkedInterval
 
         # gestion de la collision
         if sum([lastCollidedObjects[i].isSolid() for i in range(2)]) < 2:
             self._ignoringList.append(lastCollidedObjects)
 
         else:
-            point, tangent = lastCollidedObjects[0].collisionPointAndTangent(
-                lastCollidedObjects[1]
-            )
+            point, tangent = self._contactPointAndTangent(lastCollidedObjects)
             angle = tangent.direction()
 
             masses = [obj.mass() for obj in lastCollidedObjects]
@@ -193,6 +355,7 @@ class CollisionsZone:
                 )
                 other = current
 
+            self._addContact(lastCollidedObjects)
             self._onCollision(lastCollidedObjects, point)
 
         other = 1
@@ -202,11 +365,170 @@ class CollisionsZone:
 
         return checkedInterval
 
-    def resolve(self, onCollision: OnCollisionT) -> None:
-        """Détecte précisément les collisions, gère celles-ci et met les objets à jours"""
+    def _solveSimultaneous(self, timeInterval: float) -> float:
+        """Comme _solveFirst(), mais rassemble tous les contacts au moment du premier impact
+        et les résout ensemble par impulsions séquentielles (<impulseIterations> passes).
+        Les objets de masse nulle sont immobiles, comme dans _solveFirst()."""
+        first, checkedInterval, window = self._searchFirst(timeInterval)
+        if not first:
+            return checkedInterval
+
+        pairs = [first]
+        for i in range(len(self._objects) - 1):
+            for j in range(i + 1, len(self._objects)):
+                pair = self._objects[i], self._objects[j]
+                if (
+                    pair != first
+                    and pair[0].canInteract(pair[1])
+                    and pair not in self._ignoringList
+                    and self._collides(pair, window)
+                ):
+                    pairs.append(pair)
+
+        # point, normale (de pair[0] vers pair[1]), inverses des masses, vitesse visée, impulsion cumulée
+        contacts = []
+        for pair in pairs:
+            if not (pair[0].isSolid() and pair[1].isSolid()):
+                self._ignoringList.append(pair)
+                continue
+            inverseMasses = [1 / obj.mass() if obj.mass() else 0 for obj in pair]
+            if not sum(inverseMasses):
+                continue
+            point, tangent = self._contactPointAndTangent(pair)
+            normal = tangent.normalVector().unitVector()
+            direction = lib.Vector.fromPoints(pair[0].center(), pair[1].center())
+            if normal[0] * direction[0] + normal[1] * direction[1] < 0:
+                normal = -normal
+            relative = pair[1].speedAtPoint(point) - pair[0].speedAtPoint(point)
+            normalSpeed = normal[0] * relative[0] + normal[1] * relative[1]
+            # collisions parfaitement élastiques, comme dans _solveFirst()
+            target = -normalSpeed if normalSpeed < 0 else 0
+            contacts.append([pair, point, normal, inverseMasses, target, 0])
+
+        for _ in range(self.impulseIterations):
+            for contact in contacts:
+                pair, point, normal, inverseMasses, target, accumulated = contact
+                relative = pair[1].speedAtPoint(point) - pair[0].speedAtPoint(point)
+                normalSpeed = normal[0] * relative[0] + normal[1] * relative[1]
+                impulse = max(
+                    accumulated + (target - normalSpeed) / sum(inverseMasses), 0
+                )
+                delta = impulse - accumulated
+                if not delta:
+                    continue
+                contact[5] = impulse
+                for obj, inverseMass, sign in zip(pair, inverseMasses, (-1, 1)):
+                    if inverseMass:
+                        obj.set_vectorialMotionSpeed(
+                            obj.vectorialMotionSpeed()
+                            + normal * (sign * delta * inverseMass)
+                        )
+
+        for pair, point, *_ in contacts:
+            if self.useFriction:
+                factor = (1 - pair[0].friction()) * (1 - pair[1].friction())
+                for obj in pair:
+                    obj.set_vectorialMotionSpeed(obj.vectorialMotionSpeed() * factor)
+            self._addContact(pair)
+            self._onCollision(pair, point)
+
+        for pair in pairs:
+            pair[0].onCollision(pair[1])
+            pair[1].onCollision(pair[0])
+
+        return checkedInterval
+
+    def precision(self) -> float:
+        """Retourne la précision temporelle (s) de la recherche des collisions dans cette zone,
+        toujours strictement inférieure à l'intervalle pour qu'il soit subdivisé au moins une fois"""
+        ceiling = self._timeInterval / 2
+        if not self.adaptivePrecision:
+            return min(ceiling, self.timePrecision)
+        speeds = sorted(obj.maxPointSpeed(self._timeInterval) for obj in self._objects)
+        relativeSpeed = speeds[-1] + speeds[-2]
+        if not relativeSpeed:
+            return ceiling
+        return min(
+            ceiling,
+            max(self.minTimePrecision, self.targetSpatialError / relativeSpeed),
+        )
+
+    def _contactPointAndTangent(
+        self, pair: Tuple[objects.Object, objects.Object]
+    ) -> Tuple[lib.Point, lib.Vector]:
+        """Voir Object.collisionPointAndTangent(), passe par le cache des contacts s'il y en a un"""
+        if self._contacts is None:
+            return pair[0].collisionPointAndTangent(pair[1])
+        return self._contacts.contact(pair)
+
+    def _addContact(self, pair: Tuple[objects.Object, objects.Object]) -> None:
+        """Retient les objets d'un contact solide"""
+        for obj in pair:
+            if obj not in self._inContact:
+                self._inContact.append(obj)
+
+    def _freeze(self, remaining: float) -> None:
+        """Avance les objets de <remaining> sans gérer les collisions,
+        les objets ayant déjà eu un contact restent sur place pour ne pas se traverser."""
+        for obj in self._objects:
+            if obj not in self._inContact:
+                obj.updateReferences(remaining)
+        self._checkedInterval = self._timeInterval
+
+    def resolve(
+        self,
+        onCollision: OnCollisionT,
+        precisionScale: float = 1,
+        onZoneOverrun: OnZoneOverrunT = lambda objs: None,
+        contacts: ContactsCache = None,
+    ) -> bool:
+        """Détecte précisément les collisions, gère celles-ci et met les objets à jours.
+        <precisionScale> multiplie la précision temporelle (voir precision()), pour alléger la charge,
+        sans qu'elle atteigne la moitié de l'intervalle.\n
+        Si la zone dépasse <maxIterations> ou <maxResolutionTime>, le reste de l'intervalle est simulé
+        sans collisions avec les objets en contact figés, <onZoneOverrun> est appelé avec les objets
+        de la zone et vrai est retourné.\n
+        <contacts> garde les contacts d'un pas à l'autre, ceux du pas précédent sont traités
+        sans recherche s'ils se reproduisent (voir ContactsCache)."""
+        start = time.perf_counter()
+        self._timePrecision = min(
+            self.precision() * precisionScale, self._timeInterval / 2
+        )
         self._checkedInterval = 0
         self._onCollision = onCollision
+        self._inContact = []
+        self._contacts = contacts
+        self._sustained = contacts.sustained(self._objects) if contacts else []
+        impacts = 0
+        iterations = 0
         while self._checkedInterval < self._timeInterval:
-            self._checkedInterval += self._solveFirst(
-                self._timeInterval - self._checkedInterval
-            )
+            remaining = self._timeInterval - self._checkedInterval
+            # au moins une recherche, pour que la zone progresse toujours
+            if iterations and (
+                (self.maxIterations and iterations >= self.maxIterations)
+                or (
+                    self.maxResolutionTime
+                    and time.perf_counter() - start > self.maxResolutionTime
+                )
+            ):
+                self._freeze(remaining)
+                warning(
+                    f"Collision zone overrun after {iterations} iterations, "
+                    f"{remaining:.5f}s left, objects: "
+                    + ", ".join(
+                        f"{obj.__class__.__name__} {obj.formID()}"
+                        for obj in self._objects
+                    )
+                )
+                onZoneOverrun(self._objects)
+                return True
+            iterations += 1
+            if not self.simultaneousSolver:
+                self._checkedInterval += self._solveFirst(remaining)
+            elif impacts == self.maxImpacts:
+                # travail borné: le reste de l'intervalle est simulé avec les contacts figés
+                self._freeze(remaining)
+            else:
+                self._checkedInterval += self._solveSimultaneous(remaining)
+                impacts += 1
+        return False
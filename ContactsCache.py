@@ -0,0 +1,131 @@
+from typing import Dict, List, Tuple
+
+import lib
+
+from . import objects
+
+
+class ContactsCache:
+    """Garde d'un pas de physique à l'autre les contacts entre paires d'objets
+    (point, tangente et éléments en contact, voir Object.collisionContact()).\n
+    Un contact persistant (ex. kart frottant contre un mur) est ainsi recalculé à partir
+    de ses seuls éléments, et les zones de collisions peuvent le traiter sans refaire
+    la recherche du moment de la collision (voir CollisionsZone._searchFirst())."""
+
+    # nombre de pas sans contact après lesquels une paire est oubliée
+    maxAge: int = 1
+
+    # (formID, formID) -> (point, tangente, éléments, pas)
+    _contacts: Dict[Tuple[int, int], Tuple[lib.Point, lib.Vector, tuple, int]]
+    _step: int
+    _hits: int
+    _misses: int
+
+    def __init__(self) -> None:
+        self._contacts = {}
+        self._step = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+    def nextStep(self) -> None:
+        """À appeler avant chaque pas de physique, oublie les contacts trop anciens"""
+        self._step += 1
+        self._contacts = {
+            key: contact
+            for key, contact in self._contacts.items()
+            if self._step - contact[3] <= self.maxAge
+        }
+
+    def contact(
+        self, pair: Tuple[objects.Object, objects.Object]
+    ) -> Tuple[lib.Point, lib.Vector]:
+        """Retourne le point et la tangente du contact entre les deux objets
+        (voir Object.collisionPointAndTangent()) en réutilisant le contact précédent si possible."""
+        if pair[1].formID() < pair[0].formID():
+            pair = pair[1], pair[0]
+        key = pair[0].formID(), pair[1].formID()
+        cached = self._cached(key)
+        features = cached[2] if cached else None
+        point, tangent, newFeatures = pair[0].collisionContact(pair[1], features)
+        if cached:
+            if features is not None and newFeatures == features:
+                self._hits += 1
+            else:
+                self._misses += 1
+        self._contacts[key] = (point, tangent, newFeatures, self._step)
+        return point, tangent
+
+    def _cached(self, key: Tuple[int, int]) -> "tuple | None":
+        """Retourne le contact connu pour la paire de formIDs, None s'il n'y en a pas"""
+        return self._contacts.get(key)
+
+    def sustained(
+        self, objectsList: List[objects.Object]
+    ) -> List[Tuple[objects.Object, objects.Object]]:
+        """Retourne les paires des objets donnés qui étaient en contact au pas précédent"""
+        byFormID = {obj.formID(): obj for obj in objectsList}
+        return [
+            (byFormID[first], byFormID[second])
+            for (first, second), contact in self._contacts.items()
+            if contact[3] == self._step - 1
+            and first in byFormID
+            and second in byFormID
+        ]
+
+    def stats(self) -> Tuple[int, int]:
+        """Retourne le nombre de contacts réutilisés et le nombre de contacts dont les éléments
+        ont changé depuis le pas précédent"""
+        return self._hits, self._misses
+
+    def buffer(self) -> "ContactsBuffer":
+        """Retourne un tampon lisant ce cache sans le modifier, pour une zone résolue en parallèle.
+        Les contacts et compteurs du tampon sont ajoutés au cache par merge(), après les workers."""
+        return ContactsBuffer(self)
+
+    def merge(self, buffer: "ContactsBuffer") -> None:
+        """Ajoute au cache les contacts et compteurs d'un tampon créé par buffer()"""
+        self._contacts.update(buffer._contacts)
+        self._hits += buffer._hits
+        self._misses += buffer._misses
+
+    def clear(self) -> None:
+        """Oublie tous les contacts"""
+        self._contacts = {}
+
+    def saveState(self) -> tuple:
+        return (dict(self._contacts), self._step)
+
+    def loadState(self, state: tuple) -> None:
+        contacts, self._step = state
+        self._contacts = dict(contacts)
+
+    def copy(self) -> "ContactsCache":
+        """Retourne un cache indépendant avec les mêmes contacts"""
+        cache = ContactsCache()
+        cache.loadState(self.saveState())
+        return cache
+
+
+class ContactsBuffer(ContactsCache):
+    """Contacts d'une zone de collisions résolue en parallèle, voir ContactsCache.buffer().
+    Les nouveaux contacts sont écrits dans le tampon: le cache n'est jamais modifié
+    par plusieurs threads à la fois."""
+
+    _cache: ContactsCache
+
+    def __init__(self, cache: ContactsCache) -> None:
+        super().__init__()
+        self._cache = cache
+        self._step = cache._step
+
+    def _cached(self, key: Tuple[int, int]) -> "tuple | None":
+        cached = self._contacts.get(key)
+        return cached if cached else self._cache._cached(key)
+
+    def sustained(
+        self, objectsList: List[objects.Object]
+    ) -> List[Tuple[objects.Object, objects.Object]]:
+        return self._cache.sustained(objectsList)
@@ -1,9 +1,21 @@
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
 from logging import error, warning
-from typing import Callable, List
+from typing import Callable, List, Set, Tuple
 
+import lib
 from game.objects import Gate
 
 from . import events
+from .notifications import (
+    Dispatcher,
+    CollisionNotification,
+    BurnedNotification,
+    CompletedAllLapsNotification,
+    PassageNotification,
+    ZoneOverrunNotification,
+)
 from .objects import (
     Object,
     ObjectFactory,
@@ -13,13 +25,54 @@ from .objects import (
     onCompletedAllLapsT,
     onPassageT,
 )
-from .CollisionsZone import CollisionsZone, OnCollisionT
+from .CollisionsZone import CollisionsZone, OnCollisionT, OnZoneOverrunT
+from .ChangeList import ChangeList
+from .ContactsCache import ContactsCache
+from .Sensors import Sensors
+from .Standings import Standings
 
 
 class Game:
     _output: Callable[[List[Object]], None]
     _onCollision: OnCollisionT
+    _onZoneOverrun: OnZoneOverrunT
+    # callbacks des karts et portillons donnés au constructeur
+    _objectsCallbacks: tuple
+    # notifications différées, None pour appeler directement les callbacks
+    _dispatcher: "Dispatcher | None" = None
     _factory: ObjectFactory
+    _contacts: ContactsCache
+    # reçoit les changements à chaque affichage, voir set_onChanges()
+    _onChanges: "Callable[[ChangeList], None] | None" = None
+    # formIDs des objets présents lors du dernier appel à _onChanges
+    _knownObjects: Set[int]
+    _sensors: Sensors
+    _standings: Standings
+    # temps simulé (s) depuis le début de la partie
+    _time: float
+
+    # pas de temps fixe, 0 pour garder un pas variable
+    _fixedTimeStep: float
+    _maxSubSteps: int
+    _accumulator: float
+    _interpolationAlpha: float
+
+    # résolution parallèle des zones de collisions, None pour une résolution séquentielle
+    _executor: "ThreadPoolExecutor | None" = None
+
+    # durée maximale (s) de la physique par pas, au delà la précision des collisions est réduite
+    # (jusqu'à <maxPrecisionScale> fois), 0 pour désactiver
+    physicsBudget: float = 0
+    maxPrecisionScale: float = 16
+    _precisionScale: float = 1
+
+    # réutilise les contacts d'un pas à l'autre, voir ContactsCache: les contacts persistants
+    # sont traités sans recherche du moment de la collision
+    cacheContacts: bool = True
+
+    # paires écartées ou non par le test des cercles englobants, voir boundingCircleStats()
+    _boundingCircleRejections: int = 0
+    _boundingCircleOverlaps: int = 0
 
     def __init__(
         self,
@@ -29,15 +82,40 @@ class Game:
         kart_onBurned: onBurnedT = lambda k: None,
         kart_onCompletedAllLaps: onCompletedAllLapsT = lambda k: None,
         gate_onPassage: onPassageT = lambda g, k: None,
+        fixedTimeStep: float = 0,
+        maxSubSteps: int = 5,
+        onZoneOverrun: OnZoneOverrunT = lambda objs: None,
     ) -> None:
+        """<onZoneOverrun> est appelé avec les objets d'une zone de collision ayant dépassé
+        son budget, voir CollisionsZone.resolve()"""
         self._output = output
         self._onCollision = onCollision
+        self._onZoneOverrun = onZoneOverrun
+        self._objectsCallbacks = (
+            kart_onBurned,
+            kart_onCompletedAllLaps,
+            gate_onPassage,
+        )
         self._factory = ObjectFactory(
             fabric, kart_onBurned, kart_onCompletedAllLaps, gate_onPassage
         )
+        self._contacts = ContactsCache()
+        self._knownObjects = set()
+        self._sensors = Sensors()
+        self._standings = Standings()
+        self._time = 0
+        self._accumulator = 0
+        self._interpolationAlpha = 0
+        self.set_fixedTimeStep(fixedTimeStep, maxSubSteps)
 
     def nextFrame(self, elapsedTime: float, newEvents: List[events.Event] = []) -> None:
-        """Avance le temps d'<elapsedTime> miliseconde et affiche le jeu à cet instant."""
+        """Avance le temps d'<elapsedTime> miliseconde et affiche le jeu à cet instant.\n
+        Avec un pas de temps fixe (voir set_fixedTimeStep()), <elapsedTime> est ajouté à un accumulateur
+        et la physique est simulée par pas fixes autant de fois que nécessaire."""
+        if self._fixedTimeStep:
+            self._nextFixedFrame(elapsedTime, newEvents)
+            return
+
         if elapsedTime > 1 / 50:
             # warning(f"ElapsedTime too big: {elapsedTime}")
             elapsedTime = 1 / 60
@@ -47,32 +125,235 @@ class Game:
 
         # 2: appliquer la physique sur les objects
         self._simulatePhysics(elapsedTime)
+        self._flushNotifications()
 
         # 3: appeler output
         self.callOutput()
 
         self._factory.clean(elapsedTime)
 
+    def _nextFixedFrame(
+        self, elapsedTime: float, newEvents: List[events.Event]
+    ) -> None:
+        """nextFrame() en mode pas de temps fixe"""
+        self._accumulator += elapsedTime
+        self._applyEvents(newEvents)
+
+        subSteps = 0
+        while self._accumulator >= self._fixedTimeStep:
+            if subSteps == self._maxSubSteps:
+                # spirale de la mort: le temps qui ne peut pas être rattrapé est perdu
+                warning(
+                    f"Simulation is late, {self._accumulator:.3f}s of simulation dropped"
+                )
+                self._accumulator %= self._fixedTimeStep
+                break
+            self._registerEvents(self._fixedTimeStep)
+            self._simulatePhysics(self._fixedTimeStep)
+            self._accumulator -= self._fixedTimeStep
+            subSteps += 1
+
+        self._interpolationAlpha = self._accumulator / self._fixedTimeStep
+        self._flushNotifications()
+        self.callOutput()
+        self._factory.clean(elapsedTime)
+
+    def set_fixedTimeStep(self, fixedTimeStep: float, maxSubSteps: int = 5) -> None:
+        """Active la simulation par pas de temps fixe de <fixedTimeStep> secondes,
+        avec au plus <maxSubSteps> pas par appel à nextFrame(). 0 pour revenir à un pas variable."""
+        if fixedTimeStep < 0 or maxSubSteps < 1:
+            raise ValueError("Invalid fixed time step")
+        self._fixedTimeStep = fixedTimeStep
+        self._maxSubSteps = maxSubSteps
+        self._accumulator = 0
+        self._interpolationAlpha = 0
+
+    def set_parallelZones(self, workers: int) -> None:
+        """Résout les zones de collisions indépendantes sur <workers> threads, 0 pour une résolution séquentielle.
+        Les appels à onCollision restent dans le même ordre qu'en séquentiel, voir CollisionsZone.resolveAll()"""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+        if workers > 0:
+            self._executor = ThreadPoolExecutor(workers)
+
+    def fixedTimeStep(self) -> float:
+        """Retourne le pas de temps fixe, 0 si le pas est variable"""
+        return self._fixedTimeStep
+
+    def maxSubSteps(self) -> int:
+        """Retourne le nombre maximal de pas fixes par appel à nextFrame()"""
+        return self._maxSubSteps
+
+    def interpolationAlpha(self) -> float:
+        """En mode pas de temps fixe, retourne la fraction (entre 0 et 1) du prochain pas déjà écoulée.
+        À utiliser pour interpoler l'affichage entre l'état précédent et l'état actuel."""
+        return self._interpolationAlpha
+
     def handleEvents(self, elapsedTime: float, newEvents: List[events.Event]) -> None:
-        """Récupère et gère les évènements"""
-        for event in newEvents:
+        """Récupère et gère les évènements.
+        Les évènements redondants (voir EventsBatch.coalesced()) sont ignorés."""
+        self._applyEvents(newEvents)
+        self._registerEvents(elapsedTime)
+
+    def _applyEvents(self, newEvents: List[events.Event]) -> None:
+        """Applique les évènements sur les objets"""
+        for event in events.EventsBatch(newEvents).coalesced():
             event.apply(self._factory)
+
+    def _registerEvents(self, elapsedTime: float) -> None:
+        """Signale aux objets que les évènements ont été traités"""
         for obj in self._factory.objects():
             obj.onEventsRegistered(deltaTime=elapsedTime)
 
     def _simulatePhysics(self, elapsedTime: float) -> None:
         """Attention, c'est là que ça se passe!"""
-        zones, others = CollisionsZone.create(self._factory.objects(), elapsedTime)
+        # les objets détruits durant un pas précédent de la même frame ne participent plus
+        objs = [o for o in self._factory.objects() if not o.lastFrame()]
+        # les objets non solides (portillons) sont traités à part, voir Sensors
+        bodies = [o for o in objs if o.isSolid()]
+        zones, others = CollisionsZone.create(bodies, elapsedTime)
+        if self._factory.own(obj for zone in zones for obj in zone.objectsInside()):
+            # les objets partagés avec une autre partie ont été remplacés par des copies
+            objs = [o for o in self._factory.objects() if not o.lastFrame()]
+            bodies = [o for o in objs if o.isSolid()]
+            zones, others = CollisionsZone.create(bodies, elapsedTime)
+        for zone in zones:
+            # un objet en mouvement est à proximité
+            for obj in zone.objectsInside():
+                obj.wakeUp()
+        sensors = [o for o in objs if not o.isSolid()]
+        self._sensors.record(bodies, sensors)
+        others = [o for o in others if not o.isSleeping()]
+        self._contacts.nextStep()
+        start = time.perf_counter()
+        CollisionsZone.resolveAll(
+            zones,
+            others,
+            elapsedTime,
+            self._recordCollision if self._dispatcher else self._onCollision,
+            self._executor,
+            self._precisionScale,
+            self._recordZoneOverrun if self._dispatcher else self._onZoneOverrun,
+            self._contacts if self.cacheContacts else None,
+        )
         for zone in zones:
-            zone.resolve(self._onCollision)
-        for other in others:
-            other.updateReferences(elapsedTime)
+            rejections, overlaps = zone.boundingCircleStats()
+            self._boundingCircleRejections += rejections
+            self._boundingCircleOverlaps += overlaps
+        if self.physicsBudget:
+            duration = time.perf_counter() - start
+            if duration > self.physicsBudget:
+                self._precisionScale = min(
+                    self._precisionScale * 2, self.maxPrecisionScale
+                )
+            elif duration < self.physicsBudget / 2:
+                self._precisionScale = max(self._precisionScale / 2, 1)
+        # sur les trajets effectivement parcourus, avant d'avancer les capteurs
+        self._sensors.detect(sensors, self._factory, elapsedTime, self._time)
+        for sensor in sensors:
+            if not sensor.isStatic():
+                sensor.updateReferences(elapsedTime)
+        self._sensors.fire(self._factory)
+        self._time += elapsedTime
+        self._factory.advanceTime(elapsedTime)
+        for obj in objs:
+            obj.updateSleeping()
+        self._standings.update(self._factory, self._time)
+
+    def set_dispatcher(self, dispatcher: "Dispatcher | None") -> None:
+        """Diffère les callbacks (collisions, karts brûlés ou arrivés, passages, zones en dépassement):
+        ils sont enregistrés comme notifications dans <dispatcher> durant la physique, puis délivrés
+        en un seul lot à chaque frame (voir Dispatcher). None pour revenir aux appels directs."""
+        self._dispatcher = dispatcher
+        if dispatcher:
+            self._factory.set_callbacks(
+                self._recordBurned, self._recordCompletedAllLaps, self._recordPassage
+            )
+        else:
+            self._factory.set_callbacks(*self._objectsCallbacks)
+
+    def dispatcher(self) -> "Dispatcher | None":
+        """Nom explicite"""
+        return self._dispatcher
+
+    def _recordCollision(
+        self, objects: Tuple[Object, Object], point: lib.Point
+    ) -> None:
+        self._dispatcher.record(CollisionNotification(self._time, objects, point))
+
+    def _recordZoneOverrun(self, objects: List[Object]) -> None:
+        self._dispatcher.record(ZoneOverrunNotification(self._time, objects))
+
+    def _recordBurned(self, kart: Kart) -> None:
+        self._dispatcher.record(BurnedNotification(self._time, kart))
+
+    def _recordCompletedAllLaps(self, kart: Kart) -> None:
+        self._dispatcher.record(CompletedAllLapsNotification(self._time, kart))
+
+    def _recordPassage(self, gate: Gate, kart: Kart) -> None:
+        self._dispatcher.record(PassageNotification(self._time, gate, kart))
+
+    def _flushNotifications(self) -> None:
+        """Délivre les notifications différées de la frame"""
+        if self._dispatcher:
+            self._dispatcher.flush()
 
     def callOutput(self) -> None:
         """Met l'affichage à jour"""
         objects = self._factory.objects()
         if len(objects):
             self._output(objects)
+        if self._onChanges:
+            self._onChanges(self.changes())
+
+    def set_onChanges(self, onChanges: "Callable[[ChangeList], None] | None") -> None:
+        """<onChanges> sera appelé à chaque affichage avec les changements depuis l'affichage précédent,
+        le premier appel contient tous les objets. None pour désactiver."""
+        self._onChanges = onChanges
+        self._knownObjects = set()
+
+    def changes(self) -> ChangeList:
+        """Retourne les changements depuis l'appel précédent et les oublie"""
+        current = {
+            obj.formID(): obj
+            for obj in self._factory.objects()
+            if not obj.lastFrame()
+        }
+        created = []
+        changed = []
+        for formID, obj in current.items():
+            if formID not in self._knownObjects:
+                created.append(obj)
+            elif obj.dirtyFields():
+                changed.append((obj, obj.dirtyFields()))
+        destroyed = [formID for formID in self._knownObjects if formID not in current]
+        for obj in self._factory.objects():
+            obj.clearDirty()
+        self._knownObjects = set(current)
+        return ChangeList(created, changed, destroyed)
+
+    def time(self) -> float:
+        """Retourne le temps simulé (s) depuis le début de la partie"""
+        return self._time
+
+    def standings(self) -> Standings:
+        """Retourne le classement en direct des karts"""
+        return self._standings
+
+    def contactsCache(self) -> ContactsCache:
+        """Retourne le cache des contacts"""
+        return self._contacts
+
+    def boundingCircleStats(self) -> Tuple[int, int]:
+        """Retourne le nombre de paires écartées par le test des cercles englobants
+        et le nombre de paires testées précisément, cumulés sur toutes les zones de collisions"""
+        return self._boundingCircleRejections, self._boundingCircleOverlaps
+
+    def resetBoundingCircleStats(self) -> None:
+        """Remet les compteurs de boundingCircleStats() à zéro"""
+        self._boundingCircleRejections = 0
+        self._boundingCircleOverlaps = 0
 
     def objectsFactory(self) -> ObjectFactory:
         """Retourne la factory"""
@@ -91,6 +372,63 @@ class Game:
         self._factory.minimalImport(minimalExport)
         self.callOutput()
 
+    def snapshot(self) -> tuple:
+        """Capture l'état complet de la partie (physique comprise), à restaurer avec restore().
+        Le format est interne, la géométrie fixe des objets est partagée et non copiée."""
+        return (
+            self._factory.saveState(),
+            self._contacts.saveState(),
+            self._standings.saveState(),
+            self._time,
+            self._accumulator,
+            self._interpolationAlpha,
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        """Remet la partie dans l'état capturé par snapshot(), sans appeler output"""
+        (
+            factoryState,
+            contactsState,
+            standingsState,
+            self._time,
+            self._accumulator,
+            self._interpolationAlpha,
+        ) = snapshot
+        self._factory.loadState(factoryState)
+        self._contacts.loadState(contactsState)
+        self._standings.loadState(standingsState)
+
+    def fork(
+        self,
+        output: Callable[[List[Object]], None] = lambda objects: None,
+        onCollision: OnCollisionT = lambda o, p: None,
+        kart_onBurned: onBurnedT = lambda k: None,
+        kart_onCompletedAllLaps: onCompletedAllLapsT = lambda k: None,
+        gate_onPassage: onPassageT = lambda g, k: None,
+    ) -> "Game":
+        """Retourne une partie indépendante dans le même état que celle-ci, pour simuler différents futurs.
+        Les objets immobiles sont partagés jusqu'à leur première modification (voir ObjectFactory.fork()).
+        Par défaut, la partie retournée n'appelle aucun callback."""
+        forked = copy.copy(self)
+        forked._output = output
+        forked._onCollision = onCollision
+        forked._onZoneOverrun = lambda objs: None
+        forked._objectsCallbacks = (
+            kart_onBurned,
+            kart_onCompletedAllLaps,
+            gate_onPassage,
+        )
+        forked._dispatcher = None
+        forked._onChanges = None
+        forked._executor = None
+        forked._contacts = self._contacts.copy()
+        forked._sensors = Sensors()
+        forked._standings = self._standings.copy()
+        forked._factory = self._factory.fork(
+            kart_onBurned, kart_onCompletedAllLaps, gate_onPassage
+        )
+        return forked
+
     def objectByFormID(self, formID: int) -> Object:
         return self._factory[formID]
 
@@ -0,0 +1,115 @@
+import asyncio
+from logging import warning
+from typing import Awaitable, Callable, List
+
+from . import events
+from .Game import Game
+
+OutputSinkT = Callable[[Game], Awaitable[None]]
+OnOverrunT = Callable[[float], None]
+
+
+class GameRunner:
+    """Boucle asyncio faisant avancer une partie à fréquence fixe.\n
+    Les évènements de toutes les connexions sont reçus dans une asyncio.Queue et
+    regroupés à chaque tick. Le prochain tick est calculé à partir de l'heure prévue
+    (et non de la fin du précédent) pour ne pas dériver. Un tick trop lent est signalé
+    à <onOverrun> avec son retard (s); plusieurs parties peuvent partager la même boucle.\n
+    Après un retard de plus d'un tick, les ticks manqués ne sont pas enchaînés. Le temps écoulé
+    n'est rattrapé que si la partie a un pas de temps fixe (voir Game.set_fixedTimeStep()),
+    sinon Game.nextFrame() le tronque et il est perdu pour la simulation."""
+
+    _game: Game
+    _tickDuration: float
+    _queue: "asyncio.Queue[events.Event]"
+    _outputSink: "OutputSinkT | None"
+    _onOverrun: OnOverrunT
+    _running: bool
+    _ticks: int
+    _overruns: int
+
+    def __init__(
+        self,
+        game: Game,
+        tickRate: float = 60,
+        outputSink: OutputSinkT = None,
+        onOverrun: OnOverrunT = lambda lateness: None,
+    ) -> None:
+        self._game = game
+        self._tickDuration = 1 / tickRate
+        self._queue = asyncio.Queue()
+        self._outputSink = outputSink
+        self._onOverrun = onOverrun
+        self._running = False
+        self._ticks = 0
+        self._overruns = 0
+
+    def game(self) -> Game:
+        """Nom explicite"""
+        return self._game
+
+    def pushEvent(self, event: events.Event) -> None:
+        """Ajoute un évènement qui sera traité au prochain tick"""
+        self._queue.put_nowait(event)
+
+    def pushEventsBatch(self, frame: bytes) -> None:
+        """Ajoute les évènements encodés par EventsBatch.toBytes()"""
+        for event in events.EventsBatch.fromBytes(frame):
+            self._queue.put_nowait(event)
+
+    def ticks(self) -> int:
+        """Retourne le nombre de ticks effectués"""
+        return self._ticks
+
+    def overruns(self) -> int:
+        """Retourne le nombre de ticks ayant dépassé leur échéance"""
+        return self._overruns
+
+    def _drainEvents(self) -> List[events.Event]:
+        """Retourne tous les évènements reçus depuis le dernier tick"""
+        newEvents = []
+        while not self._queue.empty():
+            newEvents.append(self._queue.get_nowait())
+        return newEvents
+
+    async def tick(self, elapsedTime: float) -> None:
+        """Effectue un unique tick"""
+        self._game.nextFrame(elapsedTime, self._drainEvents())
+        self._ticks += 1
+        if self._outputSink:
+            await self._outputSink(self._game)
+
+    async def run(self) -> None:
+        """Fait tourner la partie jusqu'à l'appel de stop()"""
+        loop = asyncio.get_running_loop()
+        self._running = True
+        lastTick = loop.time()
+        deadline = lastTick + self._tickDuration
+        while self._running:
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = loop.time()
+            await self.tick(now - lastTick)
+            lastTick = now
+
+            deadline += self._tickDuration
+            lateness = loop.time() - deadline
+            if lateness > 0:
+                self._overruns += 1
+                self._onOverrun(lateness)
+                if lateness > self._tickDuration:
+                    # inutile d'enchaîner les ticks en retard: avec un pas fixe, le temps est
+                    # rattrapé par l'accumulateur au tick suivant, sinon il est perdu
+                    if self._game.fixedTimeStep():
+                        warning(f"Tick overrun by {lateness:.3f}s, skipping ticks")
+                    else:
+                        warning(
+                            f"Tick overrun by {lateness:.3f}s, skipping ticks,"
+                            " simulated time dropped"
+                        )
+                    deadline = loop.time() + self._tickDuration
+
+    def stop(self) -> None:
+        """Arrête run() après le tick en cours"""
+        self._running = False
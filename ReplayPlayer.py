@@ -0,0 +1,169 @@
+import io
+import itertools
+import json
+import pickle
+from typing import Callable, Dict, List, Tuple
+
+import lib
+
+from . import events
+from .Game import Game
+from .objects import (
+    Object,
+    ObjectFactory,
+    Kart,
+    Gate,
+    onBurnedT,
+    onCompletedAllLapsT,
+    onPassageT,
+)
+from .CollisionsZone import OnCollisionT
+from .ReplayRecorder import ReplayRecorder
+
+
+class ReplayPlayer:
+    """Relit une partie enregistrée par ReplayRecorder.\\n
+    seek() restaure l'image clé la plus proche puis rejoue les ticks suivants sans affichage
+    ni callbacks, ce qui permet d'atteindre n'importe quel tick bien plus vite qu'en temps réel."""
+
+    _game: Game
+    _ticks: List[Tuple[float, bytes]]
+    _keyframes: Dict[int, bytes]
+    _tick: int
+    _silent: bool
+
+    _output: Callable[[List[Object]], None]
+    _onCollision: OnCollisionT
+    _kart_onBurned: onBurnedT
+    _kart_onCompletedAllLaps: onCompletedAllLapsT
+    _gate_onPassage: onPassageT
+
+    def __init__(
+        self,
+        path: str,
+        output: Callable[[List[Object]], None] = lambda objects: None,
+        onCollision: OnCollisionT = lambda o, p: None,
+        kart_onBurned: onBurnedT = lambda k: None,
+        kart_onCompletedAllLaps: onCompletedAllLapsT = lambda k: None,
+        gate_onPassage: onPassageT = lambda g, k: None,
+    ) -> None:
+        self._output = output
+        self._onCollision = onCollision
+        self._kart_onBurned = kart_onBurned
+        self._kart_onCompletedAllLaps = kart_onCompletedAllLaps
+        self._gate_onPassage = gate_onPassage
+        self._ticks = []
+        self._keyframes = {}
+        self._silent = True
+
+        header = None
+        with open(path, "rb") as file:
+            data = file.read()
+        offset = 0
+        recordHeader = ReplayRecorder.recordHeader
+        while offset + recordHeader.size <= len(data):
+            recordType, length = recordHeader.unpack_from(data, offset)
+            offset += recordHeader.size
+            if offset + length > len(data):
+                # enregistrement interrompu
+                break
+            payload = data[offset : offset + length]
+            offset += length
+            if recordType == ReplayRecorder.HEADER:
+                header = json.loads(payload.decode("utf-8"))
+            elif recordType == ReplayRecorder.TICK:
+                size = ReplayRecorder.tickHeader.size
+                (elapsedTime,) = ReplayRecorder.tickHeader.unpack_from(payload)
+                self._ticks.append((elapsedTime, payload[size:]))
+            elif recordType == ReplayRecorder.KEYFRAME:
+                size = ReplayRecorder.keyframeHeader.size
+                (tick,) = ReplayRecorder.keyframeHeader.unpack_from(payload)
+                self._keyframes[tick] = payload[size:]
+        if header is None or 0 not in self._keyframes:
+            raise ValueError("Invalid replay file")
+
+        self._game = Game(
+            header["fabric"],
+            lambda objects: None if self._silent else self._output(objects),
+            lambda o, p: None if self._silent else self._onCollision(o, p),
+            lambda k: None if self._silent else self._kart_onBurned(k),
+            lambda k: None if self._silent else self._kart_onCompletedAllLaps(k),
+            lambda g, k: None if self._silent else self._gate_onPassage(g, k),
+            fixedTimeStep=header["fixedTimeStep"],
+            maxSubSteps=header["maxSubSteps"],
+        )
+        self._restoreKeyframe(0)
+        self._silent = False
+
+    def game(self) -> Game:
+        """Retourne la partie rejouée"""
+        return self._game
+
+    def tick(self) -> int:
+        """Retourne le prochain tick qui sera joué par nextFrame()"""
+        return self._tick
+
+    def length(self) -> int:
+        """Retourne le nombre de ticks enregistrés"""
+        return len(self._ticks)
+
+    def _restoreKeyframe(self, tick: int) -> None:
+        factory = self._game.objectsFactory()
+        existing = {
+            obj.formID(): obj
+            for obj in itertools.chain(
+                factory.objects(), factory.kartPlaceholders(), factory.deletedObjects()
+            )
+        }
+        unpickler = _KeyframeUnpickler(io.BytesIO(self._keyframes[tick]), existing)
+        self._game.restore(unpickler.load())
+        self._tick = tick
+
+    def _play(self) -> None:
+        elapsedTime, frame = self._ticks[self._tick]
+        self._game.nextFrame(elapsedTime, events.EventsBatch.fromBytes(frame).events())
+        self._tick += 1
+
+    def seek(self, tick: int) -> None:
+        """Place la partie juste avant le tick donné, sans afficher les ticks intermédiaires"""
+        if not 0 <= tick <= len(self._ticks):
+            raise IndexError(f"Tick {tick} out of range")
+        keyframe = max(k for k in self._keyframes if k <= tick)
+        self._silent = True
+        try:
+            if not keyframe <= self._tick <= tick:
+                self._restoreKeyframe(keyframe)
+            while self._tick < tick:
+                self._play()
+        finally:
+            self._silent = False
+        self._game.callOutput()
+
+    def nextFrame(self) -> bool:
+        """Joue le prochain tick, retourne faux si la fin de l'enregistrement est atteinte"""
+        if self._tick >= len(self._ticks):
+            return False
+        self._play()
+        return True
+
+
+class _KeyframeUnpickler(pickle.Unpickler):
+    """Retrouve les objets enregistrés par _KeyframePickler, en les recréant si nécessaire"""
+
+    _existing: Dict[int, Object]
+
+    def __init__(self, file: io.BytesIO, existing: Dict[int, Object]) -> None:
+        super().__init__(file)
+        self._existing = existing
+
+    def persistent_load(self, pid):
+        formID, minimalDict = pid
+        obj = self._existing.get(formID)
+        if obj is None:
+            if minimalDict is None:
+                raise pickle.UnpicklingError(f"Unknown object {formID}")
+            objectClass = ObjectFactory.objectsClasses[minimalDict["class"]]
+            obj = objectClass(**objectClass.fromMinimalDict(dict(minimalDict)))
+            ObjectFactory.setCollisionFilter(obj)
+            self._existing[formID] = obj
+        return obj
@@ -0,0 +1,100 @@
+import io
+import json
+import pickle
+import struct
+from typing import List
+
+from . import events
+from .Game import Game
+from .objects import Object
+
+
+class ReplayRecorder:
+    """Enregistre une partie dans un fichier, à relire avec ReplayPlayer.\\n
+    Le fichier est une suite d'enregistrements (type, taille, contenu) écrits uniquement à la fin:
+    un en-tête (le monde et la configuration du pas de temps), puis pour chaque tick
+    le temps écoulé et ses évènements (EventsBatch), et toutes les <keyframeInterval> ticks
+    une image clé contenant l'état complet de la partie (Game.snapshot())."""
+
+    HEADER = 0
+    TICK = 1
+    KEYFRAME = 2
+
+    recordHeader = struct.Struct("<BI")
+    tickHeader = struct.Struct("<d")
+    keyframeHeader = struct.Struct("<Q")
+
+    keyframeInterval: int = 300
+
+    _game: Game
+    _file: io.BufferedWriter
+    _tick: int
+
+    def __init__(
+        self, game: Game, fabric: str, path: str, keyframeInterval: int = 0
+    ) -> None:
+        """<fabric> doit être le monde à partir duquel <game> a été créé"""
+        self._game = game
+        if keyframeInterval:
+            self.keyframeInterval = keyframeInterval
+        self._file = open(path, "wb")
+        self._tick = 0
+        header = {
+            "fabric": fabric,
+            "fixedTimeStep": game.fixedTimeStep(),
+            "maxSubSteps": game.maxSubSteps(),
+        }
+        self._write(self.HEADER, json.dumps(header).encode("utf-8"))
+        self.recordKeyframe()
+
+    def _write(self, recordType: int, payload: bytes) -> None:
+        self._file.write(self.recordHeader.pack(recordType, len(payload)))
+        self._file.write(payload)
+
+    def game(self) -> Game:
+        """Nom explicite"""
+        return self._game
+
+    def tick(self) -> int:
+        """Retourne le nombre de ticks enregistrés"""
+        return self._tick
+
+    def nextFrame(
+        self, elapsedTime: float, newEvents: List[events.Event] = []
+    ) -> None:
+        """Enregistre le tick puis appelle Game.nextFrame()"""
+        if self._tick and self._tick % self.keyframeInterval == 0:
+            self.recordKeyframe()
+        self._write(
+            self.TICK,
+            self.tickHeader.pack(elapsedTime)
+            + events.EventsBatch(newEvents).toBytes(),
+        )
+        self._game.nextFrame(elapsedTime, newEvents)
+        self._tick += 1
+
+    def recordKeyframe(self) -> None:
+        """Enregistre l'état complet de la partie avant le prochain tick.
+        À appeler après toute modification faite hors des évènements (ex. loadKart())."""
+        buffer = io.BytesIO()
+        _KeyframePickler(buffer).dump(self._game.snapshot())
+        self._write(
+            self.KEYFRAME, self.keyframeHeader.pack(self._tick) + buffer.getvalue()
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        """Termine l'enregistrement"""
+        self._file.close()
+
+
+class _KeyframePickler(pickle.Pickler):
+    """Les objets sont enregistrés par leur formID, ceux qui n'existent pas dans le monde
+    initial (ex. boules de feu) avec en plus de quoi les recréer (toMinimalDict())."""
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Object):
+            if obj.groupID() > 1:
+                return (obj.formID(), obj.toMinimalDict())
+            return (obj.formID(), None)
+        return None
@@ -0,0 +1,316 @@
+import multiprocessing
+import os
+import pickle
+import time
+from logging import info
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Tuple
+
+import lib
+
+from . import events
+from .Game import Game
+from .objects import Object, Kart, Gate
+
+
+class _Room:
+    """Partie hébergée par un worker, garde les notifications de la frame en attendant leur envoi à l'hôte.
+    Les callbacks sont des méthodes (et non des lambdas) pour que la partie reste sérialisable."""
+
+    game: Game
+    notifications: List[tuple]
+    stepDuration: float
+
+    def __init__(self, fabric: str, fixedTimeStep: float) -> None:
+        self.notifications = []
+        self.stepDuration = 0
+        self.game = Game(
+            fabric,
+            self.onOutput,
+            self.onCollision,
+            self.onBurned,
+            self.onCompletedAllLaps,
+            self.onPassage,
+            fixedTimeStep=fixedTimeStep,
+            onZoneOverrun=self.onZoneOverrun,
+        )
+
+    def onOutput(self, objects: List[Object]) -> None:
+        """L'affichage est fait par l'hôte à partir des exports"""
+
+    def onCollision(self, objects: Tuple[Object, Object], point: lib.Point) -> None:
+        self.notifications.append(
+            ("collision", objects[0].formID(), objects[1].formID(), tuple(point))
+        )
+
+    def onBurned(self, kart: Kart) -> None:
+        self.notifications.append(("burned", kart.formID()))
+
+    def onCompletedAllLaps(self, kart: Kart) -> None:
+        self.notifications.append(("completedAllLaps", kart.formID()))
+
+    def onPassage(self, gate: Gate, kart: Kart) -> None:
+        self.notifications.append(("passage", gate.formID(), kart.formID()))
+
+    def onZoneOverrun(self, objects: List[Object]) -> None:
+        self.notifications.append(
+            ("zoneOverrun", tuple(obj.formID() for obj in objects))
+        )
+
+
+class _RoomsWorker:
+    """Exécute les commandes de l'hôte sur les parties qui lui sont attribuées.
+    Utilisé tel quel en mode local, ou dans un processus séparé par _serve()."""
+
+    _rooms: Dict[Any, _Room]
+
+    def __init__(self) -> None:
+        self._rooms = {}
+
+    def handle(self, command: tuple) -> Any:
+        """Exécute la commande et retourne sa réponse"""
+        name, *args = command
+        return getattr(self, "_" + name)(*args)
+
+    def _create(self, roomID: Any, fabric: str, fixedTimeStep: float) -> None:
+        self._rooms[roomID] = _Room(fabric, fixedTimeStep)
+
+    def _remove(self, roomID: Any) -> None:
+        self._rooms.pop(roomID)
+
+    def _loadKart(
+        self, roomID: Any, username: str, img: str, placeHolder: "int | None"
+    ) -> int:
+        return self._rooms[roomID].game.loadKart(username, img, placeHolder)
+
+    def _unloadKart(self, roomID: Any, placeHolder: int) -> None:
+        self._rooms[roomID].game.unloadKart(placeHolder)
+
+    def _step(
+        self, elapsedTime: float, roomsEvents: Dict[Any, bytes]
+    ) -> Dict[Any, Tuple[dict, List[tuple], float]]:
+        results = {}
+        for roomID, room in self._rooms.items():
+            frame = roomsEvents.get(roomID)
+            newEvents = events.EventsBatch.fromBytes(frame).events() if frame else []
+            start = time.perf_counter()
+            room.game.nextFrame(elapsedTime, newEvents)
+            room.stepDuration = time.perf_counter() - start
+            results[roomID] = (
+                room.game.minimalExport(),
+                room.notifications,
+                room.stepDuration,
+            )
+            room.notifications = []
+        return results
+
+    def _export(self, roomID: Any) -> bytes:
+        # la partie n'est retirée qu'une fois sérialisée, elle reste en jeu en cas d'erreur
+        room = pickle.dumps(self._rooms[roomID])
+        del self._rooms[roomID]
+        return room
+
+    def _import(self, roomID: Any, room: bytes) -> None:
+        self._rooms[roomID] = pickle.loads(room)
+
+
+def _serve(connection: Connection) -> None:
+    """Boucle d'un processus worker"""
+    worker = _RoomsWorker()
+    while True:
+        command = connection.recv()
+        if command[0] == "stop":
+            connection.close()
+            return
+        try:
+            connection.send((True, worker.handle(command)))
+        except Exception as e:
+            connection.send((False, e))
+
+
+class _LocalWorker:
+    """Worker exécuté dans le processus de l'hôte, même interface que _ProcessWorker"""
+
+    _worker: _RoomsWorker
+    _pending: List[tuple]
+
+    def __init__(self) -> None:
+        self._worker = _RoomsWorker()
+        self._pending = []
+
+    def send(self, command: tuple) -> None:
+        self._pending.append(command)
+
+    def recv(self) -> Any:
+        return self._worker.handle(self._pending.pop(0))
+
+    def stop(self) -> None:
+        pass
+
+
+class _ProcessWorker:
+    """Worker exécuté dans un processus séparé, les commandes passent par un pipe"""
+
+    _connection: Connection
+    _process: multiprocessing.Process
+
+    def __init__(self, context) -> None:
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child,), daemon=True)
+        self._process.start()
+        child.close()
+
+    def send(self, command: tuple) -> None:
+        self._connection.send(command)
+
+    def recv(self) -> Any:
+        succeeded, result = self._connection.recv()
+        if not succeeded:
+            raise result
+        return result
+
+    def stop(self) -> None:
+        self._connection.send(("stop",))
+        self._process.join()
+
+
+class RoomsHost:
+    """Héberge plusieurs parties sans affichage, réparties sur un groupe de processus.\n
+    Les évènements sont transmis au worker propriétaire de la partie lors du step() suivant,
+    celui-ci retourne pour chaque partie son minimalExport() et les notifications de la frame
+    (tuples de formIDs, voir _Room). Les parties sont régulièrement redistribuées
+    lorsqu'un worker est plus chargé que les autres.\n
+    En mode local, toutes les parties sont simulées dans le processus courant (pour les tests)."""
+
+    # nombre de step() entre deux rééquilibrages, 0 pour désactiver
+    rebalanceInterval: int = 300
+    # un worker est considéré comme chargé lorsque sa charge dépasse celle du moins chargé de ce facteur
+    rebalanceRatio: float = 1.5
+
+    _workers: "List[_LocalWorker | _ProcessWorker]"
+    _owners: Dict[Any, int]
+    _pendingEvents: Dict[Any, events.EventsBatch]
+    _stepDurations: Dict[Any, float]
+    _steps: int
+
+    def __init__(self, workers: int = 0, local: bool = False) -> None:
+        """<workers> vaut par défaut le nombre de processeurs"""
+        workers = workers or os.cpu_count() or 1
+        if local:
+            self._workers = [_LocalWorker() for _ in range(workers)]
+        else:
+            context = multiprocessing.get_context("spawn")
+            self._workers = [_ProcessWorker(context) for _ in range(workers)]
+        self._owners = {}
+        self._pendingEvents = {}
+        self._stepDurations = {}
+        self._steps = 0
+
+    def _call(self, worker: int, *command: Any) -> Any:
+        """Exécute une commande sur un worker et attend sa réponse"""
+        self._workers[worker].send(command)
+        return self._workers[worker].recv()
+
+    def workersLoads(self) -> List[float]:
+        """Retourne la durée (s) du dernier step() de chaque worker"""
+        loads = [0.0] * len(self._workers)
+        for roomID, worker in self._owners.items():
+            loads[worker] += self._stepDurations.get(roomID, 0)
+        return loads
+
+    def rooms(self) -> List[Any]:
+        """Retourne les identifiants des parties hébergées"""
+        return list(self._owners.keys())
+
+    def createRoom(self, roomID: Any, fabric: str, fixedTimeStep: float = 0) -> None:
+        """Créé une partie sur le worker le moins chargé"""
+        if roomID in self._owners:
+            raise KeyError(f"Room {roomID} already exists")
+        loads = self.workersLoads()
+        counts = [0] * len(self._workers)
+        for worker in self._owners.values():
+            counts[worker] += 1
+        worker = min(range(len(self._workers)), key=lambda w: (loads[w], counts[w]))
+        self._call(worker, "create", roomID, fabric, fixedTimeStep)
+        self._owners[roomID] = worker
+
+    def removeRoom(self, roomID: Any) -> None:
+        """Supprime la partie"""
+        self._call(self._owners.pop(roomID), "remove", roomID)
+        self._pendingEvents.pop(roomID, None)
+        self._stepDurations.pop(roomID, None)
+
+    def loadKart(
+        self, roomID: Any, username: str, img: str, placeHolder: int = None
+    ) -> int:
+        """Voir Game.loadKart()"""
+        return self._call(
+            self._owners[roomID], "loadKart", roomID, username, img, placeHolder
+        )
+
+    def unloadKart(self, roomID: Any, placeHolder: int) -> None:
+        """Voir Game.unloadKart()"""
+        self._call(self._owners[roomID], "unloadKart", roomID, placeHolder)
+
+    def pushEvents(self, roomID: Any, newEvents: List[events.Event]) -> None:
+        """Ajoute des évènements à transmettre à la partie lors du prochain step()"""
+        if roomID not in self._owners:
+            raise KeyError(f"Unknown room {roomID}")
+        batch = self._pendingEvents.setdefault(roomID, events.EventsBatch())
+        for event in newEvents:
+            batch.append(event)
+
+    def step(self, elapsedTime: float) -> Dict[Any, Tuple[dict, List[tuple]]]:
+        """Avance toutes les parties en parallèle,
+        retourne pour chacune son minimalExport() et ses notifications."""
+        roomsEvents: List[Dict[Any, bytes]] = [{} for _ in self._workers]
+        for roomID, batch in self._pendingEvents.items():
+            batch.coalesce()
+            roomsEvents[self._owners[roomID]][roomID] = batch.toBytes()
+        self._pendingEvents = {}
+
+        for worker in range(len(self._workers)):
+            self._workers[worker].send(("step", elapsedTime, roomsEvents[worker]))
+        results = {}
+        for worker in self._workers:
+            for roomID, (export, notifications, duration) in worker.recv().items():
+                results[roomID] = (export, notifications)
+                self._stepDurations[roomID] = duration
+
+        self._steps += 1
+        if self.rebalanceInterval and self._steps % self.rebalanceInterval == 0:
+            self.rebalance()
+        return results
+
+    def moveRoom(self, roomID: Any, worker: int) -> None:
+        """Déplace la partie sur le worker donné"""
+        current = self._owners[roomID]
+        if current == worker:
+            return
+        room = self._call(current, "export", roomID)
+        self._call(worker, "import", roomID, room)
+        self._owners[roomID] = worker
+
+    def rebalance(self) -> None:
+        """Déplace une partie du worker le plus chargé vers le moins chargé si nécessaire"""
+        loads = self.workersLoads()
+        hottest = max(range(len(loads)), key=lambda w: loads[w])
+        coolest = min(range(len(loads)), key=lambda w: loads[w])
+        if loads[hottest] <= loads[coolest] * self.rebalanceRatio:
+            return
+        candidates = [r for r, w in self._owners.items() if w == hottest]
+        if len(candidates) < 2:
+            return
+        # la partie qui égalise au mieux les deux charges
+        gap = (loads[hottest] - loads[coolest]) / 2
+        roomID = min(candidates, key=lambda r: abs(self._stepDurations.get(r, 0) - gap))
+        info(f"Moving room {roomID} from worker {hottest} to worker {coolest}")
+        self.moveRoom(roomID, coolest)
+        self._stepDurations[roomID] = 0
+
+    def close(self) -> None:
+        """Arrête les workers, les parties sont perdues"""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+        self._owners = {}
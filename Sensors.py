@@ -0,0 +1,168 @@
+from typing import List, Tuple
+
+import lib
+
+from . import objects
+
+
+class Sensors:
+    """Passe dédiée aux objets non solides (capteurs, ex. portillons et ligne d'arrivée),
+    qui ne participent pas aux zones de collisions.\n
+    Avant la physique, record() garde la position et l'angle des objets qui peuvent bouger
+    et toucher un capteur (voir Object.canInteract()). Après la physique, detect() cherche
+    les capteurs que chacun a touchés durant le pas, sur le trajet effectivement parcouru
+    (collisions comprises) approché par un mouvement uniforme, ainsi que le moment où il les a
+    touchés. fire() notifie ensuite ces passages dans l'ordre chronologique.\n
+    Les capteurs qui définissent une ligne à franchir (voir Object.crossingLine()) sont testés
+    contre le segment parcouru par le centre de l'objet durant le pas."""
+
+    # précision (s) du moment des passages
+    timePrecision: float = 1e-3
+
+    # (temps de la partie, capteur, objet)
+    _crossings: List[Tuple[float, objects.Object, objects.Object]]
+    # (formID, centre et angle au début du pas) des objets gardés par record()
+    _starts: List[Tuple[int, lib.Point, float]]
+
+    def __init__(self) -> None:
+        self._crossings = []
+        self._starts = []
+
+    def crossings(self) -> List[Tuple[float, objects.Object, objects.Object]]:
+        """Retourne les passages détectés et pas encore notifiés"""
+        return self._crossings
+
+    def crossingTime(
+        self,
+        sensor: objects.Object,
+        body: objects.Object,
+        start: Tuple[lib.Point, float],
+        timeInterval: float,
+    ) -> "float | None":
+        """Retourne le premier instant de l'intervalle où l'objet, parti de la position et de l'angle
+        <start>, touche le capteur en allant à vitesses constantes jusqu'à sa position actuelle.
+        None s'il ne le touche pas à la fin de l'intervalle (même critère que les zones de collisions).
+        Seule la géométrie est testée (voir Object.shape()), les conditions propres au capteur
+        sont vérifiées par fire()."""
+        (startCenter, startAngle), end = start, body.center()
+
+        def touches(fraction: float) -> bool:
+            center = lib.Point(
+                (
+                    startCenter[0] + (end[0] - startCenter[0]) * fraction,
+                    startCenter[1] + (end[1] - startCenter[1]) * fraction,
+                )
+            )
+            angle = startAngle + (body.angle() - startAngle) * fraction
+            deltaTime = fraction * timeInterval
+            bodyShape = body.shape(center, angle)
+            sensorShape = sensor.shape(
+                sensor.center(deltaTime), sensor.angle(deltaTime)
+            )
+            if bodyShape is None or sensorShape is None:
+                return False
+            if isinstance(bodyShape, lib.Circle):
+                return sensorShape.collides(bodyShape)
+            return bodyShape.collides(sensorShape)
+
+        if not touches(1):
+            return None
+        if touches(0):
+            return 0
+        before, after = 0, 1
+        while (after - before) * timeInterval > self.timePrecision:
+            middle = (before + after) / 2
+            if touches(middle):
+                after = middle
+            else:
+                before = middle
+        return after * timeInterval
+
+    def segmentCrossing(
+        start: lib.Point, end: lib.Point, line: Tuple[lib.Point, lib.Point]
+    ) -> "float | None":
+        """Retourne la fraction du segment [start, end] à laquelle il coupe <line>, None s'il ne
+        la coupe pas. Un segment qui part de la ligne ne la coupe pas, un segment qui y arrive si."""
+        lineStart, lineEnd = line
+        rx, ry = end[0] - start[0], end[1] - start[1]
+        sx, sy = lineEnd[0] - lineStart[0], lineEnd[1] - lineStart[1]
+        denominator = rx * sy - ry * sx
+        if not denominator:
+            # immobile ou parallèle
+            return None
+        qx, qy = lineStart[0] - start[0], lineStart[1] - start[1]
+        fraction = (qx * sy - qy * sx) / denominator
+        lineFraction = (qx * ry - qy * rx) / denominator
+        if 0 < fraction <= 1 and 0 <= lineFraction <= 1:
+            return fraction
+        return None
+
+    def record(
+        self, bodies: List[objects.Object], sensors: List[objects.Object]
+    ) -> None:
+        """À appeler avant la physique: garde la position et l'angle des objets de <bodies>
+        qui peuvent bouger durant le pas et toucher l'un des <sensors>"""
+        self._starts = [
+            (body.formID(), lib.Point(body.center()), body.angle())
+            for body in bodies
+            if not body.isSleeping()
+            and (not body.isStatic() or body.mass() > 0)
+            and any(sensor.canInteract(body) for sensor in sensors)
+        ]
+
+    def detect(
+        self,
+        sensors: List[objects.Object],
+        factory: objects.ObjectFactory,
+        timeInterval: float,
+        startTime: float,
+    ) -> None:
+        """À appeler après la physique, avant d'avancer les capteurs: détecte les passages des objets
+        gardés par record() sur les capteurs durant le pas commençant au temps de la partie <startTime>.
+        Le trajet de chaque objet est approché par un mouvement uniforme entre sa position
+        et son angle gardés par record() et les actuels, sans copier l'objet."""
+        for formID, startCenter, startAngle in self._starts:
+            # l'objet a pu être remplacé par une copie durant la physique
+            body = factory[formID]
+            end = body.center()
+            if not startCenter.squareDistanceOf(end) and startAngle == body.angle():
+                continue
+            radius = body.boundingRadius()
+            left, right = sorted((startCenter[0], end[0]))
+            bottom, top = sorted((startCenter[1], end[1]))
+            trajectoryZone = lib.AlignedRectangle(
+                right - left + 2 * radius,
+                top - bottom + 2 * radius,
+                leftBottom=lib.Point((left - radius, bottom - radius)),
+            )
+            for sensor in sensors:
+                if not sensor.canInteract(body):
+                    continue
+                line = sensor.crossingLine(body)
+                if line is not None:
+                    fraction = Sensors.segmentCrossing(startCenter, end, line)
+                    if fraction is not None:
+                        time = startTime + fraction * timeInterval
+                        self._crossings.append((time, sensor, body))
+                    continue
+                if not trajectoryZone.collides(
+                    sensor.potentialCollisionZone(timeInterval)
+                ):
+                    continue
+                time = self.crossingTime(
+                    sensor, body, (startCenter, startAngle), timeInterval
+                )
+                if time is not None:
+                    self._crossings.append((startTime + time, sensor, body))
+        self._starts = []
+
+    def fire(self, factory: objects.ObjectFactory) -> None:
+        """Notifie les passages détectés dans l'ordre chronologique, voir Object.onSensorCrossing().
+        Les capteurs partagés avec une autre partie sont d'abord copiés (voir ObjectFactory.own())."""
+        crossings = sorted(self._crossings, key=lambda crossing: crossing[0])
+        self._crossings = []
+        for time, sensor, body in crossings:
+            sensor = factory[sensor.formID()]
+            if sensor.onSensorCrossing(body, time):
+                sensor.onCollision(body)
+                body.onCollision(sensor)
@@ -0,0 +1,173 @@
+import copy
+from typing import Callable, Dict, List, Tuple
+
+import lib
+
+from . import objects
+
+
+# reçoit les formIDs des karts, du premier au dernier
+OnStandingsChangedT = Callable[[List[int]], None]
+
+
+class Standings:
+    """Classement en direct des karts en jeu, mis à jour à chaque pas de physique (voir update()).\n
+    La progression d'un kart est son nombre de tours, la position du dernier portillon franchi
+    et la distance qui le sépare du centre du prochain portillon. Les karts qui ont terminé leurs
+    tours sont classés par ordre d'arrivée, devant les autres.\n
+    D'un pas à l'autre, l'ordre change rarement: le classement est trié par insertion et les
+    abonnés (voir addListener()) ne sont notifiés que lorsque l'ordre change."""
+
+    # position -> centre des portillons de cette position, calculés au premier update()
+    _centroids: Dict[int, lib.Point]
+    # position -> distance entre le centre de ces portillons et celui des suivants
+    _sectorLengths: Dict[int, float]
+    # formID -> (tours, position du dernier portillon, distance au prochain portillon)
+    _progress: Dict[int, Tuple[int, int, float]]
+    # formID -> temps de la partie de l'arrivée
+    _finishTimes: Dict[int, float]
+    # formIDs des karts, du premier au dernier
+    _leaderboard: List[int]
+    _listeners: List[OnStandingsChangedT]
+
+    def __init__(self) -> None:
+        self._centroids = {}
+        self._sectorLengths = {}
+        self._progress = {}
+        self._finishTimes = {}
+        self._leaderboard = []
+        self._listeners = []
+
+    def load(self, factory: objects.ObjectFactory) -> bool:
+        """Calcule les centres des portillons et les longueurs des secteurs.
+        Retourne False si le monde n'a pas de portillons."""
+        gatesByPosition: Dict[int, List[objects.Gate]] = {}
+        for gate in factory.gates():
+            gatesByPosition.setdefault(gate.position(), []).append(gate)
+        if not gatesByPosition:
+            return False
+
+        for position, gates in gatesByPosition.items():
+            vertices = [vertex for gate in gates for vertex in gate.vertices()]
+            self._centroids[position] = lib.Point(
+                (
+                    sum(vertex[0] for vertex in vertices) / len(vertices),
+                    sum(vertex[1] for vertex in vertices) / len(vertices),
+                )
+            )
+        numberOfGates = len(self._centroids)
+        for position, centroid in self._centroids.items():
+            following = self._centroids[(position + 1) % numberOfGates]
+            self._sectorLengths[position] = centroid.distanceOf(following)
+        return True
+
+    def update(self, factory: objects.ObjectFactory, time: float) -> None:
+        """Met à jour la progression des karts en jeu et le classement, au temps <time> de la partie"""
+        if not self._centroids and not self.load(factory):
+            return
+
+        finishLine = factory.finishLine()
+        numberOfGates = len(self._centroids)
+        self._progress = {}
+        for kart in factory.kartsInGame():
+            formID = kart.formID()
+            gatePosition = kart.lastGatePosition()
+            nextCentroid = self._centroids[(gatePosition + 1) % numberOfGates]
+            self._progress[formID] = (
+                finishLine.passagesCount(formID),
+                gatePosition,
+                kart.center().distanceOf(nextCentroid),
+            )
+            if kart.hasCompleted() and formID not in self._finishTimes:
+                finishTime = finishLine.lastPassageTime(formID)
+                self._finishTimes[formID] = time if finishTime is None else finishTime
+
+        leaderboard = [
+            formID for formID in self._leaderboard if formID in self._progress
+        ]
+        changed = len(leaderboard) != len(self._leaderboard)
+        for formID in self._progress:
+            if formID not in leaderboard:
+                leaderboard.append(formID)
+                changed = True
+
+        # tri par insertion, presque linéaire sur un classement déjà presque trié
+        keys = {formID: self._key(formID, numberOfGates) for formID in leaderboard}
+        for i in range(1, len(leaderboard)):
+            formID = leaderboard[i]
+            j = i
+            while j > 0 and keys[leaderboard[j - 1]] < keys[formID]:
+                leaderboard[j] = leaderboard[j - 1]
+                j -= 1
+            if j != i:
+                leaderboard[j] = formID
+                changed = True
+
+        if changed:
+            self._leaderboard = leaderboard
+            for listener in self._listeners:
+                listener(leaderboard)
+
+    def _key(self, formID: int, numberOfGates: int) -> Tuple[int, float, float]:
+        """Clé de tri, plus grande pour les karts mieux classés"""
+        if formID in self._finishTimes:
+            return (1, -self._finishTimes[formID], 0)
+        laps, gatePosition, distance = self._progress[formID]
+        return (0, laps * numberOfGates + gatePosition, -distance)
+
+    def leaderboard(self) -> List[int]:
+        """Retourne les formIDs des karts en jeu, du premier au dernier. Ne pas modifier."""
+        return self._leaderboard
+
+    def rank(self, kartFormID: int) -> "int | None":
+        """Retourne la place du kart (1 pour le premier), None s'il n'est pas en jeu"""
+        if kartFormID not in self._progress:
+            return None
+        return self._leaderboard.index(kartFormID) + 1
+
+    def progress(self, kartFormID: int) -> "Tuple[int, int, float] | None":
+        """Retourne le nombre de tours du kart, la position du dernier portillon franchi
+        et la distance au centre du prochain portillon. None si le kart n'est pas en jeu."""
+        return self._progress.get(kartFormID)
+
+    def finishTime(self, kartFormID: int) -> "float | None":
+        """Retourne le temps de la partie de l'arrivée du kart, None s'il n'a pas terminé"""
+        return self._finishTimes.get(kartFormID)
+
+    def gateCentroid(self, position: int) -> lib.Point:
+        """Retourne le centre des portillons de la position donnée"""
+        return self._centroids[position]
+
+    def sectorLength(self, position: int) -> float:
+        """Retourne la distance entre le centre des portillons de la position donnée et celui des suivants"""
+        return self._sectorLengths[position]
+
+    def addListener(self, listener: OnStandingsChangedT) -> None:
+        """<listener> sera appelé avec le nouveau classement à chaque changement d'ordre"""
+        self._listeners.append(listener)
+
+    def removeListener(self, listener: OnStandingsChangedT) -> None:
+        """Nom explicite"""
+        self._listeners.remove(listener)
+
+    def saveState(self) -> tuple:
+        """Retourne l'état variable du classement, à recharger avec loadState()"""
+        return (
+            dict(self._progress),
+            dict(self._finishTimes),
+            tuple(self._leaderboard),
+        )
+
+    def loadState(self, state: tuple) -> None:
+        """Recharge l'état exporté par saveState(), sans notifier les abonnés"""
+        progress, finishTimes, leaderboard = state
+        self._progress = dict(progress)
+        self._finishTimes = dict(finishTimes)
+        self._leaderboard = list(leaderboard)
+
+    def copy(self) -> "Standings":
+        """Retourne une copie indépendante, sans les abonnés"""
+        clone = copy.copy(self)
+        clone.loadState(self.saveState())
+        clone._listeners = []
+        return clone
@@ -1,3 +1,10 @@
-from .Game import Game, OnCollisionT
+from .ChangeList import ChangeList
+from .Game import Game, OnCollisionT, OnZoneOverrunT
+from .GameRunner import GameRunner
+from .ReplayPlayer import ReplayPlayer
+from .ReplayRecorder import ReplayRecorder
+from .RoomsHost import RoomsHost
+from .Standings import Standings, OnStandingsChangedT
 from . import events
+from . import notifications
 from . import objects
\ No newline at end of file
@@ -5,6 +5,10 @@ class ObjectFactory:
 class Event:
     """Classe abstraite des événements, sert surtout à indiquer le type de variable attendue"""
 
+    # format des champs de toTuple() pour l'encodage binaire (voir EventsBatch),
+    # chaque caractère est un format de struct, "s" désigne une chaîne utf-8
+    tupleFormat: str = ""
+
     def fromTuple(eventTuple: tuple) -> "Event":
         """Retourne l'événement décrit par le tuple"""
 
@@ -13,3 +17,9 @@ class Event:
 
     def toTuple(self) -> tuple:
         """Export l'événement en un tuple python"""
+
+    def coalescingKey(self) -> "tuple | None":
+        """Retourne une clé identifiant les évènements redondants d'un même tick:
+        seul le dernier évènement de chaque clé est conservé.
+        None (par défaut) signifie que l'évènement ne doit jamais être fusionné."""
+        return None
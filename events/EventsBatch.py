@@ -0,0 +1,110 @@
+import struct
+from typing import Dict, Iterator, List
+
+from .Event import Event
+from .FlipperEvent import FlipperEvent
+from .KartMoveEvent import KartMoveEvent
+from .KartTurnEvent import KartTurnEvent
+from .FireBallEvent import FireBallEvent
+
+
+class EventsBatch:
+    """Regroupe tous les évènements d'un tick.\n
+    Permet de les fusionner (seul le dernier mouvement et la dernière direction de chaque kart sont gardés)
+    et de les encoder en une seule trame binaire: le nombre d'évènements, puis pour chacun
+    un octet indiquant son type suivi de ses champs (selon Event.tupleFormat)."""
+
+    # l'indice + 1 sert d'identifiant binaire, ne modifier l'ordre que pour changer de protocole
+    eventsClasses = [KartMoveEvent, KartTurnEvent, FireBallEvent, FlipperEvent]
+
+    _header = struct.Struct("<H")
+    _type = struct.Struct("<B")
+    _stringLength = struct.Struct("<H")
+    _fields = {
+        fieldFormat: struct.Struct("<" + fieldFormat)
+        for fieldFormat in set("".join(c.tupleFormat for c in eventsClasses))
+        if fieldFormat != "s"
+    }
+    _typeIDs: Dict[type, int] = {c: i + 1 for i, c in enumerate(eventsClasses)}
+
+    _events: List[Event]
+
+    def fromBytes(frame: bytes) -> "EventsBatch":
+        """Retourne le lot d'évènements encodé par toBytes()"""
+        events = []
+        (count,) = EventsBatch._header.unpack_from(frame, 0)
+        offset = EventsBatch._header.size
+        for _ in range(count):
+            (typeID,) = EventsBatch._type.unpack_from(frame, offset)
+            offset += EventsBatch._type.size
+            try:
+                eventClass = EventsBatch.eventsClasses[typeID - 1]
+            except IndexError:
+                raise ValueError(f"Unknown event type: {typeID}")
+            fields = []
+            for fieldFormat in eventClass.tupleFormat:
+                if fieldFormat == "s":
+                    (length,) = EventsBatch._stringLength.unpack_from(frame, offset)
+                    offset += EventsBatch._stringLength.size
+                    fields.append(frame[offset : offset + length].decode("utf-8"))
+                    offset += length
+                else:
+                    field = EventsBatch._fields[fieldFormat]
+                    fields.append(field.unpack_from(frame, offset)[0])
+                    offset += field.size
+            events.append(eventClass.fromTuple(tuple(fields)))
+        return EventsBatch(events)
+
+    def __init__(self, events: List[Event] = []) -> None:
+        self._events = list(events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, event: Event) -> None:
+        """Ajoute un évènement à la fin du lot"""
+        self._events.append(event)
+
+    def events(self) -> List[Event]:
+        """Retourne la liste des évènements du lot"""
+        return self._events
+
+    def coalesced(self) -> List[Event]:
+        """Retourne les évènements du lot sans les évènements redondants,
+        seul le dernier de chaque Event.coalescingKey() est gardé, l'ordre est conservé."""
+        seen = set()
+        kept = []
+        for event in reversed(self._events):
+            key = event.coalescingKey()
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(event)
+        kept.reverse()
+        return kept
+
+    def coalesce(self) -> None:
+        """Supprime les évènements redondants du lot, voir coalesced()"""
+        self._events = self.coalesced()
+
+    def toBytes(self) -> bytes:
+        """Encode le lot en une trame binaire"""
+        chunks = [self._header.pack(len(self._events))]
+        for event in self._events:
+            try:
+                typeID = self._typeIDs[event.__class__]
+            except KeyError:
+                raise ValueError(f"{event.__class__.__name__} can't be encoded")
+            chunks.append(self._type.pack(typeID))
+            for fieldFormat, field in zip(event.tupleFormat, event.toTuple()):
+                if fieldFormat == "s":
+                    encoded = field.encode("utf-8")
+                    chunks.append(self._stringLength.pack(len(encoded)))
+                    chunks.append(encoded)
+                else:
+                    chunks.append(self._fields[fieldFormat].pack(field))
+        return b"".join(chunks)
@@ -4,6 +4,8 @@ from .Event import Event, ObjectFactory
 class FireBallEvent(Event):
     """Evènement demandant le lancement d'une boulle de feu"""
 
+    tupleFormat = "q"
+
     _launcher: int
 
     def fromTuple(eventTuple: tuple) -> "Event":
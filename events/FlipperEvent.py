@@ -5,9 +5,14 @@ from .Event import Event, ObjectFactory
 class FlipperEvent(Event):
     """Evènement demandant la mise en mouvement des flippers."""
 
+    tupleFormat = "?s"
+
     _upward: bool
     _name: str
 
+    def fromTuple(eventTuple: tuple) -> "Event":
+        return FlipperEvent(*eventTuple)
+
     def __init__(self, upward: bool, name: str) -> None:
         super().__init__()
         self._upward = upward
@@ -16,3 +21,6 @@ class FlipperEvent(Event):
     def apply(self, factory: ObjectFactory) -> None:
         for obj in factory.objectsByName(self._name):
             obj.addMovement(self._upward)
+
+    def toTuple(self) -> tuple:
+        return (self._upward, self._name)
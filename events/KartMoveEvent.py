@@ -6,6 +6,8 @@ class KartMoveEvent(Event):
     L'argument direction fonctionne de la manière suivante:
     -1 = en arrière, 0 = arrêté, 1 = en avant"""
 
+    tupleFormat = "bq"
+
     _direction: int
     _kart: int
 
@@ -22,3 +24,6 @@ class KartMoveEvent(Event):
 
     def toTuple(self) -> tuple:
         return (self._direction, self._kart)
+
+    def coalescingKey(self) -> "tuple | None":
+        return (KartMoveEvent, self._kart)
@@ -6,6 +6,8 @@ class KartTurnEvent(Event):
     L'argument direction fonction de la manière suivante:
     -1 = à droite, 0 = tout droit, 1 = à gauche"""
 
+    tupleFormat = "bq"
+
     _direction: int
     _kart: int
 
@@ -22,3 +24,6 @@ class KartTurnEvent(Event):
 
     def toTuple(self) -> tuple:
         return (self._direction, self._kart)
+
+    def coalescingKey(self) -> "tuple | None":
+        return (KartTurnEvent, self._kart)
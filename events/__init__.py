@@ -3,6 +3,7 @@ from .FlipperEvent import FlipperEvent
 from .KartMoveEvent import KartMoveEvent
 from .KartTurnEvent import KartTurnEvent
 from .FireBallEvent import FireBallEvent
+from .EventsBatch import EventsBatch
 
 eventsByName = {
     ev.__name__: ev
@@ -0,0 +1,35 @@
+from typing import Tuple
+
+import lib
+
+from ..objects import Object
+from .Notification import Notification
+
+
+class CollisionNotification(Notification):
+    """Collision entre deux objets solides, remplace l'appel à onCollision"""
+
+    _objects: Tuple[Object, Object]
+    _point: lib.Point
+
+    def __init__(
+        self, time: float, objects: Tuple[Object, Object], point: lib.Point
+    ) -> None:
+        super().__init__(time)
+        self._objects = objects
+        self._point = point
+
+    def objects(self) -> Tuple[Object, Object]:
+        """Nom explicite"""
+        return self._objects
+
+    def point(self) -> lib.Point:
+        """Retourne le point de contact"""
+        return self._point
+
+    def toTuple(self) -> tuple:
+        return (
+            self._objects[0].formID(),
+            self._objects[1].formID(),
+            tuple(self._point),
+        )
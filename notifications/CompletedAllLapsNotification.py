@@ -0,0 +1,19 @@
+from ..objects import Kart
+from .Notification import Notification
+
+
+class CompletedAllLapsNotification(Notification):
+    """Kart ayant terminé tous ses tours, remplace l'appel à kart_onCompletedAllLaps"""
+
+    _kart: Kart
+
+    def __init__(self, time: float, kart: Kart) -> None:
+        super().__init__(time)
+        self._kart = kart
+
+    def kart(self) -> Kart:
+        """Nom explicite"""
+        return self._kart
+
+    def toTuple(self) -> tuple:
+        return (self._kart.formID(),)
@@ -0,0 +1,68 @@
+import asyncio
+from logging import warning
+from typing import Awaitable, Callable, Iterator, List, Set
+
+from .Notification import Notification
+
+OnNotificationsT = Callable[[List[Notification]], None]
+OnNotificationsAsyncT = Callable[[List[Notification]], Awaitable[None]]
+
+
+class Dispatcher:
+    """Collecte les notifications d'une frame et les délivre en un seul lot lors de flush():
+    à <onNotifications> s'il est donné, sinon à <onNotificationsAsync> dans une tâche de la boucle
+    asyncio en cours, sinon elles sont gardées jusqu'à leur lecture par pull()."""
+
+    _onNotifications: "OnNotificationsT | None"
+    _onNotificationsAsync: "OnNotificationsAsyncT | None"
+    _pending: List[Notification]
+    _ready: List[Notification]
+    # garde une référence aux tâches en cours, sinon elles peuvent être supprimées avant la fin
+    _tasks: "Set[asyncio.Task]"
+
+    def __init__(
+        self,
+        onNotifications: OnNotificationsT = None,
+        onNotificationsAsync: OnNotificationsAsyncT = None,
+    ) -> None:
+        self._onNotifications = onNotifications
+        self._onNotificationsAsync = onNotificationsAsync
+        self._pending = []
+        self._ready = []
+        self._tasks = set()
+
+    def record(self, notification: Notification) -> None:
+        """Ajoute une notification au lot de la frame en cours"""
+        self._pending.append(notification)
+
+    def pending(self) -> List[Notification]:
+        """Retourne les notifications de la frame en cours, pas encore délivrées"""
+        return self._pending
+
+    def flush(self) -> None:
+        """Délivre les notifications de la frame en cours"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        if self._onNotifications:
+            self._onNotifications(batch)
+        elif self._onNotificationsAsync:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                warning("No running event loop, notifications kept for pull()")
+                self._ready.extend(batch)
+                return
+            task = loop.create_task(self._onNotificationsAsync(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._ready.extend(batch)
+
+    def pull(self) -> List[Notification]:
+        """Retourne et oublie les notifications délivrées et pas encore lues"""
+        ready, self._ready = self._ready, []
+        return ready
+
+    def __iter__(self) -> Iterator[Notification]:
+        return iter(self.pull())
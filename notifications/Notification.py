@@ -0,0 +1,15 @@
+class Notification:
+    """Classe abstraite des notifications, enregistrées à la place des appels aux callbacks
+    lorsque la partie les diffère (voir Game.set_dispatcher())"""
+
+    _time: float
+
+    def __init__(self, time: float) -> None:
+        self._time = time
+
+    def time(self) -> float:
+        """Retourne le temps de la partie (voir Game.time()) au début du pas durant lequel la notification a eu lieu"""
+        return self._time
+
+    def toTuple(self) -> tuple:
+        """Exporte la notification en un tuple python, les objets sont remplacés par leurs formIDs"""
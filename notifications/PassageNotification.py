@@ -0,0 +1,25 @@
+from ..objects import Gate, Kart
+from .Notification import Notification
+
+
+class PassageNotification(Notification):
+    """Passage d'un kart par un portillon, remplace l'appel à gate_onPassage"""
+
+    _gate: Gate
+    _kart: Kart
+
+    def __init__(self, time: float, gate: Gate, kart: Kart) -> None:
+        super().__init__(time)
+        self._gate = gate
+        self._kart = kart
+
+    def gate(self) -> Gate:
+        """Nom explicite"""
+        return self._gate
+
+    def kart(self) -> Kart:
+        """Nom explicite"""
+        return self._kart
+
+    def toTuple(self) -> tuple:
+        return (self._gate.formID(), self._kart.formID())
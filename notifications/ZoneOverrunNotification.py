@@ -0,0 +1,21 @@
+from typing import List
+
+from ..objects import Object
+from .Notification import Notification
+
+
+class ZoneOverrunNotification(Notification):
+    """Zone de collisions ayant dépassé son budget, remplace l'appel à onZoneOverrun"""
+
+    _objects: List[Object]
+
+    def __init__(self, time: float, objects: List[Object]) -> None:
+        super().__init__(time)
+        self._objects = list(objects)
+
+    def objects(self) -> List[Object]:
+        """Retourne les objets de la zone"""
+        return self._objects
+
+    def toTuple(self) -> tuple:
+        return tuple(obj.formID() for obj in self._objects)
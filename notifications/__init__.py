@@ -0,0 +1,7 @@
+from .Notification import Notification
+from .CollisionNotification import CollisionNotification
+from .BurnedNotification import BurnedNotification
+from .CompletedAllLapsNotification import CompletedAllLapsNotification
+from .PassageNotification import PassageNotification
+from .ZoneOverrunNotification import ZoneOverrunNotification
+from .Dispatcher import Dispatcher, OnNotificationsT, OnNotificationsAsyncT
@@ -20,25 +20,62 @@ class Circle(Object):
         """Retourne le rayon du cercle."""
         return self._radius
 
+    def boundingRadius(self) -> float:
+        return self._radius
+
+    def shape(self, center: lib.Point, angle: float) -> lib.Circle:
+        return lib.Circle(center, self.radius())
+
     def updatePotentialCollisionZone(self, timeInterval: float) -> None:
         if self.isStatic():
             self._potentialCollisionZone = lib.AlignedRectangle(
                 self.radius() * 2, self.radius() * 2, center=self.center()
             )
         else:
-            translation = self.relativePosition(timeInterval)
-            self._potentialCollisionZone = lib.AlignedRectangle(
-                self.radius() * 2 + translation.x(),
-                self.radius() * 2 + translation.y(),
-                center=lib.Point(lib.Vector(self.center()) + translation / 2),
+            # le disque est invariant par rotation autour de son centre: seul le centre
+            # balaie un arc, à la distance du centre de rotation
+            center, radius = self.center(), self.radius()
+            self._potentialCollisionZone = self.sweptCollisionZone(
+                (
+                    center.x() - radius,
+                    center.y() - radius,
+                    center.x() + radius,
+                    center.y() + radius,
+                ),
+                timeInterval,
+                lib.Vector(self._angularMotion.center()).norm(),
             )
         return super().updatePotentialCollisionZone(timeInterval)
 
+    def movesWithinRadius(self, timeInterval: float) -> bool:
+        """Retourne vrai si le cercle ne se déplace pas de plus d'un rayon dans l'intervalle donné"""
+        return (
+            self.center().squareDistanceOf(self.center(timeInterval))
+            <= self.radius() ** 2
+        )
+
+    def separatedByBoundingCircles(self, other: "Object", timeInterval: float) -> bool:
+        if isinstance(other, Circle):
+            # le test n'est exact que sans passage par dessus, voir collides()
+            return (
+                self.movesWithinRadius(timeInterval)
+                and other.movesWithinRadius(timeInterval)
+                and not self.boundingCirclesOverlap(other, timeInterval)
+            )
+        return other.separatedByBoundingCircles(self, timeInterval)
+
     def collides(self, other: "Object", timeInterval: float) -> bool:
         if not super().collides(other, timeInterval):
             return False
 
         elif isinstance(other, Circle):
+            # sans déplacement plus grand qu'un rayon, les tests de passage par dessus
+            # sont ignorés, et le test des cercles englobants est alors exact
+            if self.movesWithinRadius(timeInterval) and other.movesWithinRadius(
+                timeInterval
+            ):
+                return self.boundingCirclesOverlap(other, timeInterval)
+
             newSelf = lib.Circle(self.center(timeInterval), self.radius())
             newOther = lib.Circle(other.center(timeInterval), other.radius())
             if newSelf.collides(newOther):
@@ -87,6 +124,13 @@ class Circle(Object):
             return other.collides(self, timeInterval)
 
     def collisionPointAndTangent(self, other: "Object") -> Tuple[lib.Point, lib.Vector]:
+        point, tangent, _ = self.collisionContact(other)
+        return point, tangent
+
+    def collisionContact(
+        self, other: "Object", features: tuple = None
+    ) -> Tuple[lib.Point, lib.Vector, tuple]:
+        """Entre deux cercles, le calcul est direct et aucun élément n'est retenu"""
         if isinstance(other, Circle):
             translation = lib.Vector.fromPoints(self.center(), other.center())
             translation.set_norm(self.radius())
@@ -95,10 +139,11 @@ class Circle(Object):
             return (
                 collisionPoint,
                 lib.Vector.fromPoints(self.center(), other.center()).normalVector(),
+                (),
             )
 
         else:
-            return other.collisionPointAndTangent(self)
+            return other.collisionContact(self, features)
 
     def toMinimalDict(self) -> dict:
         dic = super().toMinimalDict()
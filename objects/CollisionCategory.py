@@ -0,0 +1,16 @@
+class CollisionCategory:
+    """Catégories de collision, à combiner par des | binaires.\n
+    Chaque objet a une catégorie et un masque des catégories avec lesquelles il peut
+    entrer en collision (voir Object.canInteract()), attribués par ObjectFactory selon sa classe."""
+
+    NONE = 0
+    # géométrie fixe (sans masse), ne peut pas entrer en collision avec une autre géométrie fixe
+    WALL = 1 << 0
+    KART = 1 << 1
+    LAVA = 1 << 2
+    GATE = 1 << 3
+    FIREBALL = 1 << 4
+    FLIPPER = 1 << 5
+    # polygones et cercles ayant une masse, poussés par les collisions
+    BODY = 1 << 6
+    ALL = (1 << 16) - 1
@@ -31,6 +31,7 @@ class FinishLine(Gate):
     def set_highestPosition(self, highestPosition: int) -> None:
         """Nom explicite"""
         self._highestPosition = highestPosition
+        self.markDirty("highestPosition")
 
     def completedAllLaps(self, kartFormID: int) -> bool:
         """Retourne vrai si le kart à terminé ses tours de pistes"""
@@ -8,6 +8,9 @@ class FireBall(Circle):
     baseSpeed = 500
     spawnDistance = 40
     defaultRadius = 10
+    # durée de vie (s de temps simulé) avant d'être détruite par ObjectFactory.clean(),
+    # 0 pour illimitée (par défaut)
+    timeToLive: float = 0
 
     def __init__(self, **kwargs) -> None:
         kwargs["radius"] = kwargs.get("radius", FireBall.defaultRadius)
@@ -85,6 +85,10 @@ class Flipper(Polygon):
                     self.set_angularMotionSpeed(-self._flipperUpwardSpeed)
                     break
 
+    def isShareable(self) -> bool:
+        # ses mouvements sont déclenchés par les évènements
+        return False
+
     def up(self) -> bool:
         """Retourne vrai si le flipper est dans sa position en haut"""
         return (
@@ -104,5 +108,17 @@ class Flipper(Polygon):
         """Retourne True si le flipper est en train de descendre"""
         return self.angularMotionSpeed() == -self._flipperUpwardSpeed
 
+    def saveState(self) -> tuple:
+        return (
+            super().saveState(),
+            self._flipperCurrentAngle,
+            tuple(self._flipperMovementsQueue),
+        )
+
+    def loadState(self, state: tuple) -> None:
+        parent, self._flipperCurrentAngle, movementsQueue = state
+        self._flipperMovementsQueue = list(movementsQueue)
+        super().loadState(parent)
+
     def toMinimalDict(self) -> dict:
         assert True, "Not implemented"
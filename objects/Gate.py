@@ -1,4 +1,6 @@
-from typing import Callable, Dict
+from typing import Callable, Dict, Tuple
+
+import lib
 
 from .Polygon import Object, Polygon
 from .Kart import Kart
@@ -11,7 +13,15 @@ class Gate(Polygon):
     """Classe des portillons, un objet qui compte le nombre de passage des karts.
     Un minimum de deux portillons (ou de classes dérivées) sont nécessaire pour un fonctionnement correct."""
 
+    # si vrai (par défaut), un passage est détecté lorsque la trajectoire du centre du kart coupe
+    # la ligne médiane du portillon (voir crossingLine()), plutôt que par recouvrement des polygones.
+    # Un kart rapide ne peut alors plus traverser le portillon sans être vu et le test est moins
+    # coûteux, mais le passage a lieu lorsque le centre du kart franchit la ligne (et non dès
+    # que le kart touche le portillon), et un kart qui ne fait que frôler le portillon ne passe pas
+    segmentCrossing: bool = True
+
     _passagesCount: Dict[int, int]
+    _lastPassagesTimes: Dict[int, float]
     _onPassage: onPassageT
     _position: int
 
@@ -26,6 +36,7 @@ class Gate(Polygon):
         self._onPassage = kwargs["onPassage"]
         super().__init__(**kwargs)
         self._passagesCount = kwargs.get("passagesCount", {})
+        self._lastPassagesTimes = {}
 
     def isNextGate(self, kart: Kart) -> bool:
         """Retourne True si le prochain portillons que le kart doit franchir est celui-ci"""
@@ -37,14 +48,47 @@ class Gate(Polygon):
         else:
             return False
 
+    def line(self, deltaTime: float = 0) -> Tuple[lib.Point, lib.Point]:
+        """Retourne la ligne médiane du portillon, qui relie les milieux de ses deux plus petits côtés"""
+        vertices = self._cachedVertices(deltaTime)
+        shortest = sorted(
+            range(len(vertices)),
+            key=lambda i: vertices[i].squareDistanceOf(vertices[i - 1]),
+        )[:2]
+        return tuple(
+            lib.Point(
+                (
+                    (vertices[i][0] + vertices[i - 1][0]) / 2,
+                    (vertices[i][1] + vertices[i - 1][1]) / 2,
+                )
+            )
+            for i in shortest
+        )
+
+    def crossingLine(self, other: "Object") -> "Tuple[lib.Point, lib.Point] | None":
+        if self.segmentCrossing and isinstance(other, Kart) and self.isNextGate(other):
+            return self.line()
+        return None
+
+    def onSensorCrossing(self, other: "Object", time: float) -> bool:
+        if isinstance(other, Kart) and self.isNextGate(other):
+            self._lastPassagesTimes[other.formID()] = time
+            return True
+        return False
+
     def onCollision(self, other: "Object") -> None:
         super().onCollision(other)
         if isinstance(other, Kart) and self.isNextGate(other):
             self._passagesCount[other.formID()] = (
                 self._passagesCount.get(other.formID(), 0) + 1
             )
+            self.markDirty("passagesCount")
             other.set_lastGate(self)
-            self._onPassage(self, other)
+            self._notify(self._onPassage, self, other)
+
+    def set_onPassage(self, onPassage: onPassageT) -> None:
+        """Remplace la fonction appelée lors des passages"""
+        self._onPassage = onPassage
 
     def passagesCount(self, kartFormID: int) -> int:
         """Indique le nombre de fois que le kart a franchi le portillon"""
@@ -53,6 +97,11 @@ class Gate(Polygon):
     def set_passagesCount(self, kartFormID: int, passagesCount: int) -> None:
         """Permet de modifier le nombre de fois que le kart donné a franchi le portillon"""
         self._passagesCount[kartFormID] = passagesCount
+        self.markDirty("passagesCount")
+
+    def lastPassageTime(self, kartFormID: int) -> "float | None":
+        """Retourne le temps de la partie (voir Game.time()) du dernier passage du kart, None s'il n'est jamais passé"""
+        return self._lastPassagesTimes.get(kartFormID)
 
     def position(self) -> int:
         """Retourne la position du portillon.\n
@@ -61,6 +110,20 @@ class Gate(Polygon):
         c'est à dire que les karts doivent franchir soit l'un, soit l'autre."""
         return self._position
 
+    def saveState(self) -> tuple:
+        return (
+            super().saveState(),
+            dict(self._passagesCount),
+            dict(self._lastPassagesTimes),
+        )
+
+    def loadState(self, state: tuple) -> None:
+        parent, passagesCount, lastPassagesTimes = state
+        self._passagesCount = dict(passagesCount)
+        self._lastPassagesTimes = dict(lastPassagesTimes)
+        super().loadState(parent)
+        self.markDirty("passagesCount")
+
     def toMinimalDict(self) -> dict:
         dic = super().toMinimalDict()
         dic.update({"passagesCount": self._passagesCount})
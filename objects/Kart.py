@@ -68,6 +68,7 @@ class Kart(Polygon):
     def set_username(self, newUsername: str) -> None:
         """Nom explicite"""
         self._username = newUsername
+        self.markDirty("username")
 
     def image(self) -> str:
         """Nom de l'image du kart à charger (avec l'extension)"""
@@ -76,6 +77,7 @@ class Kart(Polygon):
     def set_image(self, newImage) -> None:
         """Nom explicite"""
         self._image = newImage
+        self.markDirty("image")
 
     def fireBallsLaunched(self):
         return self._fireBallsLaunched
@@ -93,6 +95,7 @@ class Kart(Polygon):
     def set_lastGate(self, newLastGate: "Gate") -> None:
         """Modifie le dernier portillon que le kart a traversé"""
         self._lastGatePosition = newLastGate.position()
+        self.markDirty("lastGatePosition")
 
         # import ici pour éviter des imports circulaires
         from .FinishLine import FinishLine
@@ -101,7 +104,17 @@ class Kart(Polygon):
             self.formID()
         ):
             self._completed = True
-            self._onCompletedAllLaps(self)
+            self._notify(self._onCompletedAllLaps, self)
+
+    def set_callbacks(
+        self, onBurned: onBurnedT, onCompletedAllLaps: onCompletedAllLapsT
+    ) -> None:
+        """Remplace les fonctions appelées lorsque le kart brûle ou termine ses tours"""
+        self._onBurned = onBurned
+        self._onCompletedAllLaps = onCompletedAllLaps
+
+    def isShareable(self) -> bool:
+        return False
 
     def hasBurned(self) -> bool:
         """Retourne vrai si le kart s'est fait brûlé par la lave"""
@@ -110,7 +123,8 @@ class Kart(Polygon):
     def burn(self) -> None:
         """Marque un kart comme brûlé"""
         self._burned = True
-        self._onBurned(self)
+        self.markDirty("burned")
+        self._notify(self._onBurned, self)
 
     def hasCompleted(self) -> bool:
         """Retourne True si le kart a terminé tous ses tours"""
@@ -120,11 +134,19 @@ class Kart(Polygon):
         """Met le kart en mouvement
         -1 = en arrière, 0 = arrêté, 1 = en avant"""
         self._moving = direction
+        if direction:
+            self.wakeUp()
 
     def request_turn(self, direction: int) -> None:
         """Fait tourner le kart
         -1 = à droite, 0 = tout droit, 1 = à gauche"""
         self._turning = direction
+        if direction:
+            self.wakeUp()
+
+    def canSleep(self) -> bool:
+        # un kart à l'arrêt contre un mur ne doit pas s'endormir tant que le joueur accélère
+        return super().canSleep() and not self._moving and not self._turning
 
     def onCollision(self, other: "Object") -> None:
         super().onCollision(other)
@@ -138,6 +160,8 @@ class Kart(Polygon):
         if self.hasBurned():
             self._turning = 0
             self._moving = 0
+        if self.isSleeping():
+            return
         targetASpeed = self._turning * self.turningSpeed
         currentASpeed = self.angularMotionSpeed()
         self.set_angularMotionAcceleration(
@@ -154,6 +178,34 @@ class Kart(Polygon):
             ) / self.movingCorrectionTime
         self.set_vectorialMotionAcceleration(acceleration)
 
+    def saveState(self) -> tuple:
+        return (
+            super().saveState(),
+            self._moving,
+            self._turning,
+            self._lastGatePosition,
+            self._burned,
+            self._completed,
+            self._fireBallsLaunched,
+            self._username,
+            self._image,
+        )
+
+    def loadState(self, state: tuple) -> None:
+        (
+            parent,
+            self._moving,
+            self._turning,
+            self._lastGatePosition,
+            self._burned,
+            self._completed,
+            self._fireBallsLaunched,
+            self._username,
+            self._image,
+        ) = state
+        self.markDirty("lastGatePosition", "burned", "username", "image")
+        super().loadState(parent)
+
     def toMinimalDict(self) -> dict:
         dic = super().toMinimalDict()
         dic.update(
@@ -1,8 +1,11 @@
-from typing import Tuple
+import copy
+from math import cos, sin, sqrt
+from typing import Any, Callable, Dict, List, Set, Tuple
 
 import lib
 
 from . import motions
+from .CollisionCategory import CollisionCategory
 from .fill import Fill, Hex, Pattern
 
 
@@ -14,6 +17,12 @@ class Object:
     fillClasses = {fill.__name__: fill for fill in [Hex, Pattern]}
     timeToKeepLastCollided = 1 / 60
 
+    # un objet plus lent que ces vitesses (px/s et rad/s) durant <framesBeforeSleeping> frames est endormi,
+    # voir updateSleeping(). 0 frame pour désactiver
+    sleepSpeed: float = 1
+    sleepAngularSpeed: float = 1e-2
+    framesBeforeSleeping: int = 30
+
     _formID: int
     _name: str
 
@@ -31,12 +40,31 @@ class Object:
     _potentialCollisionZoneUpToDate: bool = False
     _potentialCollisionZoneTimeInterval: float
 
+    # résultats de relativePosition(), relativeAngle(), center(), rotationCenter(), pose() et speed() par deltaTime
+    # (les objets modifiables sont copiés avant d'être retournés),
+    # vidé à chaque modification de la position ou du mouvement (voir invalidateCaches())
+    kinematicsCacheSize: int = 16
+    _kinematics: Dict[Tuple[str, float], Any]
+
     _solid: bool
     _destroy: bool = False
 
+    _collisionCategory: int = CollisionCategory.WALL
+    _collisionMask: int = CollisionCategory.ALL
+
     _lastCollided: "Object" = None
     _elapsedTimeLastCollision: float = 0
 
+    _sleeping: bool = False
+    _restingFrames: int = 0
+
+    # appels des callbacks (fonction, arguments) différés, None pour les appeler directement
+    # (voir deferCallbacks())
+    _deferredCalls: "List[tuple] | None" = None
+
+    # champs de toMinimalDict() modifiés depuis le dernier clearDirty(), voir Game.set_onChanges()
+    _dirty: Set[str]
+
     def fromMinimalDict(obj: dict) -> dict:
         """Retourne les argument pour reproduire l'objet représenté par le dict python du même format qu'exporté par toMinimalDict()"""
         obj["fill"] = Object.fillClasses[obj["fill"]["class"]].fromDict(obj["fill"])
@@ -59,6 +87,8 @@ class Object:
         self._opacity = kwargs.get("opacity", 1)
         self._mass = kwargs.get("mass", 0)
         self._friction = kwargs.get("friction", 0)
+        self._dirty = set()
+        self._kinematics = {}
         self._solid = kwargs.get("isSolid", True)
 
     def __eq__(self, other: "Object") -> bool:
@@ -72,11 +102,104 @@ class Object:
         """Méthode lancé lors des collisions"""
         self._lastCollided = other
         self._elapsedTimeLastCollision = 0
+        self.wakeUp()
+
+    def deferCallbacks(self, calls: "List[tuple] | None") -> None:
+        """Ajoute à <calls> les appels des callbacks (karts brûlés, portillons franchis...)
+        au lieu de les faire, pour les rejouer plus tard dans un ordre déterminé.
+        None pour revenir aux appels directs."""
+        self._deferredCalls = calls
+
+    def _notify(self, callback: Callable, *args) -> None:
+        """Appelle le callback, ou diffère l'appel, voir deferCallbacks()"""
+        if self._deferredCalls is None:
+            callback(*args)
+        else:
+            self._deferredCalls.append((callback, args))
+
+    def onSensorCrossing(self, other: "Object", time: float) -> bool:
+        """Appelé lorsque <other> touche cet objet non solide au temps <time> de la partie (voir Sensors).
+        Retourne vrai si le passage est pris en compte, les deux objets sont alors notifiés par onCollision()."""
+        return True
+
+    def crossingLine(self, other: "Object") -> "Tuple[lib.Point, lib.Point] | None":
+        """Pour un objet non solide, retourne les extrémités de la ligne dont le franchissement
+        par le centre de <other> déclenche le capteur (voir Sensors), au temps 0.
+        None (par défaut) pour détecter les passages par recouvrement des formes."""
+        return None
+
+    def canSleep(self) -> bool:
+        """Retourne vrai si l'objet peut être endormi.
+        Par défaut uniquement les objets soumis aux collisions (masse non nulle)
+        dont les mouvements peuvent être arrêtés (voir sleep())."""
+        return (
+            self.framesBeforeSleeping > 0
+            and self.mass() > 0
+            and self._vectorialMotion.canStop()
+            and self._angularMotion.canStop()
+        )
+
+    def isSleeping(self) -> bool:
+        """Retourne vrai si l'objet est endormi: il est immobile et ignoré par la physique jusqu'à son réveil"""
+        return self._sleeping
+
+    def updateSleeping(self) -> None:
+        """À appeler une fois par frame, endort l'objet s'il est resté assez longtemps presque immobile"""
+        if self._sleeping:
+            return
+        if (
+            not self.canSleep()
+            or self.vectorialMotionSpeed().norm() >= self.sleepSpeed
+            or abs(self.angularMotionSpeed()) >= self.sleepAngularSpeed
+        ):
+            # pas d'écriture inutile: l'objet peut être partagé (voir isShareable())
+            if self._restingFrames:
+                self._restingFrames = 0
+            return
+        self._restingFrames += 1
+        if self._restingFrames >= self.framesBeforeSleeping:
+            self.sleep()
+
+    def sleep(self) -> None:
+        """Immobilise l'objet et l'endort"""
+        self.set_vectorialMotionSpeed(lib.Vector())
+        if self.vectorialMotionAcceleration():
+            self.set_vectorialMotionAcceleration(lib.Vector())
+        self.set_angularMotionSpeed(0)
+        if self.angularMotionAcceleration():
+            self.set_angularMotionAcceleration(0)
+        self._sleeping = True
+
+    def wakeUp(self) -> None:
+        """Réveille l'objet (nouvel évènement, collision, objet en mouvement à proximité...)"""
+        self._sleeping = False
+        self._restingFrames = 0
 
     def isSolid(self) -> bool:
         """Si vrai, l'objet rebondit sur les autres objets sinon il les traverse"""
         return self._solid
 
+    def collisionCategory(self) -> int:
+        """Retourne la catégorie de collision de l'objet (voir CollisionCategory)"""
+        return self._collisionCategory
+
+    def collisionMask(self) -> int:
+        """Retourne les catégories avec lesquelles l'objet peut entrer en collision"""
+        return self._collisionMask
+
+    def set_collisionFilter(self, category: int, mask: int) -> None:
+        """Change la catégorie de collision de l'objet et le masque des catégories avec lesquelles il peut entrer en collision"""
+        self._collisionCategory = category
+        self._collisionMask = mask
+
+    def canInteract(self, other: "Object") -> bool:
+        """Retourne faux si les deux objets ne peuvent jamais entrer en collision selon leurs catégories,
+        sans tester leurs positions"""
+        return bool(
+            self._collisionCategory & other._collisionMask
+            and other._collisionCategory & self._collisionMask
+        )
+
     def name(self) -> str:
         """Retourne le nom de l'objet.
         Plusieurs objets peuvent avoir le même nom"""
@@ -97,17 +220,46 @@ class Object:
         Retourne le centre de l'objet à l'instant donné."""
         if not deltaTime:
             return self._center
+        return lib.Point(self._cachedCenter(deltaTime))
 
-        newCenter = lib.Point(self.center())
-        newCenter.translate(self.relativePosition(deltaTime))
+    def _cachedCenter(self, deltaTime: float) -> lib.Point:
+        """center(), gardé en cache: ne pas modifier ni exposer le résultat"""
+        if not deltaTime:
+            return self._center
+        key = ("center", deltaTime)
+        newCenter = self._kinematics.get(key)
+        if newCenter is None:
+            newCenter = lib.Point(self.center())
+            newCenter.translate(self._cachedRelativePosition(deltaTime))
+            self._cacheKinematics(key, newCenter)
         return newCenter
 
     def rotationCenter(self, deltaTime: float = 0) -> lib.Point:
         """Retourne le centre de rotation de l'objet à l'instant donné."""
-        rCenter = lib.Point(self.center(deltaTime))
-        rCenter.translate(self._angularMotion.center())
+        return lib.Point(self._cachedRotationCenter(deltaTime))
+
+    def _cachedRotationCenter(self, deltaTime: float = 0) -> lib.Point:
+        """rotationCenter(), gardé en cache: ne pas modifier ni exposer le résultat"""
+        key = ("rotationCenter", deltaTime)
+        rCenter = self._kinematics.get(key)
+        if rCenter is None:
+            rCenter = lib.Point(self._cachedCenter(deltaTime))
+            rCenter.translate(self._angularMotion.center())
+            self._cacheKinematics(key, rCenter)
         return rCenter
 
+    def pose(self, deltaTime: float = 0) -> Tuple[float, float, float, float, float]:
+        """Retourne l'angle, son cosinus, son sinus et les coordonnées x et y du centre de l'objet
+        à l'instant donné. Le résultat est gardé en cache."""
+        key = ("pose", deltaTime)
+        pose = self._kinematics.get(key)
+        if pose is None:
+            angle = self.angle(deltaTime)
+            center = self._cachedCenter(deltaTime)
+            pose = (angle, cos(angle), sin(angle), center[0], center[1])
+            self._cacheKinematics(key, pose)
+        return pose
+
     def potentialCollisionZone(self, timeInterval: float) -> lib.AlignedRectangle:
         """Retourne un rectangle aligné avec les axes englobant toutes les positions de l'objet pendant l'intervalle donné."""
         if (
@@ -118,72 +270,158 @@ class Object:
 
         return self._potentialCollisionZone
 
+    def invalidateCaches(self) -> None:
+        """À appeler après toute modification de la position ou du mouvement de l'objet"""
+        self._potentialCollisionZoneUpToDate = False
+        # réassigné et non vidé, par sécurité si le dict est partagé
+        self._kinematics = {}
+
+    def _cacheKinematics(self, key: Tuple[str, float], value: Any) -> None:
+        """Garde un résultat jusqu'à la prochaine modification de l'objet"""
+        if len(self._kinematics) >= self.kinematicsCacheSize:
+            self._kinematics = {}
+        self._kinematics[key] = value
+
     def updatePotentialCollisionZone(self, timeInterval: float) -> None:
         """Met le rectangle aligné avec les axes englobant toutes les positions de l'objet à jour pour l'intervalle donné.
         À surcharger"""
         self._potentialCollisionZoneTimeInterval = timeInterval
         self._potentialCollisionZoneUpToDate = True
 
+    def sweptCollisionZone(
+        self,
+        bounds: Tuple[float, float, float, float],
+        timeInterval: float,
+        sweepRadius: float,
+    ) -> lib.AlignedRectangle:
+        """Retourne un rectangle aligné avec les axes englobant toutes les positions de l'objet
+        pendant l'intervalle donné, à partir des limites (xMin, yMin, xMax, yMax) de l'objet au temps 0.\n
+        Chaque point suit la translation du mouvement vectoriel plus une rotation autour du centre
+        de rotation initial. La rotation est bornée à la fois par la longueur des arcs parcourus
+        (<sweepRadius> majore la distance au centre de rotation des points qui bougent en tournant)
+        et par le cercle englobant centré sur le centre de rotation."""
+        xMin, yMin, xMax, yMax = bounds
+        angle = self._angularMotion.maxRelativeAngle(timeInterval)
+        if angle:
+            arc = sweepRadius * angle
+            rCenter = self.rotationCenter()
+            radius = self.rotationRadius()
+            xMin = max(xMin - arc, rCenter.x() - radius)
+            yMin = max(yMin - arc, rCenter.y() - radius)
+            xMax = min(xMax + arc, rCenter.x() + radius)
+            yMax = min(yMax + arc, rCenter.y() + radius)
+
+        low, high = self._vectorialMotion.translationExtents(timeInterval)
+        return lib.AlignedRectangle(
+            xMax + high[0] - xMin - low[0],
+            yMax + high[1] - yMin - low[1],
+            leftBottom=lib.Point((xMin + low[0], yMin + low[1])),
+        )
+
     def isStatic(self) -> bool:
         """Retourne vrai si l'objet est imobile"""
         return self._angularMotion.isStatic() and self._vectorialMotion.isStatic()
 
     def relativeAngle(self, timeInterval: float) -> float:
         """Retourne la rotation de l'objet durant l'intervalle donné."""
-        return self._angularMotion.relativeAngle(timeInterval)
+        key = ("angle", timeInterval)
+        angle = self._kinematics.get(key)
+        if angle is None:
+            angle = self._angularMotion.relativeAngle(timeInterval)
+            self._cacheKinematics(key, angle)
+        return angle
 
     def relativePosition(self, timeInterval: float) -> lib.Vector:
         """Retourne la transtion de l'objet durant l'intervalle donné."""
-        fromRotationCenterBefore = lib.Vector.fromPoints(
-            self.rotationCenter(), self.center()
-        )
-        fromRotationCenterAfter = lib.Vector(fromRotationCenterBefore)
-        fromRotationCenterAfter.rotate(self.relativeAngle(timeInterval))
-        return (
-            self._vectorialMotion.relativePosition(timeInterval)
-            - fromRotationCenterBefore
-            + fromRotationCenterAfter
-        )
+        return lib.Vector(self._cachedRelativePosition(timeInterval))
+
+    def _cachedRelativePosition(self, timeInterval: float) -> lib.Vector:
+        """relativePosition(), gardé en cache: ne pas modifier ni exposer le résultat"""
+        key = ("position", timeInterval)
+        position = self._kinematics.get(key)
+        if position is None:
+            fromRotationCenterBefore = lib.Vector.fromPoints(
+                self._cachedRotationCenter(), self.center()
+            )
+            fromRotationCenterAfter = lib.Vector(fromRotationCenterBefore)
+            fromRotationCenterAfter.rotate(self.relativeAngle(timeInterval))
+            position = (
+                self._vectorialMotion.relativePosition(timeInterval)
+                - fromRotationCenterBefore
+                + fromRotationCenterAfter
+            )
+            self._cacheKinematics(key, position)
+        return position
 
     def speed(self, deltaTime: float = 0) -> lib.Vector:
-        """Retourne la vitesse de translation du centre de l'objet"""
-        return self.speedAtPoint(self.center(deltaTime), deltaTime)
+        """Retourne la vitesse de translation du centre de l'objet."""
+        key = ("speed", deltaTime)
+        speed = self._kinematics.get(key)
+        if speed is None:
+            speed = self.speedAtPoint(self._cachedCenter(deltaTime), deltaTime)
+            self._cacheKinematics(key, speed)
+        return lib.Vector(speed)
+
+    def boundingRadius(self) -> float:
+        """Retourne le rayon du plus petit cercle centré sur le centre de l'objet qui le contient.
+        À surcharger"""
+        return 0
+
+    def rotationRadius(self) -> float:
+        """Retourne le rayon d'un cercle centré sur le centre de rotation qui contient l'objet"""
+        return self.boundingRadius() + lib.Vector(self._angularMotion.center()).norm()
+
+    def maxPointSpeed(self, timeInterval: float) -> float:
+        """Retourne une estimation de la plus grande vitesse d'un point de l'objet durant l'intervalle donné"""
+        radius = self.rotationRadius()
+        return max(
+            self.vectorialMotionSpeed(t).norm()
+            + abs(self.angularMotionSpeed(t)) * radius
+            for t in (0, timeInterval)
+        )
 
     def speedAtPoint(self, point: lib.Point, deltaTime: float = 0) -> lib.Vector:
         """Retourne la vitesse linéaire d'un point donné (tient compte de sa vitesse angulaire)"""
-        normal = lib.Vector.fromPoints(self.rotationCenter(), point)
-        rtanSpeed = lib.Vector((0, self.angularMotionSpeed(deltaTime) * normal.norm()))
-        rtanSpeed.rotate(normal.direction())
+        normal = lib.Vector.fromPoints(self._cachedRotationCenter(), point)
+        # vitesse tangentielle: <normal> tourné d'un quart de tour, multiplié par la vitesse angulaire
+        angularSpeed = self.angularMotionSpeed(deltaTime)
+        rtanSpeed = lib.Vector((-angularSpeed * normal[1], angularSpeed * normal[0]))
         return rtanSpeed + self.vectorialMotionSpeed(deltaTime)
 
     def accelerationAtPoint(self, point: lib.Point, deltaTime: float = 0) -> lib.Vector:
         """Retourne l'accélération linéaire d'un point donné (tient compte de son accélération angulaire)"""
-        normal = lib.Vector.fromPoints(self.rotationCenter(), point)
+        normal = lib.Vector.fromPoints(self._cachedRotationCenter(), point)
+        angularAcceleration = self.angularMotionAcceleration(deltaTime)
         rTanAcceleration = lib.Vector(
-            (0, self.angularMotionAcceleration(deltaTime) * normal.norm())
+            (-angularAcceleration * normal[1], angularAcceleration * normal[0])
         )
-        rTanAcceleration.rotate(normal.direction())
         return rTanAcceleration + self.vectorialMotionAcceleration(deltaTime)
 
     def set_angle(self, newAngle: float) -> None:
         """Change l'angle de l'objet au temps 0"""
         self._angle = newAngle
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
+        self.markDirty("angle")
 
     def set_center(self, newCenter: lib.Point) -> None:
         """Change le centre de l'objet au temps 0"""
         self._center = newCenter
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
+        self.markDirty("center")
 
     def rotate(self, angle: float) -> None:
         """Effectue une rotation sur l'objet"""
         self._angle += angle
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
+        if angle:
+            self.markDirty("angle")
 
     def translate(self, vector: lib.Vector) -> None:
         """Effectue une translation sur l'objet"""
         self._center.translate(vector)
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
+        if vector:
+            self.markDirty("center")
 
     def updateReferences(self, deltaTime: float) -> None:
         """Avance les références: avance l'instant correspondant au temps 0 de deltaTime"""
@@ -192,6 +430,7 @@ class Object:
 
         self._angularMotion.updateReferences(deltaTime)
         self._vectorialMotion.updateReferences(deltaTime)
+        self.invalidateCaches()
 
         if self._lastCollided:
             self._elapsedTimeLastCollision -= deltaTime
@@ -207,7 +446,7 @@ class Object:
         """Attention, utilisation avancée uniquement
         Modifie la vitesse angulaire de l'objet."""
         self._angularMotion.set_speed(newSpeed=newSpeed)
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
 
     def angularMotionAcceleration(self, deltaTime: float = 0) -> float:
         """Attention, utilisation avancée uniquement
@@ -218,7 +457,7 @@ class Object:
         """Attention, utilisation avancée uniquement
         Modifie la vitesse angulaire de l'objet."""
         self._angularMotion.set_acceleration(newAcceleration=newAcceleration)
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
 
     def vectorialMotionSpeed(self, deltaTime: float = 0) -> lib.Vector:
         """NE PAS MODIFIER, utiliser set_vectorialMotionSpeed()
@@ -231,7 +470,7 @@ class Object:
         """Attention, utilisation avancée uniquement
         Modifie la vitesse vectoriel de l'objet, sans tenir compte de sa rotation"""
         self._vectorialMotion.set_speed(newSpeed=newSpeed)
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
 
     def vectorialMotionAcceleration(self, deltaTime: float = 0) -> lib.Vector:
         """NE PAS MODIFIER, utiliser set_vectorialMotionAcceleration()
@@ -244,7 +483,7 @@ class Object:
         """Attention, utilisation avancée uniquement
         Modifie l'accélération vectoriel de l'objet, sans tenir compte de sa rotation"""
         self._vectorialMotion.set_acceleration(newAcceleration=newAcceleration)
-        self._potentialCollisionZoneUpToDate = False
+        self.invalidateCaches()
 
     def fill(self) -> Fill:
         """Retourne la méthode de remplissage de l'objet."""
@@ -253,6 +492,7 @@ class Object:
     def set_fill(self, newFill: Fill) -> None:
         """Change la méthode de remplissage de l'objet."""
         self._fill = newFill
+        self.markDirty("fill")
 
     def opacity(self) -> float:
         """Retourne la transparance de l'objet."""
@@ -294,17 +534,99 @@ class Object:
             timeInterval
         )
 
+    def distanceOf(self, point: lib.Point) -> float:
+        """Retourne la distance entre le point donné et l'objet au temps 0, 0 si le point est dans l'objet.
+        Par défaut celle du cercle englobant, à surcharger."""
+        return max(0, self.center().distanceOf(point) - self.boundingRadius())
+
+    def overlapsRectangle(
+        self, xMin: float, yMin: float, xMax: float, yMax: float
+    ) -> bool:
+        """Retourne vrai si l'objet au temps 0 touche le rectangle aligné avec les axes donné.
+        Par défaut celui du cercle englobant, à surcharger."""
+        center = self.center()
+        dx = center.x() - min(max(center.x(), xMin), xMax)
+        dy = center.y() - min(max(center.y(), yMin), yMax)
+        return dx * dx + dy * dy <= self.boundingRadius() ** 2
+
+    def rayIntersection(
+        self, origin: lib.Point, direction: lib.Vector
+    ) -> "Tuple[float, lib.Vector] | None":
+        """Retourne la distance à laquelle le rayon partant de <origin> selon <direction> (unitaire)
+        touche l'objet au temps 0, et la normale (unitaire) de la surface touchée, orientée vers
+        l'extérieur. Un rayon partant de l'intérieur touche l'objet à sa sortie. None s'il ne le touche pas.
+        Par défaut celui du cercle englobant, à surcharger."""
+        center, radius = self.center(), self.boundingRadius()
+        mx, my = origin[0] - center[0], origin[1] - center[1]
+        b = mx * direction[0] + my * direction[1]
+        c = mx * mx + my * my - radius * radius
+        if c > 0 and b > 0:
+            # à l'extérieur et s'éloigne
+            return None
+        discriminant = b * b - c
+        if discriminant < 0:
+            return None
+        distance = -b - sqrt(discriminant)
+        if distance < 0:
+            distance = -b + sqrt(discriminant)
+        if not radius:
+            return distance, -direction
+        return distance, lib.Vector(
+            (
+                (mx + distance * direction[0]) / radius,
+                (my + distance * direction[1]) / radius,
+            )
+        )
+
+    def boundingCirclesOverlap(self, other: "Object", timeInterval: float) -> bool:
+        """Retourne False si les cercles englobants (voir boundingRadius())
+        des deux objets sont disjoints au temps donné."""
+        selfCenter = self._cachedCenter(timeInterval)
+        otherCenter = other._cachedCenter(timeInterval)
+        dx = otherCenter[0] - selfCenter[0]
+        dy = otherCenter[1] - selfCenter[1]
+        radii = self.boundingRadius() + other.boundingRadius()
+        return dx * dx + dy * dy <= radii * radii
+
+    def separatedByBoundingCircles(self, other: "Object", timeInterval: float) -> bool:
+        """Test rapide à faire avant collides(): retourne vrai si le test des cercles englobants
+        suffit à établir que les deux objets ne se collisionnent pas dans l'intervalle donné.
+        Par défaut False, à surcharger."""
+        return False
+
     def collisionPointAndTangent(self, other: "Object") -> Tuple[lib.Point, lib.Vector]:
         """Retourne une approximation du point par lequel les deux objets se touchent
         ainsi qu'une approximation d'un vecteur directeur de la tangente passant par ce point"""
         assert True, "This method should be overwritten"
 
+    def collisionContact(
+        self, other: "Object", features: tuple = None
+    ) -> Tuple[lib.Point, lib.Vector, tuple]:
+        """Comme collisionPointAndTangent(), retourne en plus les éléments (côtés, sommets)
+        des objets en contact. Si les <features> d'un contact précédent sont encore les plus proches,
+        elles sont gardées sans refaire toute la recherche, ce qui stabilise le contact d'un pas à l'autre."""
+        point, tangent = self.collisionPointAndTangent(other)
+        return point, tangent, None
+
     def groupID(self) -> int:
         """Return the id of this object's group"""
         from .ObjectFactory import ObjectFactory
 
         return self.formID() // ObjectFactory.maxObjectsPerGroup
 
+    def markDirty(self, *fields: str) -> None:
+        """Signale que les champs donnés de toMinimalDict() ont changé"""
+        self._dirty.update(fields)
+
+    def dirtyFields(self) -> Set[str]:
+        """Retourne les champs de toMinimalDict() modifiés depuis le dernier appel à clearDirty()"""
+        return self._dirty
+
+    def clearDirty(self) -> None:
+        """Oublie les champs modifiés"""
+        if self._dirty:
+            self._dirty = set()
+
     def destroy(self) -> None:
         """Demande à être supprimé à la fin de la frame"""
         self._destroy = True
@@ -317,6 +639,77 @@ class Object:
         """Retourne vrai si l'objet n'existera plus à la prochaine frame"""
         return self._destroy
 
+    def saveState(self) -> tuple:
+        """Exporte l'état variable de l'objet (position, mouvements, collisions...), à recharger avec loadState().
+        La géométrie et les autres propriétés fixes ne sont pas copiées."""
+        return (
+            self._angle,
+            lib.Point(self._center),
+            self._angularMotion.saveState(),
+            self._vectorialMotion.saveState(),
+            self._mass,
+            self._friction,
+            self._destroy,
+            self._lastCollided,
+            self._elapsedTimeLastCollision,
+            self._sleeping,
+            self._restingFrames,
+        )
+
+    def loadState(self, state: tuple) -> None:
+        """Recharge l'état exporté par saveState()"""
+        (
+            self._angle,
+            center,
+            angularMotion,
+            vectorialMotion,
+            self._mass,
+            self._friction,
+            self._destroy,
+            self._lastCollided,
+            self._elapsedTimeLastCollision,
+            self._sleeping,
+            self._restingFrames,
+        ) = state
+        # copie car le centre est modifié sur place
+        self._center = lib.Point(center)
+        self._angularMotion.loadState(angularMotion)
+        self._vectorialMotion.loadState(vectorialMotion)
+        self.invalidateCaches()
+        self.markDirty("angle", "center")
+
+    def copy(self) -> "Object":
+        """Retourne une copie indépendante de l'objet.
+        La géométrie et les autres propriétés fixes sont partagées avec l'original."""
+        clone = copy.copy(self)
+        clone._angularMotion = copy.copy(self._angularMotion)
+        clone._vectorialMotion = copy.copy(self._vectorialMotion)
+        clone._dirty = set()
+        # le cache de l'original ne doit pas être partagé
+        clone._kinematics = {}
+        clone.loadState(self.saveState())
+        # l'état est le même que celui de l'original
+        clone._dirty = set(self._dirty)
+        return clone
+
+    def shape(
+        self, center: lib.Point, angle: float
+    ) -> "lib.Polygon | lib.Circle | None":
+        """Retourne la forme géométrique de l'objet placé en <center> avec l'angle <angle>,
+        sans modifier l'objet (voir Sensors). None par défaut, à surcharger."""
+        return None
+
+    def isShareable(self) -> bool:
+        """Retourne vrai si l'objet peut être partagé entre plusieurs parties (voir ObjectFactory.fork()),
+        c'est à dire qu'il ne sera pas modifié tant qu'il n'entre pas en collision.
+        Les objets qui peuvent s'endormir ne le sont pas: updateSleeping() les modifie à chaque frame."""
+        return (
+            self.isStatic()
+            and self._lastCollided is None
+            and not self._destroy
+            and not self.canSleep()
+        )
+
     def toMinimalDict(self) -> dict:
         """Exporte cet objet dans un dict python contant toutes les informations pour reproduire visuellement l'objet"""
         return {
@@ -1,11 +1,14 @@
+import copy
+import heapq
 import itertools
 import json
 from logging import error
-from math import radians
-from typing import Any, Dict, List, Tuple
+from math import inf, radians
+from typing import Any, Dict, Iterable, List, Set, Tuple
 import lib
 
 from .Object import Object
+from .CollisionCategory import CollisionCategory
 from .Circle import Circle
 from .Polygon import Polygon
 from .Flipper import Flipper
@@ -14,6 +17,7 @@ from .FinishLine import FinishLine
 from .Lava import Lava
 from .Gate import Gate, onPassageT
 from .FireBall import FireBall
+from .SpatialIndex import SpatialIndex
 
 from .fill import Fill, Hex, Pattern
 from .motions.angulars import (
@@ -50,6 +54,29 @@ class ObjectFactory:
         "LGEFinishLine": FinishLine,
     }
 
+    # catégorie et masque de collision de chaque classe (la plus proche dans l'héritage),
+    # voir Object.canInteract(). Deux objets sans masse ne se collisionnent jamais (voir
+    # Object.collides()): la géométrie fixe, la lave et les flippers ne forment pas de paires
+    # entre eux. La lave est un sol qui ne brûle que les karts, les boules de feu la survolent.
+    _fixedMask = CollisionCategory.KART | CollisionCategory.FIREBALL | CollisionCategory.BODY
+    collisionFilters: Dict[type, Tuple[int, int]] = {
+        Circle: (CollisionCategory.WALL, _fixedMask),
+        Polygon: (CollisionCategory.WALL, _fixedMask),
+        Kart: (CollisionCategory.KART, CollisionCategory.ALL),
+        Lava: (CollisionCategory.LAVA, CollisionCategory.KART | CollisionCategory.BODY),
+        Gate: (CollisionCategory.GATE, CollisionCategory.KART),
+        FireBall: (
+            CollisionCategory.FIREBALL,
+            CollisionCategory.ALL & ~(CollisionCategory.LAVA | CollisionCategory.GATE),
+        ),
+        Flipper: (CollisionCategory.FLIPPER, _fixedMask),
+    }
+    # catégorie et masque des polygones et cercles ayant une masse, qui ne sont pas fixes
+    bodyFilter: Tuple[int, int] = (CollisionCategory.BODY, CollisionCategory.ALL)
+
+    # marge (px) autour de la géométrie fixe au-delà de laquelle les projectiles sont détruits
+    worldMargin: float = 200
+
     _currentGroup: int = 1
     _currentIndex: int = 1
 
@@ -58,6 +85,18 @@ class ObjectFactory:
     _kartPlaceHolders: Dict[int, Kart]
     _karts: Dict[int, Kart]
     _gatesByPosition: Dict[int, List[Gate]]
+    # objets partagés avec d'autres parties, à copier avant modification (voir fork())
+    _shared: Set[int]
+
+    # limites (xMin, yMin, xMax, yMax) de la géométrie fixe, None si le monde n'en a pas
+    _worldBounds: "Tuple[float, float, float, float] | None" = None
+    # temps (s) écoulé, avancé par clean()
+    _time: float
+    # formIDs des boules de feu en jeu, et tas des (temps d'expiration, formID)
+    _projectiles: Set[int]
+    _expiries: List[Tuple[float, int]]
+    # grille des objets pour les requêtes spatiales, à jour à la fin de chaque frame (voir clean())
+    _spatialIndex: SpatialIndex
 
     _kart_onBurned: onBurnedT
     _kart_onCompletedAllLaps: onCompletedAllLapsT
@@ -78,6 +117,11 @@ class ObjectFactory:
         self._kartPlaceHolders = {}
         self._karts = {}
         self._gatesByPosition = {}
+        self._shared = set()
+        self._time = 0
+        self._projectiles = set()
+        self._expiries = []
+        self._spatialIndex = SpatialIndex()
         if len(fabric) > 0:
             try:
                 self._fromFabric(fabric)
@@ -92,15 +136,29 @@ class ObjectFactory:
         self._currentGroup += 1
         self._currentIndex = 1
 
-    def _create(self, objectClass, **kwds: Any) -> None:
-        """Créé et enregistre l'objet selon les paramètres passés. Ne pas utiliser les contructeurs de ceux-ci."""
+    def setCollisionFilter(obj: Object) -> None:
+        """Donne à l'objet la catégorie et le masque de collision de sa classe (voir collisionFilters),
+        ou <bodyFilter> pour un simple polygone ou cercle ayant une masse"""
+        if type(obj) in (Circle, Polygon) and obj.mass() > 0:
+            obj.set_collisionFilter(*ObjectFactory.bodyFilter)
+            return
+        for objectClass in type(obj).__mro__:
+            if objectClass in ObjectFactory.collisionFilters:
+                obj.set_collisionFilter(*ObjectFactory.collisionFilters[objectClass])
+                return
+
+    def _create(self, objectClass, **kwds: Any) -> int:
+        """Créé et enregistre l'objet selon les paramètres passés. Ne pas utiliser les contructeurs de ceux-ci.
+        Retourne son formID."""
         formID = self.maxObjectsPerGroup * self._currentGroup + self._currentIndex
         obj = objectClass(formID=formID, **kwds)
+        ObjectFactory.setCollisionFilter(obj)
         if isinstance(obj, Kart):
             self._karts[formID] = obj
             self._kartPlaceHolders[formID] = obj
         else:
             self._objects[formID] = obj
+            self._spatialIndex.update(obj)
         if isinstance(obj, Gate):
             gates = self._gatesByPosition.get(obj.position(), [])
             gates.append(obj)
@@ -109,6 +167,7 @@ class ObjectFactory:
                 self._finishLine = obj
 
         self._currentIndex += 1
+        return formID
 
     def _fromFabric(self, fabric: str) -> None:
         """Charge un json d'un monde créé par le créateur (https://lj44.ch/creator/kart)"""
@@ -156,8 +215,25 @@ class ObjectFactory:
             if len(self._kartPlaceHolders) < 1:
                 raise ObjectCountError("This world has no kart placeholders!")
 
+        self._worldBounds = self._staticBounds()
         self._nextGroup()
 
+    def _staticBounds(self) -> "Tuple[float, float, float, float] | None":
+        """Retourne les limites des cercles englobants des objets immobiles, agrandies de <worldMargin>"""
+        statics = [obj for obj in self._objects.values() if obj.isStatic()]
+        if not statics:
+            return None
+        return (
+            min(obj.center().x() - obj.boundingRadius() for obj in statics)
+            - self.worldMargin,
+            min(obj.center().y() - obj.boundingRadius() for obj in statics)
+            - self.worldMargin,
+            max(obj.center().x() + obj.boundingRadius() for obj in statics)
+            + self.worldMargin,
+            max(obj.center().y() + obj.boundingRadius() for obj in statics)
+            + self.worldMargin,
+        )
+
     def _fromFabricObject(self, objectClass, objectDict: dict) -> dict:
         """Créé un dict à partir d'un object fabric tel qu'attendu par _create"""
         major, minor, patch = map(int, objectDict["lge"]["version"].split("."))
@@ -304,10 +380,14 @@ class ObjectFactory:
 
     def destroyGroup(self, groupID: int) -> None:
         """Supprime tous les objets appartenant au groupe"""
-        for obj in [o for o in self._objects.values() if o.groupID() == groupID]:
-            obj.destroy()
+        objs = [o for o in self._objects.values() if o.groupID() == groupID]
+        self.own(objs)
+        for obj in objs:
+            self._objects[obj.formID()].destroy()
 
     def get(self, formID: int, default: Any) -> "Object | Any":
+        if formID in self._shared:
+            self.own([self._objects[formID]])
         return self._objects.get(formID, default)
 
     def objects(self) -> List[Object]:
@@ -342,6 +422,7 @@ class ObjectFactory:
         kart.set_username(username)
         kart.set_image(img)
         self._objects[placeHolder] = kart
+        self._spatialIndex.update(kart)
         return placeHolder
 
     def unloadKart(self, placeHolder: int) -> None:
@@ -366,19 +447,28 @@ class ObjectFactory:
         ballCenter = lib.Point(kart.center())
         ballCenter.translate(kartSpeed.unitVector() * FireBall.spawnDistance)
 
-        self._create(
+        formID = self._create(
             FireBall, center=ballCenter, vectorialMotion=VectorialMotion(ballSpeed)
         )
         self._nextGroup()
         kart.add_fireBall()
+        self._projectiles.add(formID)
+        if FireBall.timeToLive:
+            heapq.heappush(self._expiries, (self._time + FireBall.timeToLive, formID))
+        return formID
 
     def __getitem__(self, formID: int) -> Object:
         """Retourne l'objet correspondant"""
+        if formID in self._shared:
+            self.own([self._objects[formID]])
         return self._objects[formID]
 
     def objectsByName(self, name: str) -> List[Object]:
         """Retourne la liste des objects ayant le nom donné"""
-        return [obj for obj in self._objects.values() if obj.name() == name]
+        objs = [obj for obj in self._objects.values() if obj.name() == name]
+        if self.own(objs):
+            return [self._objects[obj.formID()] for obj in objs]
+        return objs
 
     def minimalExport(self) -> dict:
         """Exporte uniquement les données nécessaires à l'affichage du monde"""
@@ -394,6 +484,7 @@ class ObjectFactory:
 
     def destroyAll(self) -> None:
         """Détruit tous les objects"""
+        self.own(list(self._objects.values()))
         for obj in self._objects.values():
             obj.destroy()
 
@@ -412,12 +503,161 @@ class ObjectFactory:
         self._karts = {obj.formID(): obj for obj in objs if isinstance(obj, Kart)}
         self._kartPlaceHolders = {}
         self._gatesByPosition = {}
+        self._shared = set()
+        self._projectiles = set()
+        self._expiries = []
+        self._spatialIndex = SpatialIndex()
         for obj in objs:
+            ObjectFactory.setCollisionFilter(obj)
+            self._spatialIndex.update(obj)
+            if isinstance(obj, FireBall):
+                # l'âge des boules de feu n'est pas exporté: leur durée de vie repart de zéro
+                self._projectiles.add(obj.formID())
+                if FireBall.timeToLive:
+                    expiry = self._time + FireBall.timeToLive
+                    heapq.heappush(self._expiries, (expiry, obj.formID()))
             if isinstance(obj, Gate):
                 gates = self._gatesByPosition.get(obj.position(), [])
                 gates.append(obj)
                 self._gatesByPosition[obj.position()] = gates
 
+    def saveState(self) -> tuple:
+        """Exporte l'état complet du monde, à recharger avec loadState().
+        Les objets sont référencés et non copiés, seul leur état variable est exporté (voir Object.saveState())"""
+        return (
+            self._currentGroup,
+            self._currentIndex,
+            tuple((obj, obj.saveState()) for obj in self._objects.values()),
+            tuple((k, k.saveState()) for k in self._kartPlaceHolders.values()),
+            self._time,
+            frozenset(self._projectiles),
+            tuple(self._expiries),
+        )
+
+    def loadState(self, state: tuple) -> None:
+        """Remet le monde dans l'état exporté par saveState().
+        Les objets créés depuis sont ajoutés aux objets supprimés."""
+        (
+            self._currentGroup,
+            self._currentIndex,
+            objectsStates,
+            placeHoldersStates,
+            self._time,
+            projectiles,
+            expiries,
+        ) = state
+        self._projectiles = set(projectiles)
+        self._expiries = list(expiries)
+        previousObjects = self._objects
+        self._objects = {}
+        for obj, objState in objectsStates:
+            obj.loadState(objState)
+            self._objects[obj.formID()] = obj
+            self._destroyedObjects.pop(obj.formID(), None)
+        self._kartPlaceHolders = {}
+        for kart, kartState in placeHoldersStates:
+            kart.loadState(kartState)
+            self._kartPlaceHolders[kart.formID()] = kart
+        for formID, obj in previousObjects.items():
+            if formID not in self._objects and formID not in self._kartPlaceHolders:
+                self._destroyedObjects[formID] = obj
+        # la grille est gardée: seuls les objets disparus en sont retirés et les objets
+        # restaurés qui ont changé de cellules y sont réinscrits
+        for formID in previousObjects:
+            if formID not in self._objects:
+                self._spatialIndex.remove(formID)
+        for obj in self._objects.values():
+            self._spatialIndex.update(obj)
+
+    def fork(
+        self,
+        kart_onBurned: onBurnedT,
+        kart_onCompletedAllLaps: onCompletedAllLapsT,
+        gate_onPassage: onPassageT,
+    ) -> "ObjectFactory":
+        """Retourne une factory indépendante dans le même état que celle-ci.\n
+        Les objets immobiles (voir Object.isShareable()) sont partagés par les deux factories
+        et ne sont copiés qu'au moment où l'une d'elles doit les modifier (voir own()),
+        les autres sont copiés immédiatement. Les callbacks des copies sont remplacés par ceux donnés."""
+        forked = copy.copy(self)
+        forked._kart_onBurned = kart_onBurned
+        forked._kart_onCompletedAllLaps = kart_onCompletedAllLaps
+        forked._gate_onPassage = gate_onPassage
+
+        shared = {
+            formID for formID, obj in self._objects.items() if obj.isShareable()
+        }
+        self._shared |= shared
+        forked._shared = set(shared)
+
+        forked._objects = {
+            formID: obj if formID in shared else forked._copy(obj)
+            for formID, obj in self._objects.items()
+        }
+        forked._kartPlaceHolders = {
+            formID: forked._copy(kart)
+            for formID, kart in self._kartPlaceHolders.items()
+        }
+        forked._karts = {
+            formID: forked._objects.get(
+                formID, forked._kartPlaceHolders.get(formID, kart)
+            )
+            for formID, kart in self._karts.items()
+        }
+        forked._destroyedObjects = dict(self._destroyedObjects)
+        forked._projectiles = set(self._projectiles)
+        forked._expiries = list(self._expiries)
+        forked._spatialIndex = self._spatialIndex.copy()
+        forked._gatesByPosition = {
+            position: [forked._objects.get(g.formID(), g) for g in gates]
+            for position, gates in self._gatesByPosition.items()
+        }
+        return forked
+
+    def set_callbacks(
+        self,
+        kart_onBurned: onBurnedT,
+        kart_onCompletedAllLaps: onCompletedAllLapsT,
+        gate_onPassage: onPassageT,
+    ) -> None:
+        """Remplace les callbacks des karts et des portillons, existants et à venir"""
+        self._kart_onBurned = kart_onBurned
+        self._kart_onCompletedAllLaps = kart_onCompletedAllLaps
+        self._gate_onPassage = gate_onPassage
+        self.own(list(self.gates()))
+        for kart in self._karts.values():
+            kart.set_callbacks(kart_onBurned, kart_onCompletedAllLaps)
+        for gate in self.gates():
+            gate.set_onPassage(gate_onPassage)
+
+    def _copy(self, obj: Object) -> Object:
+        """Copie l'objet et lui attribue les callbacks de cette factory"""
+        clone = obj.copy()
+        if isinstance(clone, Kart):
+            clone.set_callbacks(self._kart_onBurned, self._kart_onCompletedAllLaps)
+        elif isinstance(clone, Gate):
+            clone.set_onPassage(self._gate_onPassage)
+        return clone
+
+    def own(self, objs: Iterable[Object]) -> bool:
+        """Remplace les objets donnés partagés avec une autre factory par des copies (voir fork()).
+        À appeler avant de modifier des objets. Retourne vrai si au moins un objet a été copié."""
+        if not self._shared:
+            return False
+        owned = False
+        for obj in objs:
+            formID = obj.formID()
+            if formID not in self._shared:
+                continue
+            self._shared.discard(formID)
+            clone = self._copy(self._objects[formID])
+            self._objects[formID] = clone
+            if isinstance(clone, Gate):
+                gates = self._gatesByPosition[clone.position()]
+                gates[gates.index(clone)] = clone
+            owned = True
+        return owned
+
     def finishLine(self) -> FinishLine:
         """Nom explicite"""
         return self._gatesByPosition[0][0]
@@ -426,8 +666,18 @@ class ObjectFactory:
         """Nom explicite"""
         return itertools.chain(*(gates for gates in self._gatesByPosition.values()))
 
+    def advanceTime(self, timeInterval: float) -> None:
+        """Avance le temps simulé qui compte la durée de vie des boules de feu,
+        à appeler à chaque pas de physique avec la durée simulée"""
+        self._time += timeInterval
+
     def clean(self, elapsedTime: float) -> None:
-        """A appeler à la fin de chaque frame, supprime les objets devenus inutiles ou obsolètes"""
+        """A appeler à la fin de chaque frame, supprime les objets devenus inutiles ou obsolètes.
+        Les boules de feu sorties du monde ou trop vieilles (voir FireBall.timeToLive et advanceTime())
+        sont détruites, et seront supprimées à la fin de la frame suivante.\n
+        Les boules de feu trop vieilles sont trouvées par un tas trié par échéance, sans parcours.
+        La sortie du monde est en revanche testée à chaque frame pour toutes les boules de feu
+        en jeu (mais pas pour les autres objets)."""
         for obj in [o for o in self._objects.values() if o.lastFrame()]:
             if isinstance(obj, Kart):
                 self._kartPlaceHolders[obj.formID()] = obj
@@ -435,6 +685,161 @@ class ObjectFactory:
 
             self._destroyedObjects[obj.formID()] = obj
             self._objects.pop(obj.formID())
+            self._projectiles.discard(obj.formID())
+            self._spatialIndex.remove(obj.formID())
+
+        while self._expiries and self._expiries[0][0] <= self._time:
+            _, formID = heapq.heappop(self._expiries)
+            if formID in self._projectiles:
+                self[formID].destroy()
+
+        if self._worldBounds:
+            xMin, yMin, xMax, yMax = self._worldBounds
+            for formID in self._projectiles:
+                center = self._objects[formID].center()
+                if not (xMin <= center.x() <= xMax and yMin <= center.y() <= yMax):
+                    self[formID].destroy()
+
+        self.updateSpatialIndex()
+
+    def updateSpatialIndex(self) -> None:
+        """Réinscrit dans la grille des requêtes spatiales les objets qui ont pu bouger"""
+        for obj in self._objects.values():
+            if self._spatialIndex.needsUpdate(obj):
+                self._spatialIndex.update(obj)
+
+    def spatialIndex(self) -> SpatialIndex:
+        """Retourne la grille des requêtes spatiales"""
+        return self._spatialIndex
+
+    def _queried(
+        self,
+        formIDs: Iterable[int],
+        classes: "type | Tuple[type, ...]",
+        ignored: Iterable[int],
+    ) -> List[Object]:
+        """Retourne les objets en jeu correspondants, de la classe donnée, triés par formID"""
+        objs = []
+        for formID in sorted(formIDs):
+            obj = self._objects.get(formID)
+            if (
+                obj is not None
+                and not obj.lastFrame()
+                and isinstance(obj, classes)
+                and formID not in ignored
+            ):
+                objs.append(obj)
+        return objs
+
+    def objectsInRectangle(
+        self,
+        xMin: float,
+        yMin: float,
+        xMax: float,
+        yMax: float,
+        classes: "type | Tuple[type, ...]" = Object,
+        ignored: Iterable[int] = (),
+    ) -> List[Object]:
+        """Retourne les objets (de la classe ou des classes données) qui touchent le rectangle aligné
+        avec les axes donné, triés par formID. Les formIDs de <ignored> sont exclus.\n
+        Les requêtes spatiales portent sur la position des objets à la fin de la frame précédente,
+        les objets retournés peuvent être partagés avec une autre partie: ne pas les modifier."""
+        candidates = self._spatialIndex.inRectangle(xMin, yMin, xMax, yMax)
+        return [
+            obj
+            for obj in self._queried(candidates, classes, ignored)
+            if obj.overlapsRectangle(xMin, yMin, xMax, yMax)
+        ]
+
+    def objectsInRadius(
+        self,
+        center: lib.Point,
+        radius: float,
+        classes: "type | Tuple[type, ...]" = Object,
+        ignored: Iterable[int] = (),
+    ) -> List[Object]:
+        """Retourne les objets à une distance d'au plus <radius> du point donné, triés par formID.
+        Voir objectsInRectangle()."""
+        candidates = self._spatialIndex.inRectangle(
+            center.x() - radius,
+            center.y() - radius,
+            center.x() + radius,
+            center.y() + radius,
+        )
+        return [
+            obj
+            for obj in self._queried(candidates, classes, ignored)
+            if obj.distanceOf(center) <= radius
+        ]
+
+    def nearest(
+        self,
+        point: lib.Point,
+        k: int = 1,
+        classes: "type | Tuple[type, ...]" = Object,
+        ignored: Iterable[int] = (),
+    ) -> List[Tuple[Object, float]]:
+        """Retourne les <k> objets les plus proches du point donné, avec leur distance
+        (0 si le point est dans l'objet), du plus proche au plus lointain. Voir objectsInRectangle()."""
+        extent = self._spatialIndex.extent()
+        if extent is None or k < 1:
+            return []
+        # recherche dans des carrés de plus en plus grands autour du point
+        radius = self._spatialIndex.cellSize
+        while True:
+            candidates = self._spatialIndex.inRectangle(
+                point.x() - radius,
+                point.y() - radius,
+                point.x() + radius,
+                point.y() + radius,
+            )
+            distances = sorted(
+                (obj.distanceOf(point), obj.formID(), obj)
+                for obj in self._queried(candidates, classes, ignored)
+            )
+            covered = (
+                point.x() - radius <= extent[0]
+                and point.y() - radius <= extent[1]
+                and point.x() + radius >= extent[2]
+                and point.y() + radius >= extent[3]
+            )
+            # un objet plus proche que <radius> est forcément parmi les candidats
+            if covered or (len(distances) >= k and distances[k - 1][0] <= radius):
+                return [(obj, distance) for distance, _, obj in distances[:k]]
+            radius *= 2
+
+    def raycast(
+        self,
+        origin: lib.Point,
+        direction: lib.Vector,
+        maxDistance: float = inf,
+        classes: "type | Tuple[type, ...]" = Object,
+        ignored: Iterable[int] = (),
+    ) -> "Tuple[Object, float, lib.Vector] | None":
+        """Retourne le premier objet touché par le rayon partant de <origin> selon <direction>,
+        la distance à laquelle il est touché et la normale (unitaire) de la surface touchée
+        (voir Object.rayIntersection()). None si aucun objet n'est touché avant <maxDistance>,
+        par défaut illimitée: le rayon s'arrête à la sortie de la grille (voir SpatialIndex.alongRay()).
+        Voir objectsInRectangle()."""
+        if not direction:
+            raise ValueError("The direction of the ray can't be null")
+        direction = direction.unitVector()
+        tested = set()
+        closest = None
+        for exitDistance, formIDs in self._spatialIndex.alongRay(
+            origin, direction, maxDistance
+        ):
+            for obj in self._queried(formIDs - tested, classes, ignored):
+                hit = obj.rayIntersection(origin, direction)
+                if hit is None or hit[0] > maxDistance:
+                    continue
+                if closest is None or hit[0] < closest[1]:
+                    closest = (obj, *hit)
+            tested |= formIDs
+            # les cellules suivantes sont plus loin que l'objet touché
+            if closest and closest[1] <= exitDistance:
+                return closest
+        return closest
 
 
 class InvalidWorld(BaseException):
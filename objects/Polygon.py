@@ -1,7 +1,6 @@
 import math
 from typing import Dict, List, Tuple
 from logging import info
-from math import sin, cos
 import time
 
 import lib
@@ -19,11 +18,10 @@ class Polygon(Object):
 
     _vertices: List[lib.Vector]
 
-    # Pour des questions de performance, nous stockons les valeurs des sin et cos d'angles fréquents
-    _angleCosSin: List[float]
-    _angleCosSin2: List[float]
-    _angleCosSin2Angle: float
     _convex: bool
+    # 1 si les sommets tournent dans le sens trigonométrique, -1 sinon
+    _orientation: int
+    _boundingRadius: float
 
     def fromMinimalDict(obj: dict) -> dict:
         dic = Object.fromMinimalDict(obj)
@@ -39,56 +37,68 @@ class Polygon(Object):
                 for angle in [0, math.pi * 2 / 3, math.pi * 4 / 3]
             ],
         )
-        self.updateAngleCosSin()
-        self._angleCosSin2Angle = self.angle()
-        self._angleCosSin2 = self._angleCosSin
+        self._boundingRadius = max(v.norm() for v in self._vertices)
+        crosses = [
+            (b[0] - a[0]) * (c[1] - b[1]) - (b[1] - a[1]) * (c[0] - b[0])
+            for a, b, c in zip(
+                self._vertices,
+                self._vertices[1:] + self._vertices[:1],
+                self._vertices[2:] + self._vertices[:2],
+            )
+        ]
+        self._convex = all(cross >= 0 for cross in crosses) or all(
+            cross <= 0 for cross in crosses
+        )
+        self._orientation = 1 if sum(crosses) >= 0 else -1
 
     def __len__(self) -> int:
         """Retourne le nombre de sommets"""
         return len(self._vertices)
 
+    def boundingRadius(self) -> float:
+        return self._boundingRadius
+
     def convex(self) -> bool:
-        """Retourne True si le polygon est convexe.
-        Actuellement pas implémenté."""
+        """Retourne True si le polygon est convexe."""
         return self._convex
 
-    def updateAngleCosSin(self) -> None:
-        """Met angleCosSin() à jour, appelée automatiquement."""
-        self._angleCosSin = [fun(self.angle()) for fun in [cos, sin]]
-
-    def angleCosSin(self, deltaTime: float = 0) -> List[float]:
+    def angleCosSin(self, deltaTime: float = 0) -> Tuple[float, float]:
         """Retourne les valeurs de respectivement cos et sin de l'angle de l'objet au temps donné."""
-        if not deltaTime:
-            return self._angleCosSin
-        angle = super().angle(deltaTime=deltaTime)
-        if math.isclose(angle, self._angle, abs_tol=Polygon.precision):
-            return self._angleCosSin
-        elif math.isclose(angle, self._angleCosSin2Angle, abs_tol=Polygon.precision):
-            return self._angleCosSin2
-        else:
-            self._angleCosSin2 = [fun(angle) for fun in [cos, sin]]
-            self._angleCosSin2Angle = angle
-            return self._angleCosSin2
-
-    def set_angle(self, newAngle: float) -> None:
-        super().set_angle(newAngle)
-        self.updateAngleCosSin()
-
-    def rotate(self, angle: float) -> None:
-        super().rotate(angle)
-        self.updateAngleCosSin()
+        _, angleCos, angleSin, _, _ = self.pose(deltaTime)
+        return angleCos, angleSin
 
     def vertex(self, vertexIndex: int, deltaTime: float = 0) -> lib.Point:
         """Retourne le sommet correspondant, tient compte de l'angle et du centre de l'objet."""
+        _, angleCos, angleSin, centerX, centerY = self.pose(deltaTime)
         vertexV = lib.Vector(self._vertices[vertexIndex])
-        vertexV.rotateCosSin(*self.angleCosSin(deltaTime))
+        vertexV.rotateCosSin(angleCos, angleSin)
         vertex = lib.Point(vertexV)
-        vertex.translate(lib.Vector(self.center(deltaTime)))
+        vertex.translate(lib.Vector((centerX, centerY)))
         return vertex
 
+    def shape(self, center: lib.Point, angle: float) -> lib.Polygon:
+        angleCos, angleSin = math.cos(angle), math.sin(angle)
+        vertices = []
+        for vertexV in self._vertices:
+            vertexV = lib.Vector(vertexV)
+            vertexV.rotateCosSin(angleCos, angleSin)
+            vertex = lib.Point(vertexV)
+            vertex.translate(lib.Vector(center))
+            vertices.append(vertex)
+        return lib.Polygon(*vertices)
+
     def vertices(self, deltaTime: float = 0) -> List[lib.Point]:
         """Retourne la liste des sommets, tient compte de l'angle et du centre de l'objet."""
-        return [self.vertex(i, deltaTime) for i in range(len(self))]
+        return [lib.Point(vertex) for vertex in self._cachedVertices(deltaTime)]
+
+    def _cachedVertices(self, deltaTime: float = 0) -> List[lib.Point]:
+        """vertices(), gardé en cache: ne pas modifier ni exposer le résultat"""
+        key = ("vertices", deltaTime)
+        vertices = self._kinematics.get(key)
+        if vertices is None:
+            vertices = [self.vertex(i, deltaTime) for i in range(len(self))]
+            self._cacheKinematics(key, vertices)
+        return vertices
 
     def edge(self, startVertexIndex: int, deltaTime: float = 0) -> lib.Segment:
         """NE PAS MODIFIER
@@ -113,25 +123,102 @@ class Polygon(Object):
         return edges
 
     def updatePotentialCollisionZone(self, timeInterval: float) -> None:
-        def englobingAlignedRetangle(points: List[lib.Point]) -> lib.AlignedRectangle:
-            xes = [point.x() for point in points]
-            yes = [point.y() for point in points]
+        vertices = self._cachedVertices()
+        xes = [vertex.x() for vertex in vertices]
+        yes = [vertex.y() for vertex in vertices]
+        if self.isStatic():
             leftBottom = lib.Point((min(xes), min(yes)))
-            return lib.AlignedRectangle(
+            self._potentialCollisionZone = lib.AlignedRectangle(
                 max(xes) - leftBottom.x(),
                 max(yes) - leftBottom.y(),
                 leftBottom=leftBottom,
             )
-
-        vertices = self.vertices()
-        if self.isStatic():
-            self._potentialCollisionZone = englobingAlignedRetangle(vertices)
         else:
-            self._potentialCollisionZone = englobingAlignedRetangle(
-                vertices + self.vertices(timeInterval)
+            self._potentialCollisionZone = self.sweptCollisionZone(
+                (min(xes), min(yes), max(xes), max(yes)),
+                timeInterval,
+                self.rotationRadius(),
             )
         return super().updatePotentialCollisionZone(timeInterval)
 
+    def contains(self, point: lib.Point) -> bool:
+        """Retourne vrai si le point est dans le polygone au temps 0 (règle pair-impair)"""
+        vertices = self._cachedVertices()
+        inside = False
+        previous = vertices[-1]
+        for vertex in vertices:
+            if (vertex[1] > point[1]) != (previous[1] > point[1]):
+                crossingX = vertex[0] + (point[1] - vertex[1]) * (
+                    previous[0] - vertex[0]
+                ) / (previous[1] - vertex[1])
+                if point[0] < crossingX:
+                    inside = not inside
+            previous = vertex
+        return inside
+
+    def distanceOf(self, point: lib.Point) -> float:
+        if self.contains(point):
+            return 0
+        vertices = self._cachedVertices()
+        smallestSquareDistance = math.inf
+        previous = vertices[-1]
+        for vertex in vertices:
+            ex, ey = previous[0] - vertex[0], previous[1] - vertex[1]
+            px, py = point[0] - vertex[0], point[1] - vertex[1]
+            squareLength = ex * ex + ey * ey
+            # projection du point sur le côté, ramenée aux extrémités
+            ratio = 0
+            if squareLength:
+                ratio = min(max((px * ex + py * ey) / squareLength, 0), 1)
+            dx, dy = px - ratio * ex, py - ratio * ey
+            smallestSquareDistance = min(smallestSquareDistance, dx * dx + dy * dy)
+            previous = vertex
+        return math.sqrt(smallestSquareDistance)
+
+    def overlapsRectangle(
+        self, xMin: float, yMin: float, xMax: float, yMax: float
+    ) -> bool:
+        rectangle = lib.Polygon(
+            lib.Point((xMin, yMin)),
+            lib.Point((xMax, yMin)),
+            lib.Point((xMax, yMax)),
+            lib.Point((xMin, yMax)),
+        )
+        return lib.Polygon(*self.vertices()).collides(rectangle)
+
+    def rayIntersection(
+        self, origin: lib.Point, direction: lib.Vector
+    ) -> "Tuple[float, lib.Vector] | None":
+        vertices = self._cachedVertices()
+        hit = None
+        previous = vertices[-1]
+        for vertex in vertices:
+            ex, ey = previous[0] - vertex[0], previous[1] - vertex[1]
+            denominator = direction[0] * ey - direction[1] * ex
+            if denominator:
+                qx, qy = vertex[0] - origin[0], vertex[1] - origin[1]
+                distance = (qx * ey - qy * ex) / denominator
+                edgeRatio = (qx * direction[1] - qy * direction[0]) / denominator
+                if distance >= 0 and 0 <= edgeRatio <= 1:
+                    if hit is None or distance < hit[0]:
+                        hit = (distance, ex, ey)
+            previous = vertex
+        if hit is None:
+            return None
+
+        distance, ex, ey = hit
+        normal = lib.Vector((-ey, ex)).unitVector()
+        # vers l'extérieur: contre le rayon qui entre, avec le rayon qui sort
+        towardsRay = normal[0] * direction[0] + normal[1] * direction[1] < 0
+        if towardsRay == self.contains(origin):
+            normal = -normal
+        return distance, normal
+
+    def separatedByBoundingCircles(self, other: "Object", timeInterval: float) -> bool:
+        return isinstance(
+            other, (Circle, Polygon)
+        ) and not self.boundingCirclesOverlap(other, timeInterval)
+
     def collides(self, other: "Object", timeInterval: float) -> bool:
         if not super().collides(other, timeInterval):
             return False
@@ -160,7 +247,29 @@ class Polygon(Object):
             return other.collides(self)
 
     def collisionPointAndTangent(self, other: "Object") -> Tuple[lib.Point, lib.Vector]:
+        point, tangent, _ = self.collisionContact(other)
+        return point, tangent
+
+    def collisionContact(
+        self, other: "Object", features: tuple = None
+    ) -> Tuple[lib.Point, lib.Vector, tuple]:
+        """Les éléments en contact sont, contre un cercle, ("edge", i) pour le côté edges()[i]
+        ou ("vertex", i) pour le sommet i, et contre un polygone (0, i, j) pour le côté i de
+        celui-ci et le sommet j de l'autre, (1, i, j) dans le cas inverse.\n
+        Les <features> données sont gardées sans parcourir tous les côtés et sommets lorsque
+        leur voisinage prouve qu'elles sont encore les plus proches (objets convexes et séparés),
+        voir _nearestToCircle() et _nearestToPolygon()."""
         if isinstance(other, Circle):
+            if features and self._nearestToCircle(other, *features):
+                kind, index = features
+                if kind == "edge":
+                    edge = lib.Segment(self.vertex(index), self.vertex(index - 1))
+                    projection = edge.orthogonalProjection(other.center())
+                    return projection, edge.vector(), features
+                vertex = self.vertex(index)
+                tangent = lib.Vector.fromPoints(other.center(), vertex)
+                return vertex, tangent.normalVector(), features
+
             smallestVertexSquareDistance = math.inf
             smallestEdgeSquareDistance = math.inf
             second = len(self) - 1
@@ -170,6 +279,7 @@ class Polygon(Object):
                 if vertexSquareDistance < smallestVertexSquareDistance:
                     smallestVertexSquareDistance = vertexSquareDistance
                     nearestVertex = firstVertex
+                    nearestVertexIndex = first
 
                 edge = lib.Segment(firstVertex, self.vertex(second))
                 projection: lib.Point = edge.orthogonalProjection(other.center())
@@ -178,25 +288,38 @@ class Polygon(Object):
                     if edgeSquareDistance < smallestEdgeSquareDistance:
                         smallestEdgeSquareDistance = edgeSquareDistance
                         nearestEdge = edge
+                        nearestEdgeIndex = first
                         nearestProjection = projection
 
                 second = first
             if smallestEdgeSquareDistance < smallestVertexSquareDistance:
-                return nearestProjection, nearestEdge.vector()
+                return (
+                    nearestProjection,
+                    nearestEdge.vector(),
+                    ("edge", nearestEdgeIndex),
+                )
             else:
                 return (
                     nearestVertex,
                     lib.Vector.fromPoints(other.center(), nearestVertex).normalVector(),
+                    ("vertex", nearestVertexIndex),
                 )
 
         elif isinstance(other, Polygon):
+            if features and self._nearestToPolygon(other, *features):
+                owner, edgeIndex, vertexIndex = features
+                edgeOwner, vertexOwner = (self, other) if owner == 0 else (other, self)
+                edge = lib.Segment(
+                    edgeOwner.vertex(edgeIndex), edgeOwner.vertex(edgeIndex - 1)
+                )
+                return vertexOwner.vertex(vertexIndex), edge.vector(), features
 
             def findNearest(
                 edges: List[lib.Segment], vertices: List[lib.Point]
-            ) -> Tuple[float, lib.Point, lib.Vector]:
+            ) -> Tuple[float, lib.Point, lib.Vector, int, int]:
                 smallestSquareDistance = math.inf
-                for edge in edges:
-                    for vertex in vertices:
+                for i, edge in enumerate(edges):
+                    for j, vertex in enumerate(vertices):
                         projection: lib.Point = edge.orthogonalProjection(vertex)
                         if edge.passBy(projection):
                             squareDistance = vertex.squareDistanceOf(projection)
@@ -204,27 +327,86 @@ class Polygon(Object):
                                 smallestSquareDistance = squareDistance
                                 nearestVertex = vertex
                                 nearestEdge = edge
-                return smallestSquareDistance, nearestVertex, nearestEdge.vector()
-
-            try:
-                nearest1 = findNearest(self.edges(), other.vertices())
-            except UnboundLocalError:
-                nearest2 = findNearest(other.edges(), self.vertices())
-                return nearest2[1], nearest2[2]
-
-            try:
-                nearest2 = findNearest(other.edges(), self.vertices())
-            except UnboundLocalError:
-                return nearest1[1], nearest1[2]
+                                nearestEdgeIndex = i
+                                nearestVertexIndex = j
+                return (
+                    smallestSquareDistance,
+                    nearestVertex,
+                    nearestEdge.vector(),
+                    nearestEdgeIndex,
+                    nearestVertexIndex,
+                )
 
-            nearests = (nearest1, nearest2)
-            nearest = 0
-            if nearests[1][0] < nearests[0][0]:
-                nearest = 1
-            return nearests[nearest][1], nearests[nearest][2]
+            nearests = []
+            for owner, (edgeOwner, vertexOwner) in enumerate(
+                ((self, other), (other, self))
+            ):
+                try:
+                    nearest = findNearest(edgeOwner.edges(), vertexOwner.vertices())
+                except UnboundLocalError:
+                    continue
+                squareDistance, vertex, tangent, *indices = nearest
+                nearests.append((squareDistance, vertex, tangent, (owner, *indices)))
+            # un seul des deux parcours peut ne rien trouver
+            nearest = min(nearests, key=lambda nearest: nearest[0])
+            return nearest[1], nearest[2], nearest[3]
 
         else:
-            return other.collisionPointAndTangent(self)
+            return other.collisionContact(self, features)
+
+    def _outwardHeight(self, edgeIndex: int, point: lib.Point) -> float:
+        """Retourne la distance (multipliée par la longueur du côté) du point à la droite
+        du côté edges()[edgeIndex], positive du côté extérieur du polygone"""
+        start, end = self.vertex(edgeIndex - 1), self.vertex(edgeIndex)
+        cross = (end[0] - start[0]) * (point[1] - start[1]) - (end[1] - start[1]) * (
+            point[0] - start[0]
+        )
+        return -cross * self._orientation
+
+    def _nearestToCircle(self, other: Circle, kind: str, index: int) -> bool:
+        """Retourne vrai si l'élément donné (voir collisionContact()) est l'élément du polygone
+        le plus proche du centre du cercle. Le polygone étant convexe, il suffit que le centre
+        soit dans la région de l'élément: devant le côté et projeté sur celui-ci,
+        ou dans l'angle formé par les normales des deux côtés du sommet."""
+        if not self._convex:
+            return False
+        center = other.center()
+        if kind == "edge":
+            edge = lib.Segment(self.vertex(index), self.vertex(index - 1))
+            return self._outwardHeight(index, center) > 0 and edge.passBy(
+                edge.orthogonalProjection(center)
+            )
+        vertex = self.vertex(index)
+        following = index + 1 if index + 1 < len(self) else 0
+        return all(
+            (center[0] - vertex[0]) * (neighbour[0] - vertex[0])
+            + (center[1] - vertex[1]) * (neighbour[1] - vertex[1])
+            <= 0
+            for neighbour in (self.vertex(index - 1), self.vertex(following))
+        )
+
+    def _nearestToPolygon(
+        self, other: "Polygon", owner: int, edgeIndex: int, vertexIndex: int
+    ) -> bool:
+        """Retourne vrai si le sommet et le côté donnés (voir collisionContact()) sont
+        les éléments les plus proches des deux polygones. Les polygones étant convexes, il suffit
+        que le sommet soit devant le côté et projeté sur celui-ci, et que ses deux voisins
+        soient au moins aussi loin de la droite du côté: celle-ci sépare alors les polygones."""
+        edgeOwner, vertexOwner = (self, other) if owner == 0 else (other, self)
+        if not (edgeOwner._convex and vertexOwner._convex):
+            return False
+        vertex = vertexOwner.vertex(vertexIndex)
+        height = edgeOwner._outwardHeight(edgeIndex, vertex)
+        if height <= 0:
+            return False
+        edge = lib.Segment(edgeOwner.vertex(edgeIndex), edgeOwner.vertex(edgeIndex - 1))
+        if not edge.passBy(edge.orthogonalProjection(vertex)):
+            return False
+        following = vertexIndex + 1 if vertexIndex + 1 < len(vertexOwner) else 0
+        return all(
+            edgeOwner._outwardHeight(edgeIndex, vertexOwner.vertex(neighbour)) >= height
+            for neighbour in (vertexIndex - 1, following)
+        )
 
     def verticesBeforeRotation(self):
         listOfVerticesBeforeRotation = []
@@ -0,0 +1,197 @@
+import copy
+import math
+from typing import Dict, Iterator, Set, Tuple
+
+import lib
+
+from .Object import Object
+
+
+class SpatialIndex:
+    """Grille uniforme des objets, pour les requêtes spatiales de la factory (voir ObjectFactory.raycast()).\n
+    Chaque objet est inscrit dans toutes les cellules couvertes par le carré englobant
+    son cercle englobant (voir Object.boundingRadius()) au temps 0. Un objet qui bouge
+    n'est réinscrit que lorsqu'il change de cellules (voir needsUpdate())."""
+
+    # côté (px) des cellules
+    cellSize: float = 100
+
+    # cellule -> formIDs des objets inscrits
+    _cells: Dict[Tuple[int, int], Set[int]]
+    # formID -> cellules couvertes (xMin, yMin, xMax, yMax), bornes comprises
+    _entries: Dict[int, Tuple[int, int, int, int]]
+    # formIDs des objets inscrits alors qu'ils bougeaient
+    _moving: Set[int]
+    # cellules couvertes par tous les objets inscrits depuis le dernier clear(), ou None
+    _extent: "Tuple[int, int, int, int] | None"
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, formID: int) -> bool:
+        return formID in self._entries
+
+    def clear(self) -> None:
+        """Désinscrit tous les objets"""
+        self._cells = {}
+        self._entries = {}
+        self._moving = set()
+        self._extent = None
+
+    def cell(self, x: float, y: float) -> Tuple[int, int]:
+        """Retourne la cellule contenant le point donné"""
+        return math.floor(x / self.cellSize), math.floor(y / self.cellSize)
+
+    def cellsRange(
+        self, xMin: float, yMin: float, xMax: float, yMax: float
+    ) -> Tuple[int, int, int, int]:
+        """Retourne les cellules couvertes par le rectangle donné (xMin, yMin, xMax, yMax)"""
+        return (*self.cell(xMin, yMin), *self.cell(xMax, yMax))
+
+    def needsUpdate(self, obj: Object) -> bool:
+        """Retourne vrai si l'objet a pu changer de cellules depuis son inscription:
+        il n'est pas inscrit, il bouge ou il bougeait lors de son inscription"""
+        formID = obj.formID()
+        return (
+            formID not in self._entries
+            or formID in self._moving
+            or not obj.isStatic()
+        )
+
+    def update(self, obj: Object) -> None:
+        """Inscrit l'objet, ou le réinscrit s'il a changé de cellules"""
+        center, radius = obj.center(), obj.boundingRadius()
+        cells = self.cellsRange(
+            center.x() - radius,
+            center.y() - radius,
+            center.x() + radius,
+            center.y() + radius,
+        )
+        formID = obj.formID()
+        if obj.isStatic():
+            self._moving.discard(formID)
+        else:
+            self._moving.add(formID)
+        previous = self._entries.get(formID)
+        if previous == cells:
+            return
+        if previous is not None:
+            self._unregister(formID, previous)
+
+        self._entries[formID] = cells
+        xMin, yMin, xMax, yMax = cells
+        for x in range(xMin, xMax + 1):
+            for y in range(yMin, yMax + 1):
+                self._cells.setdefault((x, y), set()).add(formID)
+        if self._extent is None:
+            self._extent = cells
+        else:
+            self._extent = (
+                min(self._extent[0], xMin),
+                min(self._extent[1], yMin),
+                max(self._extent[2], xMax),
+                max(self._extent[3], yMax),
+            )
+
+    def remove(self, formID: int) -> None:
+        """Désinscrit l'objet, s'il est inscrit"""
+        cells = self._entries.pop(formID, None)
+        self._moving.discard(formID)
+        if cells is not None:
+            self._unregister(formID, cells)
+
+    def _unregister(self, formID: int, cells: Tuple[int, int, int, int]) -> None:
+        """Retire l'objet des cellules données"""
+        xMin, yMin, xMax, yMax = cells
+        for x in range(xMin, xMax + 1):
+            for y in range(yMin, yMax + 1):
+                formIDs = self._cells[(x, y)]
+                formIDs.discard(formID)
+                if not formIDs:
+                    del self._cells[(x, y)]
+
+    def extent(self) -> "Tuple[float, float, float, float] | None":
+        """Retourne un rectangle (xMin, yMin, xMax, yMax) contenant tous les objets inscrits,
+        None si aucun objet n'a été inscrit"""
+        if self._extent is None:
+            return None
+        xMin, yMin, xMax, yMax = self._extent
+        return (
+            xMin * self.cellSize,
+            yMin * self.cellSize,
+            (xMax + 1) * self.cellSize,
+            (yMax + 1) * self.cellSize,
+        )
+
+    def inRectangle(
+        self, xMin: float, yMin: float, xMax: float, yMax: float
+    ) -> Set[int]:
+        """Retourne les formIDs des objets inscrits dans les cellules couvertes par le rectangle donné.
+        Les objets sont seulement susceptibles d'être dans le rectangle."""
+        formIDs = set()
+        if self._extent is None:
+            return formIDs
+        cellXMin, cellYMin, cellXMax, cellYMax = self.cellsRange(xMin, yMin, xMax, yMax)
+        extentXMin, extentYMin, extentXMax, extentYMax = self._extent
+        for x in range(max(cellXMin, extentXMin), min(cellXMax, extentXMax) + 1):
+            for y in range(max(cellYMin, extentYMin), min(cellYMax, extentYMax) + 1):
+                formIDs |= self._cells.get((x, y), set())
+        return formIDs
+
+    def alongRay(
+        self, origin: lib.Point, direction: lib.Vector, maxDistance: float
+    ) -> Iterator[Tuple[float, Set[int]]]:
+        """Parcourt dans l'ordre les cellules traversées par le rayon (<direction> unitaire) jusqu'à <maxDistance>.
+        Génère pour chacune la distance à laquelle le rayon en sort et les formIDs de ses objets.
+        Le parcours s'arrête lorsque le rayon s'éloigne des cellules couvertes (voir extent()),
+        même si <maxDistance> est infinie."""
+        if self._extent is None:
+            return
+        extentXMin, extentYMin, extentXMax, extentYMax = self._extent
+        x, y = self.cell(origin[0], origin[1])
+        steps, nextDistances, deltas = [], [], []
+        for i, cell in enumerate((x, y)):
+            if direction[i] > 0:
+                steps.append(1)
+                boundary = (cell + 1) * self.cellSize
+            elif direction[i] < 0:
+                steps.append(-1)
+                boundary = cell * self.cellSize
+            else:
+                steps.append(0)
+                nextDistances.append(math.inf)
+                deltas.append(math.inf)
+                continue
+            nextDistances.append((boundary - origin[i]) / direction[i])
+            deltas.append(self.cellSize / abs(direction[i]))
+
+        while True:
+            exitDistance = min(nextDistances)
+            yield min(exitDistance, maxDistance), self._cells.get((x, y), set())
+            if exitDistance >= maxDistance:
+                return
+            # hors des cellules couvertes et sans s'en rapprocher
+            if (
+                (x < extentXMin and steps[0] <= 0)
+                or (x > extentXMax and steps[0] >= 0)
+                or (y < extentYMin and steps[1] <= 0)
+                or (y > extentYMax and steps[1] >= 0)
+            ):
+                return
+            if nextDistances[0] <= nextDistances[1]:
+                x += steps[0]
+                nextDistances[0] += deltas[0]
+            else:
+                y += steps[1]
+                nextDistances[1] += deltas[1]
+
+    def copy(self) -> "SpatialIndex":
+        """Retourne une copie indépendante"""
+        clone = copy.copy(self)
+        clone._cells = {cell: set(formIDs) for cell, formIDs in self._cells.items()}
+        clone._entries = dict(self._entries)
+        clone._moving = set(self._moving)
+        return clone
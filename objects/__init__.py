@@ -2,6 +2,7 @@ from .motions import angulars as angularMotions, vectorials as vectorialMotions
 
 from .ObjectFactory import (
     Circle,
+    CollisionCategory,
     FinishLine,
     FireBall,
     Flipper,
@@ -14,4 +15,5 @@ from .ObjectFactory import (
     Object,
     Polygon,
     ObjectFactory,
+    SpatialIndex,
 )
@@ -72,3 +72,19 @@ class AngularHarmonicMotion(AngularMotion):
     def isStatic(self) -> bool:
         """Retourne vrai si l'objet est immobile (rotation uniquement)"""
         return self._static
+
+    def canStop(self) -> bool:
+        """L'oscillation ne dépend pas de la vitesse, elle ne peut pas être arrêtée"""
+        return False
+
+    def saveState(self) -> tuple:
+        return (
+            super().saveState(),
+            self._angularFrequency,
+            self._amplitude,
+            self._phase,
+        )
+
+    def loadState(self, state: tuple) -> None:
+        parent, self._angularFrequency, self._amplitude, self._phase = state
+        super().loadState(parent)
@@ -35,6 +35,10 @@ class AngularMotion:
         """Retourne la rotation (sens anti-horaire) durant le temps donné"""
         return self._speed * deltaTime
 
+    def maxRelativeAngle(self, deltaTime: float) -> float:
+        """Retourne la plus grande rotation (en valeur absolue) atteinte durant le temps donné"""
+        return abs(self.relativeAngle(deltaTime))
+
     def speed(self, deltaTime: float = 0) -> float:
         """Vitesse angulaire à l'instant donné"""
         return self._speed
@@ -61,3 +65,16 @@ class AngularMotion:
     def isStatic(self) -> bool:
         """Retourne vrai si l'objet est immobile (rotation uniquement)"""
         return self._static
+
+    def canStop(self) -> bool:
+        """Retourne vrai si le mouvement peut être arrêté en annulant sa vitesse et son accélération
+        (voir Object.sleep())"""
+        return True
+
+    def saveState(self) -> tuple:
+        """Retourne l'état variable du mouvement, à recharger avec loadState()"""
+        return (self._speed, self._static)
+
+    def loadState(self, state: tuple) -> None:
+        """Recharge l'état exporté par saveState()"""
+        self._speed, self._static = state
@@ -27,6 +27,15 @@ class UniformlyAcceleratedCircularMotion(AngularMotion):
     def relativeAngle(self, deltaTime: float = 0) -> float:
         return self._acceleration * (deltaTime ** 2 / 2) + self._speed * deltaTime
 
+    def maxRelativeAngle(self, deltaTime: float) -> float:
+        maxAngle = abs(self.relativeAngle(deltaTime))
+        # demi-tour: la vitesse s'annule pendant l'intervalle
+        if self._acceleration and 0 < -self._speed / self._acceleration < deltaTime:
+            maxAngle = max(
+                maxAngle, abs(self.relativeAngle(-self._speed / self._acceleration))
+            )
+        return maxAngle
+
     def speed(self, deltaTime: float = 0) -> float:
         return self._acceleration * deltaTime + self._speed
 
@@ -35,3 +44,10 @@ class UniformlyAcceleratedCircularMotion(AngularMotion):
 
     def set_acceleration(self, newAcceleration: float) -> None:
         self._acceleration = newAcceleration
+
+    def saveState(self) -> tuple:
+        return (super().saveState(), self._acceleration)
+
+    def loadState(self, state: tuple) -> None:
+        parent, self._acceleration = state
+        super().loadState(parent)
@@ -1,3 +1,5 @@
+from typing import Tuple
+
 import lib
 
 from .VectorialMotion import VectorialMotion
@@ -25,6 +27,21 @@ class UniformlyAcceleratedMotion(VectorialMotion):
     def relativePosition(self, deltaTime: float = 0) -> lib.Vector:
         return self._acceleration * (deltaTime ** 2 / 2) + self._speed * deltaTime
 
+    def translationExtents(self, deltaTime: float) -> Tuple[lib.Vector, lib.Vector]:
+        translations = [self.relativePosition(deltaTime)]
+        # demi-tour sur une coordonnée: sa vitesse s'annule pendant l'intervalle
+        for i in range(2):
+            if self._acceleration[i] and (
+                0 < -self._speed[i] / self._acceleration[i] < deltaTime
+            ):
+                translations.append(
+                    self.relativePosition(-self._speed[i] / self._acceleration[i])
+                )
+        return (
+            lib.Vector(tuple(min(0, *(t[i] for t in translations)) for i in range(2))),
+            lib.Vector(tuple(max(0, *(t[i] for t in translations)) for i in range(2))),
+        )
+
     def speed(self, deltaTime: float = 0) -> lib.Vector:
         return self._acceleration * deltaTime + self._speed
 
@@ -36,4 +53,12 @@ class UniformlyAcceleratedMotion(VectorialMotion):
         self.updateIsStatic()
 
     def updateIsStatic(self) -> None:
-        self._static = not (self.speed() or self.acceleration())
\ No newline at end of file
+        self._static = not (self.speed() or self.acceleration())
+
+    def saveState(self) -> tuple:
+        return (super().saveState(), lib.Vector(self._acceleration))
+
+    def loadState(self, state: tuple) -> None:
+        parent, acceleration = state
+        self._acceleration = lib.Vector(acceleration)
+        super().loadState(parent)
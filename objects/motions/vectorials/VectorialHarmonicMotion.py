@@ -1,5 +1,6 @@
 from logging import warning
 import math
+from typing import Tuple
 from game.objects.motions.vectorials.VectorialMotion import VectorialMotion
 
 import lib
@@ -35,6 +36,30 @@ class VectorialHarmonicMotion(VectorialMotion):
         """Retourne la translation durant le temps donné"""
         return self.amplitude() * math.sin(self.phase(deltaTime)) - self.amplitude() * math.sin(self.phase())
 
+    def translationExtents(self, deltaTime: float) -> Tuple[lib.Vector, lib.Vector]:
+        """Retourne les translations minimales et maximales (coordonnée par coordonnée)
+        atteintes durant le temps donné, la translation nulle du temps 0 incluse."""
+        startPhase = self._phase
+        endPhase = self._phase + self.angularFrequency() * deltaTime
+        lowPhase, highPhase = min(startPhase, endPhase), max(startPhase, endPhase)
+        sines = [math.sin(startPhase), math.sin(endPhase)]
+        # crêtes de la sinusoïde (pi/2 + k*pi) comprises dans l'intervalle
+        peak = math.ceil((lowPhase - math.pi / 2) / math.pi) * math.pi + math.pi / 2
+        if peak <= highPhase:
+            sines.append(math.sin(peak))
+            if peak + math.pi <= highPhase:
+                sines.append(math.sin(peak + math.pi))
+        minOffset = min(sines) - math.sin(startPhase)
+        maxOffset = max(sines) - math.sin(startPhase)
+        extents = [
+            sorted((self.amplitude()[i] * minOffset, self.amplitude()[i] * maxOffset))
+            for i in range(2)
+        ]
+        return (
+            lib.Vector((extents[0][0], extents[1][0])),
+            lib.Vector((extents[0][1], extents[1][1])),
+        )
+
     def speed(self, deltaTime: float = 0) -> float:
         """Vitesse vectorielle à l'instant donné"""
         return self.amplitude() * self.angularFrequency() * math.cos(self.phase(deltaTime))
@@ -71,4 +96,20 @@ class VectorialHarmonicMotion(VectorialMotion):
 
     def isStatic(self) -> bool:
         """Retourne vrai si l'objet est immobile (rotation uniquement)"""
-        return self._static
\ No newline at end of file
+        return self._static
+
+    def canStop(self) -> bool:
+        """L'oscillation ne dépend pas de la vitesse, elle ne peut pas être arrêtée"""
+        return False
+
+    def saveState(self) -> tuple:
+        return (
+            super().saveState(),
+            self._angularFrequency,
+            self._amplitude,
+            self._phase,
+        )
+
+    def loadState(self, state: tuple) -> None:
+        parent, self._angularFrequency, self._amplitude, self._phase = state
+        super().loadState(parent)
@@ -1,4 +1,6 @@
 import math
+from typing import Tuple
+
 import lib
 
 
@@ -20,6 +22,15 @@ class VectorialMotion:
         """Retourne la translation durant le temps donné"""
         return self._speed * deltaTime
 
+    def translationExtents(self, deltaTime: float) -> Tuple[lib.Vector, lib.Vector]:
+        """Retourne les translations minimales et maximales (coordonnée par coordonnée)
+        atteintes durant le temps donné, la translation nulle du temps 0 incluse."""
+        translation = self.relativePosition(deltaTime)
+        return (
+            lib.Vector((min(0, translation[0]), min(0, translation[1]))),
+            lib.Vector((max(0, translation[0]), max(0, translation[1]))),
+        )
+
     def speed(self, deltaTime: float = 0) -> lib.Vector:
         """Vitesse linéaire à l'instant donné"""
         return self._speed
@@ -44,3 +55,18 @@ class VectorialMotion:
     def isStatic(self) -> bool:
         """Retourne vrai si l'objet est immobile (rotation uniquement)"""
         return self._static
+
+    def canStop(self) -> bool:
+        """Retourne vrai si le mouvement peut être arrêté en annulant sa vitesse et son accélération
+        (voir Object.sleep())"""
+        return True
+
+    def saveState(self) -> tuple:
+        """Retourne l'état variable du mouvement, à recharger avec loadState()"""
+        return (lib.Vector(self._speed), self._static)
+
+    def loadState(self, state: tuple) -> None:
+        """Recharge l'état exporté par saveState()"""
+        speed, self._static = state
+        # copie car la vitesse peut être modifiée sur place
+        self._speed = lib.Vector(speed)
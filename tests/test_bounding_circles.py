@@ -0,0 +1,46 @@
+from math import pi
+
+import lib
+
+from game import Game
+
+from .worlds import fabric, rectangle
+
+
+def corner(block: dict) -> Game:
+    """Kart tourné de 45° et presque immobile, à côté de l'obstacle <block>"""
+    game = Game(
+        fabric(
+            [
+                block,
+                rectangle("LGEKartPlaceHolder", 100, 300, 50, 16),
+                rectangle(
+                    "LGEFinishLine", 500, 100, 6, 100, gatePosition=0, numberOfLaps=1
+                ),
+                rectangle("LGEGate", 700, 100, 6, 100, gatePosition=1),
+            ]
+        ),
+        lambda objs: None,
+    )
+    kart = game.objectsFactory()[game.loadKart("a", "kart.png")]
+    kart.set_angle(pi / 4)
+    kart.set_vectorialMotionSpeed(lib.Vector((1, 0)))
+    return game
+
+
+def test_block_in_the_bounds_corner_is_rejected_by_bounding_circles():
+    # dans le coin du rectangle englobant du kart, hors de son cercle englobant
+    game = corner(rectangle("LGEPolygon", 124.6, 324.6, 4, 4))
+    game.nextFrame(1 / 60, [])
+    assert game.boundingCircleStats() == (1, 0)
+
+    game.resetBoundingCircleStats()
+    assert game.boundingCircleStats() == (0, 0)
+
+
+def test_block_beside_the_kart_is_tested_precisely():
+    # le long du flanc du kart, sans le toucher: les cercles englobants se recoupent
+    game = corner(rectangle("LGEPolygon", 85, 315, 4, 4))
+    game.nextFrame(1 / 60, [])
+    rejections, overlaps = game.boundingCircleStats()
+    assert rejections == 0 and overlaps > 0
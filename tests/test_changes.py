@@ -0,0 +1,44 @@
+from game import Game, events
+
+from .worlds import track
+
+
+def test_change_list_reports_created_changed_and_destroyed():
+    game = Game(track(), lambda objs: None)
+    first = game.changes()
+    assert len(first.created()) == len(game.objectsFactory().objects())
+    assert not first.changed() and not first.destroyed()
+
+    kart = game.loadKart("a", "kart.png")
+    loaded = game.changes()
+    assert [obj.formID() for obj in loaded.created()] == [kart]
+    assert not loaded.changed()
+
+    game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+    moved = game.changes()
+    assert not moved.created() and not moved.destroyed()
+    assert [(obj.formID(), fields) for obj, fields in moved.changed()] == [
+        (kart, {"center"})
+    ]
+    assert moved.toDict()["changed"][0].keys() == {"formID", "center"}
+    assert "angle" in moved.toDict(changedFieldsOnly=False)["changed"][0]
+    # les changements sont oubliés une fois lus
+    assert not game.changes()
+
+    game.unloadKart(kart)
+    unloaded = game.changes()
+    assert unloaded.destroyed() == [kart]
+    assert not unloaded.created() and not unloaded.changed()
+
+
+def test_on_changes_is_called_at_each_output():
+    changeLists = []
+    game = Game(track(), lambda objs: None)
+    game.set_onChanges(changeLists.append)
+    kart = game.loadKart("a", "kart.png")
+    game.nextFrame(1 / 60, [])
+    game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+
+    assert len(changeLists) == 2
+    assert kart in [obj.formID() for obj in changeLists[0].created()]
+    assert [obj.formID() for obj, _ in changeLists[1].changed()] == [kart]
@@ -0,0 +1,68 @@
+from game import Game, events
+from game.CollisionsZone import CollisionsZone
+from game.objects import FireBall, Kart, Lava, Polygon
+
+from .worlds import fabric, rectangle, track
+
+
+def world(obstacle: str) -> str:
+    """Un kart face à un obstacle de 100 px de côté, sur le trajet de ses boules de feu"""
+    return fabric(
+        [
+            rectangle(
+                "LGEFinishLine", 200, 100, 6, 100, gatePosition=0, numberOfLaps=1
+            ),
+            rectangle("LGEGate", 500, 100, 6, 100, gatePosition=1),
+            rectangle(obstacle, 300, 300, 100, 100),
+            rectangle("LGEKartPlaceHolder", 100, 300, 50, 16),
+        ]
+    )
+
+
+def fireBallOver(obstacle: str) -> tuple:
+    """Lance une boule de feu vers l'obstacle, retourne la partie, l'obstacle et la boule
+    de feu lorsqu'elle le recouvre"""
+    game = Game(world(obstacle), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+    game.nextFrame(1 / 60, [events.FireBallEvent(kart)])
+    factory = game.objectsFactory()
+    (fireBall,) = [obj for obj in factory.objects() if isinstance(obj, FireBall)]
+    (target,) = [
+        obj
+        for obj in factory.objects()
+        if type(obj) in (Lava, Polygon) and obj.center().x() == 300
+    ]
+    return game, target, fireBall
+
+
+def test_builtin_classes_have_meaningful_filters():
+    factory = Game(track(), lambda objs: None).objectsFactory()
+    objects = list(factory.objects()) + list(factory.karts())
+    walls = [obj for obj in objects if type(obj) is Polygon]
+    (lava,) = [obj for obj in objects if isinstance(obj, Lava)]
+    kart = next(obj for obj in objects if isinstance(obj, Kart))
+
+    assert not walls[0].canInteract(walls[1])
+    assert not walls[0].canInteract(lava)
+    assert kart.canInteract(walls[0]) and kart.canInteract(lava)
+    assert all(not gate.canInteract(walls[0]) for gate in factory.gates())
+
+
+def test_filtered_pair_never_forms_a_zone():
+    _, lava, fireBall = fireBallOver("LGELava")
+    _, wall, otherFireBall = fireBallOver("LGEPolygon")
+
+    assert not fireBall.canInteract(lava)
+    assert CollisionsZone.create([lava, fireBall], 1)[0] == []
+    assert len(CollisionsZone.create([wall, otherFireBall], 1)[0]) == 1
+
+
+def test_fire_ball_flies_over_lava():
+    game, lava, fireBall = fireBallOver("LGELava")
+    for _ in range(60):
+        game.nextFrame(1 / 60, [])
+
+    # la boule de feu a dépassé la lave sans être détruite
+    assert not fireBall.lastFrame()
+    assert fireBall.center().x() > lava.center().x() + 50
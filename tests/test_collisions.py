@@ -0,0 +1,70 @@
+import pytest
+
+from game import Game, events
+from game.CollisionsZone import CollisionsZone
+from game.objects import Kart
+
+from .worlds import fabric, rectangle
+
+# bord gauche du mur, moins la demi-longueur du kart
+LIMIT = 145 - 25
+
+
+def wall() -> str:
+    """Un kart face à un mur, 20 px devant lui"""
+    return fabric(
+        [
+            rectangle("LGEPolygon", 150, 300, 10, 200),
+            rectangle("LGEKartPlaceHolder", 100, 300, 50, 16),
+            rectangle(
+                "LGEFinishLine", 500, 100, 6, 100, gatePosition=0, numberOfLaps=1
+            ),
+            rectangle("LGEGate", 700, 100, 6, 100, gatePosition=1),
+        ]
+    )
+
+
+@pytest.mark.parametrize("adaptivePrecision", [False, True])
+def test_slow_kart_does_not_tunnel_through_wall(monkeypatch, adaptivePrecision):
+    # assez lent pour que la précision adaptative dépasse la durée d'un pas
+    monkeypatch.setattr(Kart, "movingSpeed", 10)
+    monkeypatch.setattr(CollisionsZone, "adaptivePrecision", adaptivePrecision)
+    game = Game(wall(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    for _ in range(240):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+        assert game.objectsFactory()[kart].center().x() <= LIMIT + 1
+
+
+def test_simultaneous_solver_stops_kart_at_wall(monkeypatch):
+    monkeypatch.setattr(CollisionsZone, "simultaneousSolver", True)
+    collisions = []
+    game = Game(wall(), lambda objs: None, lambda objs, point: collisions.append(objs))
+    kart = game.loadKart("a", "a.png")
+    for _ in range(120):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+        assert game.objectsFactory()[kart].center().x() <= LIMIT + 1
+    assert collisions
+    assert all(kart in (objs[0].formID(), objs[1].formID()) for objs in collisions)
+
+
+@pytest.mark.parametrize("maxIterations", [0, 1])
+def test_iterations_budget_reports_zone_overrun(monkeypatch, maxIterations):
+    monkeypatch.setattr(CollisionsZone, "maxIterations", maxIterations)
+    overruns = []
+    game = Game(wall(), lambda objs: None, onZoneOverrun=overruns.append)
+    kart = game.loadKart("a", "a.png")
+    for _ in range(60):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+        # une fois le budget dépassé, les objets sont figés et ne traversent pas le mur
+        assert game.objectsFactory()[kart].center().x() <= LIMIT + 1
+
+    if not maxIterations:
+        assert overruns == []
+    else:
+        assert overruns
+        # le kart et le mur
+        assert all(
+            len(objs) == 2 and kart in [obj.formID() for obj in objs]
+            for objs in overruns
+        )
@@ -0,0 +1,82 @@
+import lib
+import pytest
+
+from game.objects import Circle, Polygon
+
+
+def square(formID: int, x: float, y: float, size: float = 10, angle: float = 0):
+    half = size / 2
+    return Polygon(
+        formID=formID,
+        center=lib.Point((x, y)),
+        angle=angle,
+        vertices=[
+            lib.Vector((-half, -half)),
+            lib.Vector((half, -half)),
+            lib.Vector((half, half)),
+            lib.Vector((-half, half)),
+        ],
+    )
+
+
+def contact(first, second, features=None) -> tuple:
+    point, tangent, newFeatures = first.collisionContact(second, features)
+    return tuple(point), tuple(tangent), newFeatures
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        square(2, 11, 2),
+        square(2, 3, 14, angle=0.3),
+        Circle(formID=2, center=lib.Point((12, 1)), radius=6),
+        Circle(formID=2, center=lib.Point((9, 9)), radius=5),
+    ],
+)
+def test_valid_features_skip_the_search(monkeypatch, other):
+    first = square(1, 0, 0)
+    expected = contact(first, other)
+
+    def noSearch(*args, **kwargs):
+        raise AssertionError("the cached features should have been kept")
+
+    monkeypatch.setattr(Polygon, "edges", noSearch)
+    monkeypatch.setattr(Polygon, "vertices", noSearch)
+    assert contact(first, other, expected[2]) == expected
+
+
+def test_stale_features_fall_back_to_the_search():
+    first, other = square(1, 0, 0), square(2, 11, 2)
+    point, tangent, features = contact(first, other)
+    # le côté opposé du premier carré
+    owner, edgeIndex, vertexIndex = features
+    stale = (owner, (edgeIndex + 2) % 4, vertexIndex)
+
+    assert contact(first, other, stale) == (point, tangent, features)
+
+
+def test_concave_polygon_never_keeps_features(monkeypatch):
+    concave = Polygon(
+        formID=1,
+        vertices=[
+            lib.Vector((-10, -10)),
+            lib.Vector((10, -10)),
+            lib.Vector((0, 0)),
+            lib.Vector((10, 10)),
+            lib.Vector((-10, 10)),
+        ],
+    )
+    other = Circle(formID=2, center=lib.Point((-16, 0)), radius=5)
+    expected = contact(concave, other)
+    searches = []
+    vertex = Polygon.vertex
+
+    def countingVertex(self, *args, **kwargs):
+        searches.append(args)
+        return vertex(self, *args, **kwargs)
+
+    monkeypatch.setattr(Polygon, "vertex", countingVertex)
+    assert not concave.convex()
+    assert contact(concave, other, expected[2]) == expected
+    # tous les sommets ont été parcourus
+    assert len(searches) >= len(concave)
@@ -0,0 +1,79 @@
+import asyncio
+
+from game import Game, events
+from game.notifications import Dispatcher, Notification, PassageNotification
+
+from .worlds import track
+
+
+def test_flush_delivers_one_batch_per_frame():
+    batches = []
+    dispatcher = Dispatcher(batches.append)
+    dispatcher.flush()
+    assert batches == []
+
+    first, second = Notification(0), Notification(0)
+    dispatcher.record(first)
+    dispatcher.record(second)
+    assert dispatcher.pending() == [first, second]
+    assert batches == []
+    dispatcher.flush()
+    assert batches == [[first, second]]
+    assert dispatcher.pending() == []
+    assert dispatcher.pull() == []
+
+
+def test_pull_returns_notifications_once():
+    dispatcher = Dispatcher()
+    notification = Notification(0)
+    dispatcher.record(notification)
+    assert dispatcher.pull() == []
+    dispatcher.flush()
+    assert dispatcher.pull() == [notification]
+    assert dispatcher.pull() == []
+
+
+def test_async_callback_runs_in_the_loop_or_falls_back_to_pull():
+    batches = []
+
+    async def onNotifications(batch):
+        batches.append(batch)
+
+    dispatcher = Dispatcher(onNotificationsAsync=onNotifications)
+    notification = Notification(0)
+    # hors de toute boucle asyncio, le lot est gardé pour pull()
+    dispatcher.record(notification)
+    dispatcher.flush()
+    assert batches == []
+    assert dispatcher.pull() == [notification]
+
+    async def frame():
+        dispatcher.record(notification)
+        dispatcher.flush()
+        await asyncio.sleep(0)
+
+    asyncio.run(frame())
+    assert batches == [[notification]]
+    assert dispatcher.pull() == []
+
+
+def test_game_defers_passages_to_the_dispatcher():
+    passages = []
+    game = Game(
+        track(),
+        lambda objs: None,
+        gate_onPassage=lambda gate, kart: passages.append((gate, kart)),
+    )
+    dispatcher = Dispatcher()
+    game.set_dispatcher(dispatcher)
+    kart = game.loadKart("a", "kart.png")
+
+    notifications = []
+    for _ in range(180):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+        notifications.extend(dispatcher.pull())
+        assert dispatcher.pending() == []
+
+    assert passages == []
+    gates = [n.toTuple() for n in notifications if isinstance(n, PassageNotification)]
+    assert gates and all(formID == kart for _, formID in gates)
@@ -0,0 +1,57 @@
+import pytest
+
+from game import events
+
+
+def describe(batch) -> list:
+    return [(type(event), event.toTuple()) for event in batch]
+
+
+def test_events_batch_round_trip():
+    batch = events.EventsBatch(
+        [
+            events.KartMoveEvent(1, 1000009),
+            events.KartTurnEvent(-1, 1000009),
+            events.FireBallEvent(1000010),
+            events.FlipperEvent(True, "flipper gauche é"),
+        ]
+    )
+
+    decoded = events.EventsBatch.fromBytes(batch.toBytes())
+
+    assert describe(decoded) == describe(batch)
+
+
+def test_empty_batch_round_trip():
+    assert len(events.EventsBatch.fromBytes(events.EventsBatch().toBytes())) == 0
+
+
+def test_unknown_event_type_is_rejected():
+    frame = bytearray(events.EventsBatch([events.FireBallEvent(1)]).toBytes())
+    frame[2] = 255
+
+    with pytest.raises(ValueError):
+        events.EventsBatch.fromBytes(bytes(frame))
+
+
+def test_coalesce_keeps_last_move_and_turn_of_each_kart():
+    batch = events.EventsBatch(
+        [
+            events.KartMoveEvent(1, 1),
+            events.KartTurnEvent(1, 1),
+            events.FireBallEvent(1),
+            events.KartMoveEvent(-1, 1),
+            events.KartMoveEvent(1, 2),
+            events.FireBallEvent(1),
+        ]
+    )
+
+    batch.coalesce()
+
+    assert describe(batch) == [
+        (events.KartTurnEvent, (1, 1)),
+        (events.FireBallEvent, (1,)),
+        (events.KartMoveEvent, (-1, 1)),
+        (events.KartMoveEvent, (1, 2)),
+        (events.FireBallEvent, (1,)),
+    ]
@@ -0,0 +1,57 @@
+import pytest
+
+from game import Game
+
+from .worlds import track
+
+# pas exactement représentable, pour compter les pas sans erreur d'arrondi
+STEP = 1 / 64
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    """Liste des durées des pas de physique simulés"""
+    durations = []
+    simulatePhysics = Game._simulatePhysics
+
+    def countingSimulatePhysics(self, elapsedTime):
+        durations.append(elapsedTime)
+        simulatePhysics(self, elapsedTime)
+
+    monkeypatch.setattr(Game, "_simulatePhysics", countingSimulatePhysics)
+    return durations
+
+
+def test_accumulator_runs_whole_steps(steps):
+    game = Game(track(), lambda objs: None, fixedTimeStep=STEP)
+
+    game.nextFrame(STEP / 2)
+    assert steps == []
+    assert game.interpolationAlpha() == 0.5
+
+    game.nextFrame(STEP / 2)
+    assert steps == [STEP]
+
+    game.nextFrame(STEP * 2.5)
+    assert steps == [STEP] * 3
+    assert game.interpolationAlpha() == 0.5
+    assert game.time() == STEP * 3
+
+
+def test_sub_steps_are_capped_and_late_time_dropped(steps):
+    game = Game(track(), lambda objs: None, fixedTimeStep=STEP, maxSubSteps=4)
+
+    game.nextFrame(STEP * 10.5)
+
+    assert steps == [STEP] * 4
+    # seule la fraction de pas est gardée
+    assert game.interpolationAlpha() == 0.5
+
+
+def test_variable_step_runs_one_step_per_frame(steps):
+    game = Game(track(), lambda objs: None)
+    game.nextFrame(STEP)
+
+    assert steps == [STEP]
+    with pytest.raises(ValueError):
+        game.set_fixedTimeStep(-1)
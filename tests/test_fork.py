@@ -0,0 +1,49 @@
+from game import Game, events
+
+from .worlds import centers, track
+
+
+def test_fork_does_not_change_parent():
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    for _ in range(10):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+    before = centers(game)
+
+    forked = game.fork()
+    for _ in range(60):
+        forked.nextFrame(
+            1 / 60, [events.KartMoveEvent(1, kart), events.KartTurnEvent(1, kart)]
+        )
+
+    assert centers(game) == before
+    assert centers(forked) != before
+
+
+def test_fork_and_parent_evolve_identically():
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    for _ in range(10):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+
+    forked = game.fork()
+    for _ in range(120):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+        forked.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+
+    assert centers(forked) == centers(game)
+
+
+def test_kinematics_are_not_shared_with_copies():
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+    original = game.objectsFactory()[kart]
+    expected = tuple(original.center(1 / 60))
+
+    clone = original.copy()
+    clone.center(1 / 60).translate(clone.vectorialMotionSpeed())
+    clone.set_vectorialMotionSpeed(clone.vectorialMotionSpeed() * 2)
+
+    assert tuple(original.center(1 / 60)) == expected
+    assert tuple(clone.center(1 / 60)) != expected
@@ -0,0 +1,65 @@
+import lib
+import pytest
+
+from game import Game, events
+from game.objects import Object
+
+from .worlds import track
+
+DT = 1 / 60
+
+
+def movingKart():
+    """Partie avec un kart lancé vers la droite"""
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "kart.png")
+    for _ in range(10):
+        game.nextFrame(DT, [events.KartMoveEvent(1, kart)])
+    return game, game.objectsFactory()[kart]
+
+
+def test_returned_points_are_copies():
+    _, kart = movingKart()
+    center = kart.center(DT)
+    center.translate(lib.Vector((100, 100)))
+    vertices = kart.vertices(DT)
+    vertices[0].translate(lib.Vector((100, 100)))
+
+    assert kart.center(DT) != center
+    assert kart.vertices(DT)[0] != vertices[0]
+
+
+def test_copy_does_not_share_the_cache():
+    _, kart = movingKart()
+    before = kart.center(DT), kart.vertices(DT)
+    clone = kart.copy()
+    clone.translate(lib.Vector((0, 50)))
+
+    assert (kart.center(DT), kart.vertices(DT)) == before
+    assert clone.center(DT).y() == before[0].y() + 50
+    assert clone.vertices(DT)[0].y() == before[1][0].y() + 50
+
+
+def test_fork_does_not_read_the_parent_cache():
+    game, kart = movingKart()
+    before = kart.center(DT)
+    forked = game.fork()
+    forkedKart = forked.objectsFactory()[kart.formID()]
+    forkedKart.set_center(lib.Point((300, 400)))
+
+    assert kart.center(DT) == before
+    assert forkedKart.center(DT) != before
+    assert forkedKart.center(DT).x() > 300
+
+
+def test_pose_follows_changes_and_cache_is_bounded():
+    _, kart = movingKart()
+    angle = kart.pose(DT)[0]
+    kart.set_angle(kart.angle() + 1)
+    assert kart.pose(DT)[0] == pytest.approx(angle + 1)
+    assert kart.pose(DT)[3:] == tuple(kart.center(DT))
+    assert kart.vertices(DT) == [kart.vertex(i, DT) for i in range(len(kart))]
+
+    for i in range(3 * Object.kinematicsCacheSize):
+        kart.center((i + 1) * DT)
+    assert len(kart._kinematics) <= Object.kinematicsCacheSize
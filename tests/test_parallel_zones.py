@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+
+from game import Game, events
+from game.CollisionsZone import CollisionsZone
+
+from .worlds import centers, fabric, rectangle
+
+
+def arena() -> str:
+    """Deux karts fonçant chacun vers son propre mur, assez loin pour former deux zones"""
+    return fabric(
+        [
+            rectangle("LGEPolygon", 500, 0, 1000, 20),
+            rectangle("LGEPolygon", 500, 600, 1000, 20),
+            rectangle("LGEPolygon", 0, 300, 20, 600),
+            rectangle("LGEPolygon", 1000, 300, 20, 600),
+            rectangle("LGEPolygon", 400, 100, 20, 100),
+            rectangle(
+                "LGEFinishLine", 500, 300, 6, 100, gatePosition=0, numberOfLaps=1
+            ),
+            rectangle("LGEGate", 700, 300, 6, 100, gatePosition=1),
+            rectangle("LGEKartPlaceHolder", 100, 100, 50, 16),
+            rectangle("LGEKartPlaceHolder", 800, 500, 50, 16),
+        ]
+    )
+
+
+def play(workers: int) -> tuple:
+    collisions = []
+    game = Game(
+        arena(),
+        lambda objs: None,
+        lambda objs, point: collisions.append(
+            (objs[0].formID(), objs[1].formID(), tuple(point))
+        ),
+    )
+    game.set_parallelZones(workers)
+    karts = [
+        game.loadKart(str(placeHolder), "kart.png", placeHolder)
+        for placeHolder in sorted(k.formID() for k in game.kartPlaceholders())
+    ]
+    for _ in range(240):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart) for kart in karts])
+    game.set_parallelZones(0)
+    return centers(game), collisions, game.contactsCache().stats()
+
+
+@pytest.mark.parametrize("cacheContacts", [False, True])
+def test_parallel_zones_match_serial_resolution(monkeypatch, cacheContacts):
+    monkeypatch.setattr(Game, "cacheContacts", cacheContacts)
+    resolveAll = CollisionsZone.resolveAll
+    zonesCounts = []
+
+    def countingResolveAll(zones, *args, **kwargs):
+        zonesCounts.append(len(zones))
+        return resolveAll(zones, *args, **kwargs)
+
+    monkeypatch.setattr(CollisionsZone, "resolveAll", countingResolveAll)
+
+    serial = play(0)
+    assert play(2) == serial
+    assert serial[1]
+    # les deux karts ont été résolus en parallèle au moins une fois
+    assert max(zonesCounts) >= 2
+
+
+def test_game_with_contacts_cache_can_be_pickled(monkeypatch):
+    monkeypatch.setattr(Game, "cacheContacts", True)
+    game = Game(arena(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+
+    pickle.dumps(game.contactsCache())
@@ -0,0 +1,71 @@
+from game import Game, events
+from game.objects import FireBall
+
+from .worlds import fabric, rectangle
+
+
+def openWorld() -> str:
+    """Monde sans murs: les boules de feu en sortent"""
+    return fabric(
+        [
+            rectangle(
+                "LGEFinishLine", 200, 300, 6, 200, gatePosition=0, numberOfLaps=2
+            ),
+            rectangle("LGEGate", 500, 300, 6, 200, gatePosition=1),
+            rectangle("LGEKartPlaceHolder", 100, 300, 50, 16),
+        ]
+    )
+
+
+def fire(game: Game) -> int:
+    """Fait lancer une boule de feu au kart, retourne le formID de la boule de feu"""
+    kart = game.loadKart("a", "a.png")
+    game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+    game.nextFrame(1 / 60, [events.FireBallEvent(kart)])
+    (fireBall,) = [
+        obj.formID()
+        for obj in game.objectsFactory().objects()
+        if isinstance(obj, FireBall)
+    ]
+    return fireBall
+
+
+def alive(game: Game, formID: int) -> bool:
+    return any(obj.formID() == formID for obj in game.objectsFactory().objects())
+
+
+def lifetime(game: Game, fireBall: int) -> float:
+    """Avance la partie jusqu'à la suppression de la boule de feu, retourne sa durée (s)"""
+    start = game.time()
+    while alive(game, fireBall):
+        game.nextFrame(1 / 60, [])
+        assert game.time() - start < 5
+    return game.time() - start
+
+
+def test_fire_ball_expires_after_its_time_to_live(monkeypatch):
+    monkeypatch.setattr(FireBall, "timeToLive", 0.1)
+    game = Game(openWorld(), lambda objs: None)
+    fireBall = fire(game)
+    center = game.objectsFactory()[fireBall].center().x()
+
+    # détruite puis supprimée à la frame suivante, bien avant de sortir du monde
+    assert 0.1 <= lifetime(game, fireBall) <= 0.1 + 3 / 60
+    assert center < 500 - 0.2 * FireBall.baseSpeed
+
+
+def test_fire_ball_leaving_the_world_is_removed():
+    assert not FireBall.timeToLive
+    game = Game(openWorld(), lambda objs: None)
+    fireBall = fire(game)
+    factory = game.objectsFactory()
+    positions = []
+    while alive(game, fireBall):
+        positions.append(factory[fireBall].center().x())
+        game.nextFrame(1 / 60, [])
+        assert len(positions) < 300
+
+    # supprimée au plus deux frames après être sortie des limites du monde
+    xMax = factory._worldBounds[2]
+    assert xMax < max(positions) < xMax + 2 * (positions[-1] - positions[-2])
+    assert not factory._projectiles
@@ -0,0 +1,32 @@
+from game import Game, ReplayPlayer, ReplayRecorder, events
+
+from .worlds import centers, track
+
+
+def test_seek_matches_recorded_game(tmp_path):
+    path = str(tmp_path / "race.replay")
+    game = Game(track(), lambda objs: None, fixedTimeStep=1 / 120)
+    karts = [game.loadKart("a", "a.png"), game.loadKart("b", "b.png")]
+    recorder = ReplayRecorder(game, track(), path, keyframeInterval=50)
+    states = []
+    for frame in range(200):
+        newEvents = [events.KartMoveEvent(1, kart) for kart in karts]
+        if frame % 50 < 10:
+            newEvents.append(events.KartTurnEvent(1, karts[1]))
+        if frame == 20:
+            newEvents.append(events.FireBallEvent(karts[0]))
+        states.append(centers(game))
+        recorder.nextFrame(1 / 60, newEvents)
+    states.append(centers(game))
+    recorder.close()
+
+    player = ReplayPlayer(path)
+    # en avant, en arrière, sur et entre les images clés
+    for tick in [0, 199, 123, 5, 100, 200, 77]:
+        player.seek(tick)
+        assert centers(player.game()) == states[tick]
+
+    player.seek(10)
+    while player.nextFrame():
+        pass
+    assert centers(player.game()) == states[-1]
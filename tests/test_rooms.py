@@ -0,0 +1,56 @@
+import pytest
+
+from game import events
+from game.RoomsHost import RoomsHost
+
+from .worlds import track
+
+
+def host(rooms: int) -> RoomsHost:
+    roomsHost = RoomsHost(workers=2, local=True)
+    for roomID in range(rooms):
+        roomsHost.createRoom(roomID, track())
+        roomsHost.loadKart(roomID, "a", "a.png")
+    return roomsHost
+
+
+def test_move_room_keeps_playing():
+    roomsHost = host(2)
+    kart = roomsHost.loadKart(0, "b", "b.png")
+    roomsHost.pushEvents(0, [events.KartMoveEvent(1, kart)])
+    before = roomsHost.step(1 / 60)[0][0]
+    worker = roomsHost._owners[0]
+
+    roomsHost.moveRoom(0, 1 - worker)
+
+    assert roomsHost._owners[0] == 1 - worker
+    roomsHost.pushEvents(0, [events.KartMoveEvent(1, kart)])
+    after = roomsHost.step(1 / 60)
+    assert set(after) == {0, 1}
+    assert after[0][0] != before
+
+
+def test_rebalance_moves_a_room_from_the_busiest_worker():
+    roomsHost = host(3)
+    busiest = roomsHost._owners[0]
+    for roomID in roomsHost.rooms():
+        roomsHost.moveRoom(roomID, busiest)
+    roomsHost.step(1 / 60)
+
+    roomsHost.rebalance()
+
+    assert sorted(roomsHost._owners.values()).count(busiest) == 2
+    assert set(roomsHost.step(1 / 60)) == {0, 1, 2}
+
+
+def test_failed_export_keeps_the_room():
+    roomsHost = host(1)
+    worker = roomsHost._owners[0]
+    # une lambda ne peut pas être sérialisée
+    roomsHost._workers[worker]._worker._rooms[0].unpicklable = lambda: None
+
+    with pytest.raises(Exception):
+        roomsHost.moveRoom(0, 1 - worker)
+
+    assert roomsHost._owners[0] == worker
+    assert set(roomsHost.step(1 / 60)) == {0}
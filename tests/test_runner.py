@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from game import Game, events
+from game.GameRunner import GameRunner
+
+from .worlds import track
+
+
+def run(runner: GameRunner, ticks: int, tickDuration: float = 0) -> None:
+    """Fait tourner <runner> pendant <ticks> ticks, chacun durant au moins <tickDuration> s"""
+
+    async def sink(game: Game) -> None:
+        time.sleep(tickDuration)
+        if runner.ticks() == ticks:
+            runner.stop()
+
+    runner._outputSink = sink
+    asyncio.run(runner.run())
+
+
+def test_runner_drains_events_each_tick():
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    runner = GameRunner(game, tickRate=200)
+    runner.pushEvent(events.KartMoveEvent(1, kart))
+    run(runner, 5)
+
+    assert runner.ticks() == 5
+    assert runner._queue.empty()
+    assert game.objectsFactory()[kart].center().x() > 100
+
+
+@pytest.mark.parametrize("fixedTimeStep", [0, 1 / 200])
+def test_overrun_is_reported(fixedTimeStep):
+    game = Game(track(), lambda objs: None, fixedTimeStep=fixedTimeStep)
+    lateness = []
+    runner = GameRunner(game, tickRate=200, onOverrun=lateness.append)
+    run(runner, 3, tickDuration=0.02)
+
+    assert runner.overruns() == len(lateness) > 0
+    if fixedTimeStep:
+        # les pas fixes rattrapent le temps réellement écoulé, dans la limite de maxSubSteps
+        assert game.time() > 0.03
@@ -0,0 +1,69 @@
+import lib
+import pytest
+
+from game import Game, events
+from game.objects import Gate, Kart
+
+from .worlds import track
+
+
+@pytest.mark.parametrize("segmentCrossing", [False, True])
+def test_gates_are_passed_in_order(monkeypatch, segmentCrossing):
+    monkeypatch.setattr(Gate, "segmentCrossing", segmentCrossing)
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    passages = []
+    factory = game.objectsFactory()
+    for gate in factory.gates():
+        gate.set_onPassage(lambda gate, kart: passages.append(gate.position()))
+
+    # (début, fin, abscisse du centre du kart au début, à la fin) de chaque pas
+    frames = []
+    for _ in range(300):
+        start, x = game.time(), factory[kart].center().x()
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+        frames.append((start, game.time(), x, factory[kart].center().x()))
+
+    assert passages == [1, 2]
+    for gate in factory.gates():
+        if gate.position() == 0:
+            assert gate.lastPassageTime(kart) is None
+            continue
+        assert gate.passagesCount(kart) == 1
+        time = gate.lastPassageTime(kart)
+        left = min(vertex[0] for vertex in gate.vertices())
+        right = max(vertex[0] for vertex in gate.vertices())
+        # le passage a lieu pendant un pas où le kart (50 px) chevauche le portillon
+        assert any(
+            start <= time <= end and xEnd + 25 >= left and xStart - 25 <= right
+            for start, end, xStart, xEnd in frames
+        )
+
+
+def test_sensor_pass_does_not_copy_bodies(monkeypatch):
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+
+    def forbidden(self, *args):
+        raise AssertionError("the sensor pass should only use recorded poses")
+
+    monkeypatch.setattr(Kart, "copy", forbidden)
+    monkeypatch.setattr(Kart, "saveState", forbidden)
+    for _ in range(120):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, kart)])
+
+    gates = {gate.position(): gate for gate in game.objectsFactory().gates()}
+    assert gates[1].passagesCount(kart) == 1
+
+
+def test_fast_kart_passage_is_detected_by_default():
+    game = Game(track(), lambda objs: None)
+    kart = game.loadKart("a", "a.png")
+    game.nextFrame(1 / 60, [])
+    # 80 px par pas: le kart (50 px) passe entièrement le portillon (6 px) entre deux pas
+    game.objectsFactory()[kart].set_vectorialMotionSpeed(lib.Vector((4800, 0)))
+    for _ in range(8):
+        game.nextFrame(1 / 60, [])
+
+    gates = {gate.position(): gate for gate in game.objectsFactory().gates()}
+    assert gates[1].passagesCount(kart) == 1
@@ -0,0 +1,44 @@
+from game import Game, events
+from game.objects import Object
+
+from .worlds import fabric, rectangle
+
+
+def lane() -> str:
+    """Deux emplacements de karts alignés, le second 200 px devant le premier"""
+    return fabric(
+        [
+            rectangle(
+                "LGEFinishLine", 500, 100, 6, 100, gatePosition=0, numberOfLaps=1
+            ),
+            rectangle("LGEGate", 700, 100, 6, 100, gatePosition=1),
+            rectangle("LGEKartPlaceHolder", 100, 300, 50, 16),
+            rectangle("LGEKartPlaceHolder", 300, 300, 50, 16),
+        ]
+    )
+
+
+def test_resting_kart_sleeps_and_wakes_on_impact():
+    game = Game(lane(), lambda objs: None)
+    placeHolders = sorted(
+        game.kartPlaceholders(), key=lambda kart: kart.center().x()
+    )
+    rear, front = (
+        game.loadKart(name, "kart.png", kart.formID())
+        for name, kart in zip("ab", placeHolders)
+    )
+    factory = game.objectsFactory()
+    for _ in range(Object.framesBeforeSleeping + 1):
+        game.nextFrame(1 / 60, [])
+    assert factory[front].isSleeping()
+    start = factory[front].center().x()
+
+    impact = None
+    for frame in range(240):
+        game.nextFrame(1 / 60, [events.KartMoveEvent(1, rear)])
+        if impact is None and not factory[front].isSleeping():
+            impact = frame
+
+    # réveillé par le choc du kart arrière puis poussé vers l'avant
+    assert impact is not None
+    assert factory[front].center().x() > start
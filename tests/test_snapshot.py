@@ -0,0 +1,46 @@
+from game import Game, events
+
+from .worlds import centers, track
+
+
+def drive(game: Game, karts, frames: int, start: int) -> list:
+    """Joue <frames> frames de course et retourne les centres des objets après chacune"""
+    states = []
+    for frame in range(start, start + frames):
+        newEvents = [events.KartMoveEvent(1, kart) for kart in karts]
+        if frame % 50 < 10:
+            newEvents.append(events.KartTurnEvent(1, karts[1]))
+        if frame == 20:
+            newEvents.append(events.FireBallEvent(karts[0]))
+        game.nextFrame(1 / 60, newEvents)
+        states.append(centers(game))
+    return states
+
+
+def test_restore_replays_identically():
+    game = Game(track(), lambda objs: None)
+    karts = [game.loadKart("a", "a.png"), game.loadKart("b", "b.png")]
+    drive(game, karts, 10, 0)
+
+    snapshot = game.snapshot()
+    time = game.time()
+    first = drive(game, karts, 120, 10)
+    game.restore(snapshot)
+    assert game.time() == time
+    second = drive(game, karts, 120, 10)
+
+    assert first == second
+
+
+def test_restore_forgets_objects_created_since():
+    game = Game(track(), lambda objs: None)
+    karts = [game.loadKart("a", "a.png"), game.loadKart("b", "b.png")]
+    drive(game, karts, 10, 0)
+    snapshot = game.snapshot()
+    count = len(game.objectsFactory().objects())
+
+    # une boule de feu est lancée à la frame 20
+    drive(game, karts, 20, 10)
+    game.restore(snapshot)
+
+    assert len(game.objectsFactory().objects()) == count
@@ -0,0 +1,37 @@
+from math import inf
+
+import lib
+import pytest
+
+from game import Game
+
+from .worlds import track
+
+
+@pytest.fixture
+def factory():
+    return Game(track(), lambda objs: None).objectsFactory()
+
+
+@pytest.mark.parametrize("maxDistance", [inf, 10_000])
+def test_raycast_hits_wall(factory, maxDistance):
+    hit = factory.raycast(lib.Point((300, 100)), lib.Vector((1, 0)), maxDistance)
+
+    assert hit is not None
+    _, distance, normal = hit
+    assert distance == pytest.approx(690)
+    assert tuple(normal) == pytest.approx((-1, 0))
+
+
+def test_raycast_from_outside_towards_world(factory):
+    hit = factory.raycast(lib.Point((-500, 100)), lib.Vector((1, 0)))
+
+    assert hit is not None
+    assert hit[1] == pytest.approx(490)
+
+
+@pytest.mark.parametrize("direction", [(-1, 0), (0, 1), (-1, -1), (-3, 1)])
+def test_infinite_raycast_missing_world_stops(factory, direction):
+    # le rayon part à gauche du monde et ne le traverse jamais
+    assert factory.raycast(lib.Point((-500, 100)), lib.Vector(direction)) is None
+    assert factory.raycast(lib.Point((-500, 100)), lib.Vector(direction), inf) is None
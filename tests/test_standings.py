@@ -0,0 +1,41 @@
+import json
+
+from game import Game, events
+
+from .worlds import rectangle, track
+
+DT = 1 / 60
+
+
+def race():
+    """Circuit de test dont le second emplacement est hors de portée des portillons"""
+    world = json.loads(track())
+    world["objects"][-1] = rectangle("LGEKartPlaceHolder", 100, 100, 50, 16)
+    game = Game(json.dumps(world), lambda objs: None)
+    low, high = sorted(game.kartPlaceholders(), key=lambda kart: kart.center().y())
+    outsider = game.loadKart("b", "kart.png", low.formID())
+    racer = game.loadKart("a", "kart.png", high.formID())
+    return game, racer, outsider
+
+
+def test_gate_passage_moves_kart_ahead():
+    game, racer, outsider = race()
+    standings = game.standings()
+    leaderboards = []
+    standings.addListener(lambda leaderboard: leaderboards.append(list(leaderboard)))
+    for _ in range(30):
+        game.nextFrame(DT, [events.KartMoveEvent(1, outsider)])
+    assert standings.leaderboard() == [outsider, racer]
+    assert standings.rank(outsider) == 1
+
+    kart = game.objectsFactory()[racer]
+    for _ in range(240):
+        game.nextFrame(DT, [events.KartMoveEvent(1, racer)])
+        if kart.lastGatePosition() == 1:
+            break
+    assert kart.lastGatePosition() == 1
+    # l'autre kart, parti le premier, n'a franchi aucun portillon
+    assert standings.progress(outsider)[1] == 0
+    assert standings.leaderboard() == [racer, outsider]
+    assert (standings.rank(racer), standings.rank(outsider)) == (1, 2)
+    assert leaderboards[-1] == [racer, outsider]
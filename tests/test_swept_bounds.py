@@ -0,0 +1,58 @@
+import json
+
+import lib
+import pytest
+
+from game import Game
+from game.CollisionsZone import CollisionsZone
+from game.objects import Circle
+
+from .worlds import fabric, rectangle, track
+
+DT = 1 / 60
+
+
+def ball(left: float, top: float, radius: float) -> dict:
+    """Balle mobile au format du fabric json"""
+    obj = rectangle("LGECircle", left, top, 2 * radius, 2 * radius, mass=1)
+    del obj["points"]
+    obj["radius"] = radius
+    return obj
+
+
+def covers(zone: lib.AlignedRectangle, point: lib.Point) -> bool:
+    return zone.collides(lib.AlignedRectangle(1e-6, 1e-6, leftBottom=point))
+
+
+@pytest.mark.parametrize("speed", [(-3000, 0), (0, -3000), (1800, 2400)])
+def test_kart_zone_covers_the_whole_motion(speed):
+    game = Game(track(), lambda objs: None)
+    kart = game.objectsFactory()[game.loadKart("a", "kart.png")]
+    kart.set_vectorialMotionSpeed(lib.Vector(speed))
+    kart.set_vectorialMotionAcceleration(lib.Vector((-speed[0], -speed[1])))
+    kart.set_angularMotionSpeed(20)
+    zone = kart.potentialCollisionZone(DT)
+
+    for step in range(11):
+        for vertex in kart.vertices(DT * step / 10):
+            assert covers(zone, vertex)
+
+
+@pytest.mark.parametrize(
+    "center, speed, wallCenter",
+    [((100, 300), (-12000, 0), (0, 300)), ((300, 100), (0, -12000), (500, 0))],
+)
+def test_fast_ball_and_wall_form_a_zone(center, speed, wallCenter):
+    world = json.loads(track())
+    world["objects"].append(ball(*center, 10))
+    game = Game(json.dumps(world), lambda objs: None)
+    objs = game.objectsFactory().objects()
+    (moving,) = [obj for obj in objs if isinstance(obj, Circle) and obj.mass()]
+    (wall,) = [obj for obj in objs if tuple(obj.center()) == wallCenter]
+    moving.set_vectorialMotionSpeed(lib.Vector(speed))
+
+    # le mur est entre les positions de départ et d'arrivée, sans toucher aucune des deux
+    for position in (moving.center(), moving.center(DT)):
+        assert not covers(wall.potentialCollisionZone(DT), position)
+    zones, _ = CollisionsZone.create([wall, moving], DT)
+    assert len(zones) == 1
@@ -0,0 +1,83 @@
+import json
+from typing import List
+
+
+def motion() -> dict:
+    """Mouvement nul au format du fabric json"""
+    return {
+        "angle": {
+            "type": "none",
+            "center": {"x": 0, "y": 0},
+            "velocity": 0,
+            "acceleration": 0,
+        },
+        "vector": {
+            "type": "none",
+            "velocity": {"x": 0, "y": 0},
+            "acceleration": {"x": 0, "y": 0},
+        },
+    }
+
+
+def rectangle(
+    lgeType: str, left: float, top: float, width: float, height: float, **lge
+) -> dict:
+    """Rectangle immobile au format du fabric json, <lge> complète ses propriétés lge"""
+    obj = {
+        "type": lgeType,
+        "left": left,
+        "top": top,
+        "angle": 0,
+        "opacity": 1,
+        "fill": "#123456",
+        "scaleX": 1,
+        "scaleY": 1,
+        "flipX": False,
+        "flipY": False,
+        "points": [
+            {"x": 0, "y": 0},
+            {"x": width, "y": 0},
+            {"x": width, "y": height},
+            {"x": 0, "y": height},
+        ],
+        "lge": {
+            "version": "1.1.0",
+            "name": lge.pop("name", lgeType),
+            "friction": 0,
+            "mass": 0,
+            "motion": motion(),
+        },
+    }
+    obj["lge"].update(lge)
+    return obj
+
+
+def fabric(objects: List[dict]) -> str:
+    """Retourne le fabric json du monde composé des objets donnés"""
+    return json.dumps({"version": "4.4.0", "objects": objects})
+
+
+def track() -> str:
+    """Circuit fermé par quatre murs, avec une ligne d'arrivée, deux portillons,
+    une flaque de lave et deux emplacements de karts"""
+    return fabric(
+        [
+            rectangle("LGEPolygon", 500, 0, 1000, 20),
+            rectangle("LGEPolygon", 500, 600, 1000, 20),
+            rectangle("LGEPolygon", 0, 300, 20, 600),
+            rectangle("LGEPolygon", 1000, 300, 20, 600),
+            rectangle(
+                "LGEFinishLine", 200, 300, 6, 200, gatePosition=0, numberOfLaps=2
+            ),
+            rectangle("LGEGate", 500, 300, 6, 200, gatePosition=1),
+            rectangle("LGEGate", 800, 300, 6, 200, gatePosition=2),
+            rectangle("LGELava", 500, 520, 100, 40),
+            rectangle("LGEKartPlaceHolder", 100, 300, 50, 16),
+            rectangle("LGEKartPlaceHolder", 100, 200, 50, 16),
+        ]
+    )
+
+
+def centers(game) -> tuple:
+    """Retourne les centres de tous les objets en jeu, pour comparer deux parties"""
+    return tuple(tuple(obj.center()) for obj in game.objectsFactory().objects())